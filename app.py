@@ -1,19 +1,69 @@
 import streamlit as st
 from pathlib import Path
 
+from nba import instrument, warmup
 
 st.set_page_config(page_title="NBA Predictions", page_icon="🏀", layout="wide")
 
-st.title("🏀 Predicción de Partidos NBA")
-st.markdown("""
+
+def inicio():
+    st.title("🏀 Predicción de Partidos NBA")
+    st.markdown("""
 **Proyecto Integrador – Visualización e Integración (Entrega 4)**
 
 Esta app muestra:
 1) **Explora datos e interactua con graficos** (gráficos interactivos)  
 2) Explora nuestro Dataset e información del modelo de predicción.
 3) **Haz tu propia predicción**
-4) ¡Conoce nuestro **Equipo**!
+4) **Simula la temporada**: tabla proyectada y probabilidades de playoffs.
+5) ¡Conoce nuestro **Equipo**!
 
 > La app usa datasets **ya procesados** y un **pipeline entrenado** .
 """)
+    warmup_status()
+
+
+# ====== Precarga en segundo plano (modelo, datasets, stores) ======
+# Arranca una vez por proceso, entre por la página que entre el primer usuario;
+# mientras se lee la portada, las páginas quedan con el caché caliente. El hilo
+# arranca recién al terminar el render (abajo) para no competirle por el GIL
+run = warmup.prepare(st.session_state.get("season"))
+refreshing = not run.done
+
+
+@st.fragment(run_every=0.5 if refreshing else None)
+def warmup_status():
+    if run.done:
+        errores = sum(task["estado"] == "error" for task in run.rows())
+        st.caption(f"⚡ Datos y modelo precargados en {run.seconds:.1f} s"
+                   + (f" ({errores} con error)" if errores else ""))
+    else:
+        st.progress(run.progress(), text="⚡ Precargando datos y modelo...")
+    with st.expander("Detalle de la precarga"):
+        # Tabla en markdown: st.dataframe importaría pandas y pyarrow en el hilo principal
+        lines = ["| tarea | estado | ms | error |", "|---|---|--:|---|"]
+        for t in run.rows():
+            ms = "" if t["ms"] is None else f"{t['ms']:.0f}"
+            error = (t["error"] or "").replace("|", r"\|")
+            lines.append(f"| {t['tarea']} | {t['estado']} | {ms} | {error} |")
+        st.markdown("\n".join(lines))
+    if refreshing and run.done:
+        # Una última corrida completa para dejar de refrescar el fragmento
+        st.rerun()
+
 
+# ====== Navegación ======
+# Las páginas numeradas van al menú; el diagnóstico queda oculto (se abre en /diagnostico)
+PAGES_DIR = Path(__file__).parent / "pages"
+page = st.navigation([
+    st.Page(inicio, title="Inicio", icon="🏀", default=True),
+    *(st.Page(path) for path in sorted(PAGES_DIR.glob("[0-9]*.py"))),
+    st.Page(PAGES_DIR / "diagnostico.py", title="Diagnóstico", icon="🩺", url_path="diagnostico",
+            visibility="hidden"),
+])
+# Tiempo de cada corrida completa de la página (sólo con la instrumentación prendida)
+try:
+    with instrument.span(f"pagina.{page.url_path or 'inicio'}"):
+        page.run()
+finally:
+    run.launch()
@@ -0,0 +1 @@
+"""Código compartido por las páginas de la app (features, datos y modelo)."""
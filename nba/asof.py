@@ -0,0 +1,198 @@
+"""Feature store "as of": estadísticas de cada equipo tal como estaban antes de una fecha.
+
+Se arma reprocesando los JSON por equipo con el `FeatureEngine` y guardando, para
+cada equipo, el estado después de cada partido en arreglos ordenados por fecha:
+
+    dates[i]     fecha (ns UTC) del i-ésimo partido del equipo
+    values[i]    estado acumulado DESPUÉS de ese partido (columnas `COLUMNS`)
+
+Consultar "¿cómo estaba el equipo antes de la fecha t?" es una búsqueda binaria
+(`searchsorted`) sobre `dates`; las consultas en lote agrupan por equipo y hacen
+una sola búsqueda vectorizada por equipo, así que miles de pares (equipo, fecha)
+se resuelven en milisegundos.
+
+Las columnas son las mismas que devuelve `features.team_stats` (más derrotas,
+últimos 10 y el rating Elo de `nba.elo`), así que el resultado entra directo en
+`features.build_features`.
+`game_number`, `wins`, `losses` y los últimos 10 cuentan sólo partidos de la
+temporada regular (`seasons.is_regular`: sin play-in ni la final de la NBA Cup),
+como GP/W del CSV de equipos; rachas y ratings siguen la definición del motor de
+features (la misma del entrenamiento).
+
+Uso:
+    python -m nba.asof BOS 2025-01-15      # estado de BOS antes de esa fecha
+"""
+import argparse
+import json
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba import data, elo, instrument, seasons
+from nba.feature_engine import FeatureEngine, load_raw_games
+
+COLUMNS = [
+    "off_rating", "def_rating", "wins", "game_number", "streak", "streak_as_local", "streak_as_visitor",
+    "losses", "last_10_wins", "last_10_games", "elo",
+]
+FLOAT_COLUMNS = ["off_rating", "def_rating", "elo"]
+FORMAT_VERSION = 2
+
+
+def _state_row(state, record, elo_rating: float) -> list:
+    # `record`: [victorias, derrotas, últimos 10] de la temporada regular
+    wins, losses, last_10 = record
+    avg = {
+        col: state.stat_sum[col] / state.stat_count[col] if state.stat_count[col] else np.nan
+        for col in ("offensive_rating", "defensive_rating")
+    }
+    return [
+        avg["offensive_rating"], avg["defensive_rating"], wins, wins + losses,
+        state.streak, state.home_streak, state.away_streak,
+        losses, sum(last_10), len(last_10), elo_rating,
+    ]
+
+
+def _to_ns(dates) -> np.ndarray:
+    """Fechas (str, date, Timestamp; naive = UTC) -> int64 ns UTC."""
+    dates = pd.to_datetime(pd.Series(dates), utc=True)
+    return dates.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+
+class FeatureStore:
+    """Arreglos ordenados por equipo con el estado posterior a cada partido."""
+
+    def __init__(self, season: str, teams: dict):
+        self.season = season
+        self.teams = teams   # TEAM -> (dates int64 [n], values float [n, len(COLUMNS)])
+
+    @classmethod
+    def build(cls, season=None) -> "FeatureStore":
+        season = season or seasons.current()
+        engine = FeatureEngine(season)
+        games = load_raw_games(season)
+        regular = seasons.is_regular(season, [g["gameId"] for g, _ in games], [g["date"] for g, _ in games])
+        dates, rows, records = {}, {}, {}
+        for (game, owners), is_regular in zip(games, regular):
+            new = engine.add_game(game, owners)
+            ts = pd.Timestamp(game["date"]).value
+            for code, row in new["team_rows"].items():
+                record = records.setdefault(code, [0, 0, deque(maxlen=10)])
+                if is_regular:
+                    win = row["result"] == "W"
+                    record[0 if win else 1] += 1
+                    record[2].append(int(win))
+                dates.setdefault(code, []).append(ts)
+                rows.setdefault(code, []).append(_state_row(engine.teams[code], record, engine.elo.rating(code)))
+        teams = {
+            code: (np.asarray(dates[code], dtype=np.int64), np.asarray(rows[code], dtype=float))
+            for code in dates
+        }
+        return cls(season, teams)
+
+    # ---------- Consultas ----------
+    def _empty_row(self) -> np.ndarray:
+        # Antes del primer partido: sin récord, sin racha, sin ratings (Elo inicial)
+        row = np.zeros(len(COLUMNS))
+        row[COLUMNS.index("off_rating")] = row[COLUMNS.index("def_rating")] = np.nan
+        row[COLUMNS.index("elo")] = elo.INITIAL
+        return row
+
+    def lookup(self, team: str, date) -> dict:
+        """Estado de `team` antes de `date` (los partidos de ese mismo instante no cuentan)."""
+        return self.lookup_many([team], [date]).iloc[0].to_dict()
+
+    @instrument.timed()
+    def lookup_many(self, teams, dates) -> pd.DataFrame:
+        """
+        Estado de cada equipo antes de su fecha, para N pares (equipo, fecha).
+        Devuelve N filas en el mismo orden, con `COLUMNS` + `last_game` (fecha del
+        último partido considerado, NaT si no había ninguno).
+        """
+        teams = np.asarray(list(teams), dtype=object)
+        when = _to_ns(dates)
+        values = np.tile(self._empty_row(), (len(teams), 1))
+        last_game = np.full(len(teams), np.iinfo(np.int64).min, dtype=np.int64)
+
+        for team in pd.unique(teams):
+            if team not in self.teams:
+                continue
+            idx = np.flatnonzero(teams == team)
+            team_dates, team_values = self.teams[team]
+            # Último partido estrictamente anterior a la fecha pedida
+            pos = np.searchsorted(team_dates, when[idx], side="left") - 1
+            found = pos >= 0
+            values[idx[found]] = team_values[pos[found]]
+            last_game[idx[found]] = team_dates[pos[found]]
+
+        out = pd.DataFrame(values, columns=COLUMNS)
+        ints = [c for c in COLUMNS if c not in FLOAT_COLUMNS]
+        out[ints] = out[ints].astype(int)
+        # El mínimo de int64 es justamente NaT en datetime64[ns]
+        out["last_game"] = pd.to_datetime(last_game.astype("datetime64[ns]"), utc=True)
+        return out
+
+    # ---------- Persistencia ----------
+    def save(self, path):
+        arrays = {}
+        for code, (dates, values) in self.teams.items():
+            arrays[f"{code}_dates"] = dates
+            arrays[f"{code}_values"] = values
+        meta = {"version": FORMAT_VERSION, "season": self.season, "columns": COLUMNS,
+                "sources": sources_fingerprint(self.season)}
+        # Se reemplaza de una vez: quien lo lee en paralelo nunca ve un .npz cortado
+        with data.atomic_path(path) as tmp:
+            np.savez(tmp, meta=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, path) -> "FeatureStore":
+        with np.load(path) as npz:
+            meta = json.loads(str(npz["meta"]))
+            codes = [k[:-len("_dates")] for k in npz.files if k.endswith("_dates")]
+            teams = {code: (npz[f"{code}_dates"], npz[f"{code}_values"]) for code in codes}
+        store = cls(meta["season"], teams)
+        store.sources = meta["sources"]
+        store.columns = meta["columns"]
+        store.version = meta.get("version", 1)
+        return store
+
+
+def store_path(season: str) -> Path:
+    return seasons.path(season, "asof_store")
+
+
+def sources_fingerprint(season: str) -> dict:
+    """Hash de los JSON por equipo de la temporada (se rehashean sólo si cambian)."""
+    return {code: data.CACHE.get(path, data.file_hash)
+            for code, path in seasons.team_paths(season, "team_games").items()}
+
+
+@instrument.timed()
+def load_store(season=None) -> FeatureStore:
+    """Store de la temporada (desde el caché compartido); se reconstruye si cambió algún JSON."""
+    season = season or seasons.current()
+    path = store_path(season)
+    if path.exists():
+        # En memoria por versión del .npz (compartido por las sesiones y la precarga)
+        store = data.CACHE.get(path, FeatureStore.load)
+        current = store.version == FORMAT_VERSION and store.columns == COLUMNS
+        if current and store.sources == sources_fingerprint(season):
+            return store
+    store = FeatureStore.build(season)
+    store.save(path)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estado de un equipo antes de una fecha")
+    parser.add_argument("team")
+    parser.add_argument("date")
+    parser.add_argument("--season")
+    args = parser.parse_args()
+    print(json.dumps(load_store(args.season).lookup(args.team, args.date), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Backtest walk-forward del pipeline de predicción sobre una temporada.
+
+Reproduce la temporada en orden cronológico: se corta en ventanas de
+`window_days` días (la "jornada semanal") y cada ventana se predice con un
+modelo entrenado SÓLO con los partidos anteriores a su inicio. Configuraciones:
+
+- refit:  se reentrena desde cero cada `refit_every` ventanas (mismo pipeline y
+          mismos hiperparámetros que el .pkl; `C` se puede cambiar),
+- warm:   un único modelo que se actualiza cada `refit_every` ventanas partiendo
+          de los coeficientes anteriores (lbfgs con warm_start; liblinear no lo
+          soporta),
+- static: el .pkl tal cual, como referencia (vio la temporada al entrenarse, así
+          que es una cota optimista, no una validación).
+
+Los bloques de `refit` son independientes entre sí y se reparten en un pool de
+procesos junto con las configuraciones secuenciales (`warm`, `static`); cada
+proceso carga el dataset y el pipeline una sola vez. Por ventana se reportan
+accuracy, log-loss, Brier y probabilidad media vs. tasa real de victorias
+locales; por configuración, además, la curva de calibración.
+
+El dataset es `df_final` (las features de entrenamiento, derivadas de
+`games_final_csv.csv`, más el `target`).
+
+Uso:
+    python -m nba.backtest                               # refit, warm y static, ventanas de 7 días
+    python -m nba.backtest --window-days 14 --refit-every 2 --workers 4
+    python -m nba.backtest --modes refit --C 0.1 1 10    # una configuración por C
+"""
+import argparse
+import copy
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba import data, seasons
+from nba.features import FEATURE_COLUMNS
+from nba.matchups import MODEL_PATH
+
+MODES = ("refit", "warm", "static")
+CALIBRATION_BINS = 10
+EPS = 1e-15
+
+
+# ---------- Datos y ventanas ----------
+def load_dataset(season=None):
+    """(X, y, fechas en ns) de `df_final`, ordenados por fecha."""
+    df = data.load_df(["date", "target", *FEATURE_COLUMNS], season=season)
+    df = df.sort_values("date", kind="stable").reset_index(drop=True)
+    dates = pd.to_datetime(df["date"], utc=True).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    return df[FEATURE_COLUMNS], df["target"].to_numpy(dtype=int), dates
+
+
+def make_windows(dates: np.ndarray, window_days: int = 7, min_train: int = 100) -> list:
+    """
+    Ventanas consecutivas de `window_days` días; la primera empieza en el primer
+    partido que ya tiene `min_train` partidos anteriores para entrenar.
+    Cada ventana es (inicio, fin) en índices de filas, con train = [0, inicio).
+    """
+    if len(dates) <= min_train:
+        return []
+    step = np.int64(window_days) * 86_400 * 10**9
+    # El corte inicial cae en un cambio de fecha (nunca parte un mismo instante)
+    first = int(np.searchsorted(dates, dates[min_train], side="left"))
+    edges = np.arange(dates[first], dates[-1] + step, step)
+    bounds = np.unique(np.append(np.searchsorted(dates, edges, side="left"), len(dates)))
+    bounds = bounds[bounds >= first]
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+# ---------- Métricas ----------
+def scores(y: np.ndarray, p: np.ndarray) -> dict:
+    p_clip = np.clip(p, EPS, 1 - EPS)
+    return {
+        "n": int(len(y)),
+        "accuracy": float(np.mean((p > 0.5) == y)),
+        "log_loss": float(-np.mean(y * np.log(p_clip) + (1 - y) * np.log(1 - p_clip))),
+        "brier": float(np.mean((p - y) ** 2)),
+        "mean_p": float(p.mean()),
+        "home_rate": float(y.mean()),
+    }
+
+
+def calibration(y: np.ndarray, p: np.ndarray, bins: int = CALIBRATION_BINS) -> list:
+    """Curva de calibración: por tramo de probabilidad, media predicha vs. tasa real."""
+    idx = np.minimum((p * bins).astype(int), bins - 1)
+    count = np.bincount(idx, minlength=bins)
+    p_sum = np.bincount(idx, weights=p, minlength=bins)
+    y_sum = np.bincount(idx, weights=y, minlength=bins)
+    return [
+        {"bin": f"{b / bins:.1f}–{(b + 1) / bins:.1f}", "n": int(count[b]),
+         "mean_p": float(p_sum[b] / count[b]), "home_rate": float(y_sum[b] / count[b])}
+        for b in range(bins) if count[b]
+    ]
+
+
+# ---------- Workers ----------
+_state = {}
+
+
+def _init_worker(season, model_path):
+    # Una sola carga por proceso: el dataset y el pipeline original
+    from nba.sklearn_compat import load_pipeline
+
+    _state["X"], _state["y"], _state["dates"] = load_dataset(season)
+    _state["pipeline"] = load_pipeline(model_path)
+
+
+def make_model(config: dict):
+    """Copia sin entrenar del pipeline del .pkl, ajustada a la configuración."""
+    pipeline = copy.deepcopy(_state["pipeline"])
+    clf = pipeline.named_steps["model"]
+    if config.get("C") is not None:
+        clf.C = config["C"]
+    if config["mode"] == "warm":
+        clf.solver, clf.warm_start = "lbfgs", True
+    # Categorías fijas (las del .pkl): el espacio de features no cambia entre
+    # ventanas aunque todavía no haya aparecido algún récord "X-Y"
+    column_transform = pipeline.named_steps["preprocessing"].named_steps["column_transform"]
+    # (ColumnTransformer reentrena clones de `transformers`, así que se fija ahí)
+    fitted = column_transform.named_transformers_["cat"].named_steps["onehot"]
+    for name, steps, _ in column_transform.transformers:
+        if name == "cat":
+            steps.named_steps["onehot"].categories = [list(c) for c in fitted.categories_]
+    return pipeline
+
+
+def _run_task(config: dict, windows: list) -> tuple:
+    """Predice `windows` (consecutivas) con la configuración; devuelve filas y predicciones."""
+    X, y, dates = _state["X"], _state["y"], _state["dates"]
+    every = max(1, config.get("refit_every", 1))
+    model = _state["pipeline"] if config["mode"] == "static" else make_model(config)
+
+    rows, ys, ps = [], [], []
+    for i, (start, end) in enumerate(windows):
+        t0 = time.perf_counter()
+        if config["mode"] != "static" and i % every == 0:
+            model.fit(X.iloc[:start], y[:start])
+        p = model.predict_proba(X.iloc[start:end])[:, 1]
+        rows.append({
+            "config": config["name"],
+            "start": str(pd.Timestamp(dates[start], tz="UTC").date()),
+            "end": str(pd.Timestamp(dates[end - 1], tz="UTC").date()),
+            "n_train": start,
+            **scores(y[start:end], p),
+            "ms": round((time.perf_counter() - t0) * 1000, 2),
+        })
+        ys.append(y[start:end])
+        ps.append(p)
+    return config["name"], rows, np.concatenate(ys), np.concatenate(ps)
+
+
+def _tasks(configs: list, windows: list) -> list:
+    """`refit` se parte en bloques independientes de `refit_every` ventanas; el resto va entero."""
+    tasks = []
+    for config in configs:
+        if config["mode"] == "refit":
+            every = max(1, config.get("refit_every", 1))
+            tasks += [(config, windows[i:i + every]) for i in range(0, len(windows), every)]
+        else:
+            tasks.append((config, windows))
+    return tasks
+
+
+# ---------- Orquestación ----------
+def make_configs(modes=MODES, refit_every: int = 1, C_values=(None,)) -> list:
+    configs = []
+    for mode in modes:
+        for C in (C_values if mode != "static" else (None,)):
+            name = mode if C is None else f"{mode} C={C:g}"
+            configs.append({"name": name, "mode": mode, "refit_every": refit_every, "C": C})
+    return configs
+
+
+def run(season=None, configs=None, window_days: int = 7, min_train: int = 100,
+        workers: int = None, model_path=MODEL_PATH) -> dict:
+    """Corre el backtest de todas las configuraciones y devuelve el reporte."""
+    season = season or seasons.current()
+    configs = configs or make_configs()
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+
+    _, _, dates = load_dataset(season)
+    windows = make_windows(dates, window_days, min_train)
+    tasks = _tasks(configs, windows)
+
+    if workers == 1 or len(tasks) == 1:
+        _init_worker(season, model_path)
+        results = [_run_task(config, chunk) for config, chunk in tasks]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(season, model_path)) as pool:
+            results = list(pool.map(_run_task, *zip(*tasks)))
+
+    by_config = {}
+    for name, rows, y, p in results:
+        entry = by_config.setdefault(name, {"windows": [], "y": [], "p": []})
+        entry["windows"] += rows
+        entry["y"].append(y)
+        entry["p"].append(p)
+
+    report = {
+        "season": season,
+        "model": Path(model_path).name,
+        "window_days": window_days,
+        "min_train": min_train,
+        "workers": workers,
+        "seconds": None,
+        "configs": [],
+    }
+    for config in configs:
+        entry = by_config[config["name"]]
+        y, p = np.concatenate(entry["y"]), np.concatenate(entry["p"])
+        report["configs"].append({
+            **config,
+            "overall": scores(y, p),
+            "calibration": calibration(y, p),
+            "windows": sorted(entry["windows"], key=lambda r: r["start"]),
+        })
+    report["seconds"] = round(time.perf_counter() - t0, 2)
+    return report
+
+
+def report_path(season: str) -> Path:
+    return seasons.path(season, "backtest")
+
+
+def load_report(season=None):
+    """Último reporte guardado de la temporada (None si todavía no se corrió)."""
+    path = report_path(season or seasons.current())
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def windows_frame(report: dict) -> pd.DataFrame:
+    """Una fila por (configuración, ventana) para graficar."""
+    return pd.DataFrame([row for config in report["configs"] for row in config["windows"]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest walk-forward del modelo de predicción")
+    parser.add_argument("--season")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--window-days", type=int, default=7)
+    parser.add_argument("--refit-every", type=int, default=1, help="reentrenar cada N ventanas")
+    parser.add_argument("--min-train", type=int, default=100, help="partidos mínimos antes de la primera ventana")
+    parser.add_argument("--C", nargs="+", type=float, default=[None], help="regularización (una configuración por valor)")
+    parser.add_argument("--workers", type=int, help="procesos (por defecto, uno por CPU)")
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--no-save", action="store_true", help="no guardar el reporte en la partición")
+    args = parser.parse_args()
+
+    season = args.season or seasons.current()
+    report = run(season, make_configs(args.modes, args.refit_every, args.C), args.window_days,
+                 args.min_train, args.workers, args.model)
+
+    print(f"{season}: {len(report['configs'][0]['windows'])} ventanas de {args.window_days} días, "
+          f"{report['workers']} procesos, {report['seconds']:.2f} s")
+    print(f"{'configuración':18} {'n':>5} {'accuracy':>9} {'log-loss':>9} {'brier':>7}")
+    for config in report["configs"]:
+        o = config["overall"]
+        print(f"{config['name']:18} {o['n']:>5} {o['accuracy']:>9.1%} {o['log_loss']:>9.4f} {o['brier']:>7.4f}")
+    if not args.no_save:
+        path = report_path(season)
+        path.write_text(json.dumps(report, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"-> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Benchmarks de las etapas de la app sobre datos sintéticos de varias temporadas.
+
+`synthesize` genera, a partir de la temporada real, un directorio con los mismos
+esquemas que `games_clean.csv`, `games_final_csv.csv` y los JSON por equipo, pero
+con `scale` temporadas (la real corrida 1, 2, ... años hacia atrás y con ruido en
+las estadísticas). Sobre cada escala se mide:
+
+- convert:       CSV -> Feather (una vez por archivo, como en el primer arranque)
+- load:          lectura columnar de las columnas que usa la página 01
+- cube_build:    cubo de agregados y atípicos de la página 01 (`rollups.build_cube`,
+                 una vez por ingesta)
+- slice_cube:    lo que la página 01 hace en cada rerun: filtrar filas del cubo y
+                 de los atípicos (resumen, local/visitante, TS%, ratings)
+- feature_engine: reconstrucción de features desde los JSON (`FeatureEngine`)
+- feature_build: matriz X vectorizada para N cruces (`build_matchups`)
+- predict:       `predict_proba` del modelo portable sobre esa matriz
+- chart_spec:    spec Vega-Lite del gráfico de evolución de la página 01, armado
+                 con `nba.charts` como en la página (reporta también el tamaño del spec)
+
+Uso:
+    python -m nba.benchmark                          # escalas 1, 10 y 100
+    python -m nba.benchmark --scales 1 10 --json bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba import data, rollups, seasons
+from nba.feature_engine import FeatureEngine, load_raw_games
+from nba.features import build_matchups, team_stats
+from nba.teams import TEAM_NAMES
+
+# Columnas numéricas a las que se les agrega ruido en cada temporada sintética
+TEAM_NOISE_COLUMNS = ["oRtg", "dRtg", "tsPercent", "fTr", "orbPercent", "drbPercent", "trbPercent",
+                      "astPercent", "stlPercent", "blkPercent", "tovPercent"]
+GAMES_NOISE_COLUMNS = [
+    f"{side}_{m}" for side in ("home", "visitor")
+    for m in ("offensive_rating", "defensive_rating", "ts_percent", "assist_percent",
+              "steal_percent", "rebound_percent", "turnover_percent")
+]
+
+# Las mismas columnas que lee la página 01
+TEAM_COLUMNS = ["team", "game_number", "date", "oRtg", "dRtg", "net_rating", "tsPercent",
+                "W_percent", "win_game", "loss_game"]
+GAMES_COLUMNS = ["date", "home_team", "visitor_team"] + [
+    f"{side}_{m}" for m in ("offensive_rating", "defensive_rating", "ts_percent",
+                            "assist_percent", "rebound_percent", "turnover_percent")
+    for side in ("home", "visitor")
+]
+
+
+def season_label(base: str, years_back: int) -> str:
+    start = int(base[:4]) - years_back
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def _shift_ids(df: pd.DataFrame, dates: pd.Series) -> pd.Series:
+    # Mismo formato que los ids reales: AAAAMMDD + 0 + código del local
+    return dates.dt.strftime("%Y%m%d") + "0" + df["game_id"].str[-3:]
+
+
+def _noisy(values, rng, rel=0.02):
+    values = np.asarray(values, dtype=float)
+    return np.round(values * (1 + rng.normal(0, rel, values.shape)), 3)
+
+
+def _synth_table(df: pd.DataFrame, base: str, scale: int, noise_columns, rng, season_col=None) -> pd.DataFrame:
+    dates = pd.to_datetime(df["date"], utc=True)
+    parts = []
+    for years_back in range(scale):
+        part = df.copy()
+        shifted = dates - pd.DateOffset(years=years_back)
+        part["game_id"] = _shift_ids(df, shifted)
+        part["date"] = shifted.dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+        if years_back:
+            for col in noise_columns:
+                part[col] = _noisy(part[col], rng)
+        if season_col:
+            part[season_col] = part["team"] + "_" + season_label(base, years_back)
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+def _synth_json(games: list, years_back: int, rng) -> list:
+    out = []
+    for game in games:
+        date = pd.Timestamp(game["date"]) - pd.DateOffset(years=years_back)
+        game = {**game, "gameId": f"{date:%Y%m%d}0{game['gameId'][-3:]}", "date": f"{date:%Y-%m-%dT%H:%M:%SZ}"}
+        if years_back and game.get("teamGameAdvStats"):
+            game["teamGameAdvStats"] = [
+                {k: (round(v * (1 + rng.normal(0, 0.02)), 3) if isinstance(v, float) else v) for k, v in s.items()}
+                for s in game["teamGameAdvStats"]
+            ]
+        out.append(game)
+    return out
+
+
+def synthesize(out_dir, scale: int, seed: int = 0, base=None) -> dict:
+    """
+    Escribe en `out_dir` los datasets con `scale` temporadas (copias de `base`,
+    por defecto la más reciente) y devuelve sus rutas.
+    La escala 1 es una copia exacta de la temporada real.
+    """
+    base = base or seasons.current()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    team_df = pd.read_csv(seasons.resolve(base, "games_clean"))
+    games_df = pd.read_csv(seasons.resolve(base, "games_final"))
+    paths = {"games_clean": out_dir / "games_clean.csv", "games_final": out_dir / "games_final_csv.csv"}
+    _synth_table(team_df, base, scale, TEAM_NOISE_COLUMNS, rng, season_col="team_file").to_csv(paths["games_clean"], index=False)
+    _synth_table(games_df, base, scale, GAMES_NOISE_COLUMNS, rng).to_csv(paths["games_final"], index=False)
+
+    for code, src in seasons.team_paths(base, "team_games").items():
+        games = json.loads(src.read_text(encoding="utf-8"))
+        for years_back in range(scale):
+            dst = out_dir / f"{code}_{season_label(base, years_back)}.json"
+            dst.write_text(json.dumps(_synth_json(games, years_back, rng)), encoding="utf-8")
+    return paths
+
+
+def _timed(fn, repeat: int):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return result, times
+
+
+# ---------- Etapas (cada una replica lo que hace la página correspondiente) ----------
+def _slice_cube(cube: pd.DataFrame, outliers: pd.DataFrame, teams) -> list:
+    return [
+        rollups.slice_cube(cube, rollups.TEAM_METRICS, teams=teams),
+        rollups.slice_cube(cube, "offensive_rating", side="home", teams=teams),
+        rollups.slice_cube(cube, "offensive_rating", side="away", teams=teams),
+        rollups.slice_cube(cube, "ts_percent", teams=teams),
+        rollups.slice_outliers(outliers, "ts_percent", teams=teams),
+        rollups.pivot(cube, ["offensive_rating", "defensive_rating"], side="home", teams=teams),
+    ]
+
+
+def _feature_engine(out_dir, base: str, scale: int) -> int:
+    rows = 0
+    for years_back in range(scale):
+        season = season_label(base, years_back)
+        paths = {code: Path(out_dir) / f"{code}_{season}.json" for code in TEAM_NAMES}
+        engine = FeatureEngine(season)
+        for game, teams in load_raw_games(season, {c: p for c, p in paths.items() if p.exists()}):
+            engine.add_game(game, teams)
+        rows += len(engine.model_rows)
+    return rows
+
+
+def _chart_spec(team_df: pd.DataFrame) -> dict:
+    import altair as alt
+
+    from nba.charts import chart_data
+
+    points = chart_data(team_df, x="game_number", y="W_percent", series="team", columns=["net_rating"])
+    chart = (
+        alt.Chart(points)
+        .mark_line(point=True, interpolate="monotone", strokeWidth=2)
+        .encode(x="game_number:Q", y="W_percent:Q", color="team:N",
+                tooltip=["team:N", "game_number:Q", "W_percent:Q", "net_rating:Q"])
+    )
+    return chart.to_dict()
+
+
+def run_scale(scale: int, repeat: int = 3, work_dir=None, seed: int = 0) -> list:
+    """Genera los datos de una escala, mide cada etapa y devuelve una fila por etapa."""
+    from nba.columnar import convert, read_columns
+    from nba.matchups import home_win_proba
+    from nba.portable import PortableModel, ensure_exported
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        base = seasons.current()
+        paths = synthesize(tmp, scale, seed, base)
+        results = []
+
+        def record(stage, rows, times, **extra):
+            results.append({
+                "scale": scale, "stage": stage, "rows": int(rows), "repeat": len(times),
+                "best_ms": round(min(times), 3), "median_ms": round(statistics.median(times), 3),
+                **extra,
+            })
+
+        _, times = _timed(lambda: [convert(p) for p in paths.values()], 1)
+        record("convert", sum(len(pd.read_csv(p, usecols=[0])) for p in paths.values()), times)
+
+        (team_df, games_df), times = _timed(lambda: (read_columns(paths["games_clean"], TEAM_COLUMNS),
+                                                     read_columns(paths["games_final"], GAMES_COLUMNS)), repeat)
+        record("load", len(team_df) + len(games_df), times)
+
+        (cube, outliers), times = _timed(lambda: rollups.build_cube(team_df, games_df), repeat)
+        record("cube_build", len(team_df) + len(games_df), times)
+
+        # Un rerun con la mitad de los equipos seleccionados
+        teams = sorted(cube["team"].unique())[::2]
+        _, times = _timed(lambda: _slice_cube(cube, outliers, teams), repeat)
+        record("slice_cube", len(cube) + len(outliers), times)
+
+        rows, times = _timed(lambda: _feature_engine(tmp, base, scale), 1)
+        record("feature_engine", rows, times)
+
+        # Un cruce por partido del dataset, con las estadísticas actuales de cada equipo
+        stats = team_stats(data.load_teams(base))
+        rng = np.random.default_rng(seed)
+        pairs = rng.choice(len(stats), size=(len(games_df), 2))
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        homes, visitors = stats.index[pairs[:, 0]], stats.index[pairs[:, 1]]
+        X, times = _timed(lambda: build_matchups(stats, homes, visitors), repeat)
+        record("feature_build", len(X), times)
+
+        model = PortableModel.load(ensure_exported(Path("models/logreg_no_percents_pipeline.pkl")))
+        _, times = _timed(lambda: home_win_proba(model, X), repeat)
+        record("predict", len(X), times)
+
+        spec, times = _timed(lambda: _chart_spec(team_df), repeat)
+        record("chart_spec", len(team_df), times, payload_bytes=len(json.dumps(spec)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks por etapa sobre datos sintéticos")
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3, help="repeticiones por etapa (se reporta mejor y mediana)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", type=Path, help="directorio para los datos sintéticos (por defecto, temporal)")
+    parser.add_argument("--json", type=Path, help="guarda el resultado en este archivo")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'escala':>6}  {'etapa':15} {'filas':>10} {'mejor ms':>10} {'mediana ms':>11}")
+    for scale in args.scales:
+        for r in run_scale(scale, args.repeat, args.work_dir, args.seed):
+            results.append(r)
+            print(f"{r['scale']:>5}x  {r['stage']:15} {r['rows']:>10,} {r['best_ms']:>10.1f} {r['median_ms']:>11.1f}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
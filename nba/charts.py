@@ -0,0 +1,105 @@
+"""Datos para los gráficos Altair: sólo las columnas codificadas y un tope de puntos.
+
+Altair embebe el DataFrame entero en el spec Vega-Lite que recibe el navegador
+(y falla por encima de 5.000 filas). `chart_data` reduce los datos en el servidor
+antes de armar el gráfico:
+- se queda con las columnas que usa el gráfico (ejes, serie y tooltips),
+- limita cada serie a `max_points` puntos, con LTTB (Largest-Triangle-Three-
+  Buckets: conserva la forma de la curva, picos incluidos) o con el promedio por
+  tramos de x (`method="mean"`),
+- reparte además un tope total `max_rows` entre las series.
+
+Para los heatmaps, `grid_data` deja una grilla regular de a lo sumo `max_rows`
+celdas (una de cada k líneas por eje).
+
+Con eso el tamaño del spec y el tiempo de render quedan acotados aunque crezcan
+los datos. Topes configurables con NBA_CHART_MAX_POINTS y NBA_CHART_MAX_ROWS.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from nba import instrument
+
+MAX_POINTS = int(os.environ.get("NBA_CHART_MAX_POINTS", 300))
+MAX_ROWS = int(os.environ.get("NBA_CHART_MAX_ROWS", 5000))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """Índices (ordenados) de los `n` puntos que elige LTTB; x debe venir ordenado."""
+    length = len(x)
+    if n >= length or n < 3:
+        return np.arange(length)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bordes de los n-2 tramos intermedios (el primero y el último punto se conservan)
+    edges = (np.arange(n - 1) * (length - 2) / (n - 2)).astype(int) + 1
+    edges[-1] = length - 1
+    out = np.empty(n, dtype=int)
+    out[0], out[-1] = 0, length - 1
+    a = 0
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        # Promedio del tramo siguiente (para el último, el punto final)
+        nxt = slice(end, edges[i + 2]) if i + 2 < len(edges) else slice(length - 1, length)
+        avg_x, avg_y = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def _mean_buckets(group: pd.DataFrame, x: str, y: str, n: int) -> pd.DataFrame:
+    # n tramos de x del mismo ancho: x e y promediados, el resto de las columnas del primer punto
+    bucket = pd.cut(group[x], bins=n, labels=False, include_lowest=True)
+    agg = {col: ("mean" if col in (x, y) else "first") for col in group.columns}
+    return group.groupby(bucket, sort=True).agg(agg)
+
+
+@instrument.timed()
+def chart_data(df: pd.DataFrame, x: str, y: str, series: str = None, columns=(),
+               max_points: int = None, max_rows: int = None, method: str = "lttb") -> pd.DataFrame:
+    """
+    Devuelve sólo [x, y, series, *columns] con a lo sumo `max_points` filas por serie
+    (y `max_rows` en total). Las filas con `y` vacío se descartan.
+    """
+    max_points = max_points or MAX_POINTS
+    max_rows = max_rows or MAX_ROWS
+    keep = list(dict.fromkeys([c for c in (x, y, series, *columns) if c]))
+    df = df[keep].dropna(subset=[y])
+
+    groups = [df] if series is None else [g for _, g in df.groupby(series, observed=True, sort=False)]
+    per_series = max(3, min(max_points, max_rows // max(len(groups), 1)))
+
+    parts = []
+    for group in groups:
+        group = group.sort_values(x, kind="stable")
+        if len(group) <= per_series:
+            parts.append(group)
+        elif method == "mean":
+            parts.append(_mean_buckets(group, x, y, per_series))
+        else:
+            parts.append(group.iloc[lttb_indices(group[x].to_numpy(), group[y].to_numpy(), per_series)])
+    out = pd.concat(parts, ignore_index=True) if parts else df.iloc[0:0]
+    return out[keep]
+
+
+def grid_data(df: pd.DataFrame, x: str, y: str, max_rows: int = None) -> pd.DataFrame:
+    """
+    Grilla regular (una fila por punto x, y) con a lo sumo `max_rows` filas: se queda
+    con una de cada k líneas en cada eje, así la grilla sigue siendo regular.
+    """
+    max_rows = max_rows or MAX_ROWS
+    xs, ys = np.unique(df[x]), np.unique(df[y])
+    k = int(np.ceil(np.sqrt(len(xs) * len(ys) / max_rows)))
+    if k <= 1:
+        return df
+    keep = np.isin(df[x], xs[::k]) & np.isin(df[y], ys[::k])
+    return df[keep]
+
+
+def payload_bytes(chart) -> int:
+    """Tamaño del spec Vega-Lite (con los datos embebidos) que se envía al navegador."""
+    return len(json.dumps(chart.to_dict()))
@@ -0,0 +1,137 @@
+"""Almacenamiento columnar (Feather / Arrow IPC) de los datasets CSV.
+
+Cada CSV se convierte una sola vez a `<archivo>.feather` sin compresión, con los
+tipos de su esquema (`SCHEMAS`): fechas parseadas, códigos de equipo y etiquetas
+como categorías, enteros chicos (int8/int16) y float32 en las tablas que sólo se
+grafican o agregan. `df_final` conserva float64: con él se entrena y se evalúa.
+Los loaders leen ese archivo con memory mapping y sólo las columnas pedidas, así
+que el costo de carga depende de las columnas que usa cada gráfico y no del
+tamaño del archivo.
+
+El CSV sigue siendo la fuente: si el .feather no existe, es más viejo o se
+escribió con otra versión de los esquemas (`SCHEMA_VERSION`), se regenera.
+El filtro por equipo no se hace acá: lo resuelve el store canónico de partidos
+(`nba.gamestore`), que ubica las filas por índice.
+
+Uso:
+    python -m nba.columnar            # convierte los datasets de todas las temporadas
+"""
+import argparse
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from nba import data, seasons
+
+# Datasets de cada temporada que se guardan en formato columnar
+DATASETS = ["games_clean", "df_final", "games_final"]
+
+SCHEMA_VERSION = 2
+
+DATE_COLUMNS = ["date"]
+CATEGORY_COLUMNS = ["team", "team_file", "team_json", "home_team", "visitor_team", "opponent"]
+
+# Por dataset: etiquetas que pasan a categoría, tipo de los flotantes y si los enteros
+# se achican al menor tipo que alcance (win_game -> int8, game_number -> int8, W -> int8/int16).
+SCHEMAS = {
+    "games_clean": {"categories": [], "float": "float32", "downcast": True},
+    "games_final": {"categories": ["home_result", "visitor_result", "home_streak", "visitor_streak"],
+                    "float": "float32", "downcast": True},
+    # Con `df_final` se entrena: el pipeline elige sus columnas por dtype (int64/float64
+    # numéricas, object/category categóricas), así que las features conservan sus tipos
+    "df_final": {"categories": ["home_result", "visitor_result"], "float": "float64", "downcast": False},
+}
+
+
+def columnar_path(csv_path) -> Path:
+    return Path(csv_path).with_suffix(".feather")
+
+
+def dataset_of(csv_path) -> str:
+    """Nombre del dataset (`seasons.DATASETS`) por el nombre del archivo, o None."""
+    name = Path(csv_path).name
+    return next((ds for ds, rel in seasons.DATASETS.items() if Path(rel).name == name), None)
+
+
+def _typed(df: pd.DataFrame, dataset: str = None) -> pd.DataFrame:
+    schema = SCHEMAS.get(dataset, {"categories": [], "float": "float64", "downcast": False})
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], utc=True)
+    for col in [*CATEGORY_COLUMNS, *schema["categories"]]:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    if schema["downcast"]:
+        for col in df.select_dtypes("integer").columns:
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+    floats = df.select_dtypes("floating").columns
+    df[floats] = df[floats].astype(schema["float"])
+    return df
+
+
+def convert(csv_path, sep=",") -> Path:
+    """Convierte un CSV a Feather tipado (sin compresión, para poder mapearlo)."""
+    csv_path = Path(csv_path)
+    out = columnar_path(csv_path)
+    table = pa.Table.from_pandas(_typed(pd.read_csv(csv_path, sep=sep), dataset_of(csv_path)), preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, b"nba_schema": str(SCHEMA_VERSION).encode()})
+    with data.atomic_path(out) as tmp:
+        feather.write_feather(table, tmp, compression="uncompressed")
+    return out
+
+
+def _schema_version(path) -> int:
+    with pa.memory_map(str(path)) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return int(metadata.get(b"nba_schema", 0))
+
+
+def is_stale(csv_path) -> bool:
+    out = columnar_path(csv_path)
+    if not out.exists() or out.stat().st_mtime < Path(csv_path).stat().st_mtime:
+        return True
+    return _schema_version(out) != SCHEMA_VERSION
+
+
+def read_columns(csv_path, columns=None, sep=",") -> pd.DataFrame:
+    """
+    Lee un dataset desde su versión columnar (convirtiéndolo si hace falta).
+    `columns=None` trae todas las columnas.
+    """
+    csv_path = Path(csv_path)
+    read = None if columns is None else list(columns)
+    if is_stale(csv_path):
+        try:
+            convert(csv_path, sep=sep)
+        except OSError:
+            # sin permisos de escritura: se lee el CSV directamente
+            df = _typed(pd.read_csv(csv_path, sep=sep, usecols=read), dataset_of(csv_path))
+            return df if columns is None else df[read]
+    return feather.read_table(columnar_path(csv_path), columns=read, memory_map=True).to_pandas()
+
+
+def schema(csv_path) -> pa.Schema:
+    """Esquema (columnas y tipos) sin leer los datos."""
+    if is_stale(csv_path):
+        convert(csv_path)
+    with pa.memory_map(str(columnar_path(csv_path))) as source:
+        return pa.ipc.open_file(source).schema
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte los CSV a Feather (Arrow IPC)")
+    parser.add_argument("paths", nargs="*", type=Path)
+    args = parser.parse_args()
+    paths = args.paths or [
+        seasons.path(season, name) for season in seasons.available() for name in DATASETS
+        if seasons.path(season, name).exists()
+    ]
+    for path in paths:
+        out = convert(path)
+        print(f"{path} -> {out} ({out.stat().st_size / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
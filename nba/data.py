@@ -0,0 +1,269 @@
+"""Capa de acceso a datos compartida por todas las páginas.
+
+Reemplaza los `@st.cache_data` de cada página por un único caché en memoria:
+- la clave es (archivo, lector, argumentos) y cada entrada guarda la huella del
+  archivo (mtime + tamaño + hash del contenido). En cada acceso sólo se hace un
+  `stat`; si cambió, se compara el hash y únicamente se vuelve a leer el archivo
+  cuando el contenido es distinto. Así, después de actualizar los datos, la app
+  los recarga una vez sin reiniciar el servidor.
+- el total de memoria está acotado (LRU): al superar el límite se descartan los
+  DataFrames usados hace más tiempo. Límite configurable con NBA_CACHE_MAX_MB.
+
+Cada loader recibe la temporada (`season=None` = la más reciente) y resuelve la
+ruta con el manifiesto de `nba.seasons`, así que sólo se abre esa partición. Los
+filtros por equipo (`teams`) son búsquedas por índice: los partidos de cada equipo
+salen del store canónico (`nba.gamestore`) y se ubican por `game_id` en la tabla
+cacheada, sin recorrerla.
+"""
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba import instrument, seasons
+
+# Mapeo de archivos de feature importance
+FEATURE_IMPORTANCE_FILES = {
+    "Logistic Regression": Path("data/models_feature_importance/log_reg_feature_importances.csv"),
+    "XGBoost": Path("data/models_feature_importance/xgboost_feature_importances.csv"),
+    "LightGBM": Path("data/models_feature_importance/lgbm_feature_importances.csv"),
+}
+
+# Columnas de `games_clean` que grafica la página de exploración (y que precarga `nba.warmup`)
+EXPLORATION_COLUMNS = ["team", "game_number", "date", "oRtg", "dRtg", "net_rating", "tsPercent", "W_percent",
+                       "win_game", "loss_game"]
+
+MAX_CACHE_BYTES = int(float(os.environ.get("NBA_CACHE_MAX_MB", 512)) * 1024 ** 2)
+
+
+def file_hash(path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@contextmanager
+def atomic_path(path):
+    """
+    Ruta temporal en el mismo directorio que `path`; si el bloque termina bien, la
+    mueve sobre `path` de una vez (`os.replace`). Los lectores concurrentes (otras
+    sesiones, la precarga) ven el archivo viejo o el nuevo, nunca uno a medio escribir.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=path.suffix, dir=path.parent)
+    os.close(fd)
+    try:
+        yield Path(tmp)
+        # mkstemp crea el archivo con 0600: se conservan los permisos del que reemplaza
+        os.chmod(tmp, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def _nbytes(obj, depth: int = 0) -> int:
+    """Memoria aproximada de un objeto cacheado (frames, arreglos, stores y sus contenedores)."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    size = sys.getsizeof(obj)
+    if depth >= 4:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(_nbytes(k, depth + 1) + _nbytes(v, depth + 1) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(_nbytes(v, depth + 1) for v in obj)
+    if hasattr(obj, "__dict__") and not isinstance(obj, type):
+        return size + _nbytes(vars(obj), depth + 1)
+    return size
+
+
+class FileCache:
+    """Caché LRU acotado en bytes, invalidado por la huella de cada archivo."""
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # clave -> (stat, hash, valor, bytes)
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, reader, *args):
+        path = Path(path)
+        key = (str(path), reader.__name__, args)
+        st_ = path.stat()
+        stat = (st_.st_mtime_ns, st_.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stat:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                instrument.count("cache.acierto")
+                return entry[2]
+
+        # Cambió mtime/tamaño: sólo se relee si además cambió el contenido
+        digest = file_hash(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == digest:
+                self._entries[key] = (stat, digest, entry[2], entry[3])
+                self._entries.move_to_end(key)
+                self.hits += 1
+                instrument.count("cache.acierto")
+                return entry[2]
+
+        instrument.count("cache.fallo")
+        with instrument.span(f"cache.lectura.{reader.__name__}"):
+            value = reader(path, *args)
+        size = _nbytes(value)
+        with self._lock:
+            self.misses += 1
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[3]
+            self._entries[key] = (stat, digest, value, size)
+            self.nbytes += size
+            self._evict()
+        return value
+
+    def _evict(self):
+        # Siempre se conserva la última entrada, aunque sola supere el límite
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, _, _, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def info(self) -> pd.DataFrame:
+        """Una fila por objeto cacheado (archivo, lector, tipo, filas, bytes), del más viejo al más nuevo."""
+        with self._lock:
+            rows = [
+                {"path": key[0], "reader": key[1], "args": key[2], "type": type(entry[2]).__name__,
+                 "rows": len(entry[2]) if isinstance(entry[2], (pd.DataFrame, pd.Series)) else None,
+                 "bytes": entry[3]}
+                for key, entry in self._entries.items()
+            ]
+        return pd.DataFrame(rows, columns=["path", "reader", "args", "type", "rows", "bytes"])
+
+
+CACHE = FileCache()
+
+
+def _frame(value):
+    # Copia superficial: las páginas pueden agregar columnas sin tocar el caché
+    return value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
+
+
+# ---------- Lectores (reciben la ruta y devuelven el objeto a cachear) ----------
+def _read_columnar(path, columns):
+    # pyarrow se importa recién acá: las páginas que sólo leen CSV chicos no lo cargan
+    from nba.columnar import read_columns
+
+    return read_columns(path, list(columns) if columns is not None else None)
+
+
+def _read_teams(path):
+    return pd.read_csv(path, sep=";")
+
+
+def _read_csv(path):
+    return pd.read_csv(path)
+
+
+def _read_index(path, keys):
+    # Índice (game_id[, team]) -> fila de la tabla completa, para buscar por posición
+    table = _read_columnar(path, keys)
+    return pd.MultiIndex.from_frame(table) if len(keys) > 1 else pd.Index(table[keys[0]])
+
+
+# ---------- API para las páginas ----------
+def _columns(columns):
+    if not columns:
+        return None
+    # La columna clave del índice siempre se lee (y se descarta al final si no se pidió)
+    return tuple(dict.fromkeys(["game_id", *columns]))
+
+
+def _select(path, columns, season, teams, team_column=None) -> pd.DataFrame:
+    """
+    Tabla completa (cacheada) o, con `teams`, sólo sus filas: los partidos de cada
+    equipo salen de las listas del store canónico y se ubican en la tabla por su
+    índice, sin recorrerla.
+    """
+    table = CACHE.get(path, _read_columnar, _columns(columns))
+    if teams:
+        from nba.gamestore import load_store
+
+        store = load_store(season)
+        if team_column is None:
+            keys = store.game_ids(teams)
+            index = CACHE.get(path, _read_index, ("game_id",))
+        else:
+            # Tabla por equipo y partido: se busca el par (partido, equipo)
+            ids = [store.game_ids(team) for team in teams]
+            keys = pd.MultiIndex.from_arrays([
+                np.concatenate([i.to_numpy() for i in ids]) if ids else [],
+                np.repeat(list(teams), [len(i) for i in ids]),
+            ])
+            index = CACHE.get(path, _read_index, ("game_id", team_column))
+        pos = index.get_indexer(keys)
+        table = table.iloc[np.sort(pos[pos >= 0])]
+    return table[list(columns)] if columns else _frame(table)
+
+
+@instrument.timed()
+def load_team_data(columns=None, season=None, teams=None) -> pd.DataFrame:
+    """Dataset por equipo y partido (`games_clean`); `teams` deja sólo esos equipos."""
+    return _select(seasons.resolve(season, "games_clean"), columns, season, teams, team_column="team")
+
+
+@instrument.timed()
+def load_games_data(columns=None, season=None, teams=None) -> pd.DataFrame:
+    """Dataset por partido, local vs visitante (`games_final_csv`); `teams` = juega de local o visitante."""
+    return _select(seasons.resolve(season, "games_final"), columns, season, teams)
+
+
+@instrument.timed()
+def load_df(columns=None, season=None, teams=None) -> pd.DataFrame:
+    """Dataset final de entrenamiento (`df_final`)."""
+    return _select(seasons.resolve(season, "df_final"), columns, season, teams)
+
+
+@instrument.timed()
+def load_teams(season=None) -> pd.DataFrame:
+    """Estadísticas avanzadas de cada equipo al cierre de los datos (CSV separado por `;`)."""
+    return _frame(CACHE.get(seasons.resolve(season, "teams"), _read_teams))
+
+
+@instrument.timed()
+def load_schedule(season=None) -> pd.DataFrame:
+    """Calendario de la temporada con nombres de equipo para cruzar con `load_teams`."""
+    from nba.gamestore import load_store
+
+    return load_store(season).schedule().copy(deep=False)
+
+
+@instrument.timed()
+def load_feature_importance(filepath):
+    """Carga el CSV de feature importance (None si no existe)."""
+    if not Path(filepath).exists():
+        return None
+    return _frame(CACHE.get(filepath, _read_csv))
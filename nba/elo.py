@@ -0,0 +1,144 @@
+"""Ratings Elo por equipo, actualizados partido a partido.
+
+Cada partido jugado de la temporada mueve los ratings de los dos equipos en
+O(1): la victoria esperada del local sale de la diferencia de ratings (más la
+ventaja de localía) y el ajuste es K × (resultado − esperado), escalado por el
+margen de victoria (como en el Elo de FiveThirtyEight). Todos arrancan en 1500.
+
+- `EloEngine`: modo incremental, un partido por vez, con el historial completo
+  (rating antes y después de cada partido). Lo usa el `FeatureEngine` para
+  agregar `home_elo`, `visitor_elo` y `elo_diff` (ratings PREVIOS al partido) a
+  `games_final_csv.csv`, y el feature store "as of" para exponer `elo`.
+- `replay`: la temporada entera en una sola pasada sobre arreglos (sólo índices
+  enteros, puntos y un vector de ratings), a partir del store canónico.
+
+Uso:
+    python -m nba.elo                 # ratings finales de la temporada más reciente
+    python -m nba.elo --write         # agrega/actualiza las columnas Elo en games_final_csv.csv
+"""
+import argparse
+import math
+
+import numpy as np
+import pandas as pd
+
+from nba import seasons
+
+INITIAL = 1500.0
+K = 20.0
+HOME_ADVANTAGE = 100.0
+ELO_COLUMNS = ["home_elo", "visitor_elo", "elo_diff"]
+DECIMALS = 2
+
+
+def expected(diff: float) -> float:
+    """P(gana el local) según la diferencia de ratings (local − visitante + localía)."""
+    return 1.0 / (1.0 + 10.0 ** (-diff / 400.0))
+
+
+def delta(home_elo: float, visitor_elo: float, home_pts: int, visitor_pts: int,
+          k: float = K, home_advantage: float = HOME_ADVANTAGE) -> float:
+    """Puntos que gana el local (y pierde el visitante) con este resultado."""
+    diff = home_elo + home_advantage - visitor_elo
+    home_win = home_pts > visitor_pts
+    # Margen: más puntos por palizas, amortiguado si ganó el favorito
+    winner_diff = diff if home_win else -diff
+    multiplier = (abs(home_pts - visitor_pts) + 3) ** 0.8 / (7.5 + 0.006 * winner_diff)
+    return k * multiplier * (float(home_win) - expected(diff))
+
+
+def replay(home, visitor, home_pts, visitor_pts, n_teams: int,
+           k: float = K, home_advantage: float = HOME_ADVANTAGE, initial: float = INITIAL):
+    """
+    Una pasada por los partidos (en orden) sobre arreglos de índices de equipo.
+    Devuelve (rating previo del local, rating previo del visitante, ratings finales).
+    """
+    ratings = np.full(n_teams, initial)
+    n = len(home)
+    pre_home = np.empty(n)
+    pre_visitor = np.empty(n)
+    for i in range(n):
+        h, v = home[i], visitor[i]
+        pre_home[i], pre_visitor[i] = ratings[h], ratings[v]
+        d = delta(ratings[h], ratings[v], home_pts[i], visitor_pts[i], k, home_advantage)
+        ratings[h] += d
+        ratings[v] -= d
+    return pre_home, pre_visitor, ratings
+
+
+class EloEngine:
+    """Ratings actuales + historial, actualizados de a un partido."""
+
+    def __init__(self, k: float = K, home_advantage: float = HOME_ADVANTAGE, initial: float = INITIAL):
+        self.k = k
+        self.home_advantage = home_advantage
+        self.initial = initial
+        self.ratings = {}
+        self.history = []    # (game_id, date, team, rating previo, rating posterior)
+
+    def rating(self, team: str) -> float:
+        return self.ratings.get(team, self.initial)
+
+    def add_game(self, game_id: str, date: str, home: str, visitor: str, home_pts: int, visitor_pts: int) -> dict:
+        """Registra el resultado y devuelve los ratings PREVIOS al partido."""
+        h, v = self.rating(home), self.rating(visitor)
+        d = delta(h, v, home_pts, visitor_pts, self.k, self.home_advantage)
+        self.ratings[home], self.ratings[visitor] = h + d, v - d
+        self.history += [(game_id, date, home, h, h + d), (game_id, date, visitor, v, v - d)]
+        return {"home_elo": h, "visitor_elo": v, "elo_diff": h - v,
+                "p_home": expected(h + self.home_advantage - v)}
+
+    def history_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.history, columns=["game_id", "date", "team", "elo_before", "elo_after"])
+
+
+def game_columns(pre: dict) -> dict:
+    """Columnas Elo de una fila de `games_final` (redondeadas como el resto del CSV)."""
+    return {col: round(pre[col], DECIMALS) for col in ELO_COLUMNS}
+
+
+def season_ratings(season=None) -> pd.DataFrame:
+    """Ratings previos de cada partido jugado de la temporada (una pasada con `replay`)."""
+    from nba.gamestore import load_store
+
+    games = load_store(season).games
+    games = games[games["in_season"] & games["home_pts"].notna()]
+    teams = pd.Index(sorted(set(games["home_team"]) | set(games["visitor_team"])))
+    pre_home, pre_visitor, final = replay(
+        teams.get_indexer(games["home_team"]), teams.get_indexer(games["visitor_team"]),
+        games["home_pts"].to_numpy(dtype=int), games["visitor_pts"].to_numpy(dtype=int), len(teams),
+    )
+    out = pd.DataFrame({"home_elo": pre_home, "visitor_elo": pre_visitor}, index=games.index)
+    out["elo_diff"] = out["home_elo"] - out["visitor_elo"]
+    out.attrs["final"] = pd.Series(final, index=teams, name="elo").sort_values(ascending=False)
+    return out
+
+
+def write_columns(season=None) -> pd.DataFrame:
+    """Agrega (o actualiza) las columnas Elo de `games_final_csv.csv` sin tocar el resto."""
+    season = season or seasons.current()
+    path = seasons.path(season, "games_final")
+    games = pd.read_csv(path, dtype=str, keep_default_na=False)
+    ratings = season_ratings(season).round(DECIMALS)
+    for col in ELO_COLUMNS:
+        games[col] = ratings[col].reindex(games["game_id"]).map(lambda x: "" if math.isnan(x) else f"{x:g}").to_numpy()
+    games.to_csv(path, index=False)
+    return games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ratings Elo de la temporada")
+    parser.add_argument("--season")
+    parser.add_argument("--write", action="store_true", help="escribe las columnas Elo en games_final_csv.csv")
+    args = parser.parse_args()
+
+    season = args.season or seasons.current()
+    if args.write:
+        write_columns(season)
+        print(f"-> {seasons.path(season, 'games_final')}")
+    final = season_ratings(season).attrs["final"]
+    print(final.round(1).to_string())
+
+
+if __name__ == "__main__":
+    main()
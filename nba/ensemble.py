@@ -0,0 +1,103 @@
+"""Ensamble: un partido (o una jornada) puntuado por todos los modelos disponibles.
+
+`ModelEnsemble` toma los modelos de `evaluation.MODELS` cuyo artefacto existe y
+los carga recién la primera vez que se usan, desde el caché compartido
+(`data.CACHE`: se releen sólo si cambia el .pkl). Para puntuar, la matriz de
+features se arma UNA vez y todos los modelos la reciben a la vez, cada uno en
+un hilo del pool. Los que sueltan el GIL al predecir (XGBoost, LightGBM, el
+álgebra de NumPy) corren en paralelo: la latencia se acerca a la del modelo más
+lento en lugar de a la suma.
+
+El resultado es una columna de P(gana el local) por modelo más la mezcla
+(`BLEND`): el promedio, con pesos opcionales por modelo.
+
+Uso:
+    python -m nba.ensemble BOS NYK          # probabilidades de cada modelo y la mezcla
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba import data, instrument, portable
+from nba.evaluation import MODELS
+from nba.features import build_features
+from nba.matchups import home_win_proba
+
+BLEND = "Ensamble"
+
+
+def _read_pipeline(path):
+    from nba.sklearn_compat import load_pipeline
+
+    return load_pipeline(path)
+
+
+@instrument.timed()
+def load_model(name: str, models: dict = MODELS):
+    """Modelo listo para `predict_proba` (portable o pipeline de sklearn), desde el caché compartido."""
+    spec = models[name]
+    if spec["portable"]:
+        return portable.load(spec["path"])
+    return data.CACHE.get(spec["path"], _read_pipeline)
+
+
+class ModelEnsemble:
+    """Modelos disponibles con carga diferida; puntúa la misma X con todos en paralelo."""
+
+    def __init__(self, models: dict = MODELS, weights: dict = None):
+        self.models = models
+        self.names = [name for name, spec in models.items() if Path(spec["path"]).exists()]
+        self.weights = np.array([(weights or {}).get(name, 1.0) for name in self.names], dtype=float)
+        self._pool = ThreadPoolExecutor(max(len(self.names), 1), thread_name_prefix="nba-ensemble")
+
+    def _proba(self, name: str, X: pd.DataFrame) -> np.ndarray:
+        with instrument.span(f"ensemble.{name}"):
+            return home_win_proba(load_model(name, self.models), X)
+
+    def score(self, X: pd.DataFrame) -> pd.DataFrame:
+        """P(gana el local) de cada modelo y de la mezcla, una fila por fila de X."""
+        if not self.names:
+            raise FileNotFoundError("no hay ningún artefacto de modelo en models/")
+        if len(self.names) == 1:
+            probas = [self._proba(self.names[0], X)]
+        else:
+            futures = [self._pool.submit(self._proba, name, X) for name in self.names]
+            probas = [f.result() for f in futures]
+        out = pd.DataFrame(dict(zip(self.names, probas)), index=X.index)
+        out[BLEND] = np.column_stack(probas) @ self.weights / self.weights.sum()
+        return out
+
+    def predict(self, home: pd.DataFrame, visitor: pd.DataFrame) -> pd.DataFrame:
+        """Como `score`, a partir de las estadísticas del local y del visitante (una matriz para todos)."""
+        return self.score(build_features(home, visitor))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Probabilidades de cada modelo y del ensamble")
+    parser.add_argument("home")
+    parser.add_argument("visitor")
+    parser.add_argument("--season")
+    args = parser.parse_args()
+
+    from nba.registry import STAT_COLUMNS, load_registry
+
+    registry = load_registry(args.season)
+    rows = [registry.row(args.home), registry.row(args.visitor)]
+    if None in rows:
+        parser.error("equipo desconocido")
+    stats = registry.stats[STAT_COLUMNS]
+    ensemble = ModelEnsemble()
+    result = ensemble.predict(stats.iloc[[rows[0]]], stats.iloc[[rows[1]]]).iloc[0]
+    print(f"{registry.name(args.home)} (local) vs {registry.name(args.visitor)}")
+    for name, p in result.items():
+        print(f"{name:20} {p:.1%}")
+    missing = [name for name in MODELS if name not in ensemble.names]
+    if missing:
+        print(f"Sin artefacto en models/: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
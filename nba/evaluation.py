@@ -0,0 +1,176 @@
+"""Métricas de los modelos sobre el conjunto de validación (held-out), calculadas y cacheadas.
+
+El held-out es el mismo del entrenamiento: `train_test_split` de `df_final` con
+20 % de test, `random_state=42` y estratificado por `target`. Cada modelo de
+`MODELS` cuyo artefacto exista se puntúa sobre ese conjunto y se calculan, con
+operaciones vectorizadas de NumPy, la matriz de confusión, accuracy, precisión,
+recall, F1, ROC-AUC, log-loss y Brier.
+
+Los resultados se guardan en la partición (`processed/evaluation.json`), cada
+uno con el hash del modelo y del dataset que lo generaron. La página sólo lee
+ese JSON; si cambió algún modelo o los datos, se recalculan únicamente los
+modelos afectados, en paralelo (un proceso por modelo).
+
+Uso:
+    python -m nba.evaluation            # recalcula lo que esté desactualizado
+    python -m nba.evaluation --force    # recalcula todo
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba import data, seasons
+from nba.features import FEATURE_COLUMNS
+from nba.matchups import MODEL_PATH
+
+# Modelos a evaluar: nombre en la página -> artefacto. `portable` = se puntúa con
+# la exportación NumPy (`nba.portable`) en lugar de cargar el pipeline de sklearn.
+MODELS = {
+    "Logistic Regression": {"path": MODEL_PATH, "portable": True},
+    "XGBoost": {"path": Path("models/xgboost_pipeline.pkl"), "portable": False},
+    "LightGBM": {"path": Path("models/lgbm_pipeline.pkl"), "portable": False},
+}
+
+HOLDOUT = {"test_size": 0.2, "random_state": 42, "stratify": "target"}
+LABELS = ["Derrota", "Victoria"]
+EPS = 1e-15
+
+
+# ---------- Métricas ----------
+def roc_auc(y: np.ndarray, p: np.ndarray) -> float:
+    """AUC por rangos (Mann-Whitney), con empates promediados."""
+    n_pos = int(y.sum())
+    n_neg = len(y) - n_pos
+    if not n_pos or not n_neg:
+        return float("nan")
+    ranks = pd.Series(p).rank(method="average").to_numpy()
+    return float((ranks[y == 1].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg))
+
+
+def metrics(y: np.ndarray, p: np.ndarray, threshold: float = 0.5) -> dict:
+    """Confusión y métricas de clasificación para la clase 1 (victoria local)."""
+    y = np.asarray(y, dtype=int)
+    p = np.asarray(p, dtype=float)
+    pred = (p > threshold).astype(int)
+    tn, fp, fn, tp = np.bincount(2 * y + pred, minlength=4).tolist()
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    p_clip = np.clip(p, EPS, 1 - EPS)
+    return {
+        "n": int(len(y)),
+        "confusion": [[tn, fp], [fn, tp]],
+        "accuracy": (tp + tn) / len(y),
+        "precision": precision,
+        "recall": recall,
+        "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "roc_auc": roc_auc(y, p),
+        "log_loss": float(-np.mean(y * np.log(p_clip) + (1 - y) * np.log(1 - p_clip))),
+        "brier": float(np.mean((p - y) ** 2)),
+    }
+
+
+def confusion_frame(result: dict) -> pd.DataFrame:
+    """Formato largo (Real, Predicción, Cantidad) para el heatmap de la página."""
+    return pd.DataFrame([
+        {"Real": LABELS[real], "Predicción": LABELS[pred], "Cantidad": result["confusion"][real][pred]}
+        for real in (0, 1) for pred in (0, 1)
+    ])
+
+
+# ---------- Held-out ----------
+def holdout(season=None):
+    """(X, y) de validación de `df_final`, con el mismo corte que el entrenamiento."""
+    from sklearn.model_selection import train_test_split
+
+    df = data.load_df([*FEATURE_COLUMNS, "target"], season=season)
+    _, test = train_test_split(
+        df, test_size=HOLDOUT["test_size"], random_state=HOLDOUT["random_state"], stratify=df[HOLDOUT["stratify"]],
+    )
+    return test[FEATURE_COLUMNS], test["target"].to_numpy(dtype=int)
+
+
+def load_model(name: str):
+    """Modelo de `MODELS` listo para `predict_proba` (portable o pipeline de sklearn)."""
+    spec = MODELS[name]
+    if spec["portable"]:
+        from nba.portable import PortableModel, ensure_exported
+        return PortableModel.load(ensure_exported(spec["path"]))
+    from nba.sklearn_compat import load_pipeline
+    return load_pipeline(spec["path"])
+
+
+def _score(name: str, X: pd.DataFrame, y: np.ndarray) -> dict:
+    return metrics(y, load_model(name).predict_proba(X)[:, 1])
+
+
+# ---------- Caché ----------
+def results_path(season: str) -> Path:
+    return seasons.path(season, "evaluation")
+
+
+def _read_json(path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def cache_key(name: str, season: str) -> dict:
+    return {
+        "model_hash": data.CACHE.get(MODELS[name]["path"], data.file_hash),
+        "data_hash": data.CACHE.get(seasons.resolve(season, "df_final"), data.file_hash),
+        "holdout": HOLDOUT,
+    }
+
+
+def available_models() -> list:
+    return [name for name, spec in MODELS.items() if Path(spec["path"]).exists()]
+
+
+def evaluate(season=None, force: bool = False, workers: int = None) -> dict:
+    """Resultados de todos los modelos disponibles; recalcula sólo los desactualizados."""
+    season = season or seasons.current()
+    path = results_path(season)
+    cached = data.CACHE.get(path, _read_json) if path.exists() else {}
+    keys = {name: cache_key(name, season) for name in available_models()}
+    stale = [name for name, key in keys.items() if force or cached.get(name, {}).get("key") != key]
+
+    results = {name: cached[name] for name in keys if name not in stale}
+    if stale:
+        X, y = holdout(season)
+        workers = min(len(stale), workers or os.cpu_count() or 1)
+        if workers == 1:
+            scored = [_score(name, X, y) for name in stale]
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                scored = list(pool.map(_score, stale, [X] * len(stale), [y] * len(stale)))
+        for name, result in zip(stale, scored):
+            results[name] = {"key": keys[name], **result}
+        # Se reemplaza de una vez: la página y la precarga pueden estar leyéndolo
+        with data.atomic_path(path) as tmp:
+            tmp.write_text(json.dumps(results, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Métricas de los modelos sobre el held-out")
+    parser.add_argument("--season")
+    parser.add_argument("--force", action="store_true", help="recalcular aunque no haya cambios")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    season = args.season or seasons.current()
+    results = evaluate(season, args.force, args.workers)
+    missing = [name for name in MODELS if name not in results]
+    print(f"{season}: held-out de {next(iter(results.values()))['n'] if results else 0} partidos")
+    for name, r in results.items():
+        print(f"{name:20} acc {r['accuracy']:.1%}  auc {r['roc_auc']:.1%}  f1 {r['f1']:.1%}  "
+              f"log-loss {r['log_loss']:.4f}  confusión {r['confusion']}")
+    if missing:
+        print(f"Sin artefacto en models/: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+"""Motor incremental de features: de los JSON crudos por equipo a las tablas procesadas.
+
+Mantiene el estado de cada equipo (racha general, como local y como visitante,
+ventana de los últimos 10 partidos, W/L acumulado y promedios de las métricas
+avanzadas) y el rating Elo de la temporada (`nba.elo`), así que agregar un
+partido nuevo cuesta O(1) y sólo genera sus filas.
+
+Genera las mismas tablas que están en el repo, dentro de `data/<temporada>/`:
+- `processed/<TEAM>_features.csv`  (una fila por partido de cada equipo)
+- `processed/games_final_csv.csv`  (una fila por partido, local/visitante, con Elo previo)
+- `graph/df_final.csv`             (features del modelo + target)
+
+Uso:
+    python -m nba.feature_engine rebuild --check   # reconstruye y compara con los CSV
+    python -m nba.feature_engine rebuild --write   # reconstruye y sobrescribe los CSV
+    python -m nba.feature_engine append partido.json
+    python -m nba.feature_engine --season 2024-25 rebuild --check
+"""
+import argparse
+import json
+import pickle
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba import elo, rollups, seasons
+from nba.elo import EloEngine
+from nba.features import categorize_streak_extreme, categorize_team_quality
+from nba.teams import JSON_TEAM_ALIASES
+
+# Los primeros partidos del archivo no tienen historial: se usa el valor del propio partido
+MIN_HISTORY = 2
+
+# columna procesada -> (clave en teamGameAdvStats, decimales)
+STATS = {
+    "offensive_rating": ("oRtg", 2),
+    "defensive_rating": ("dRtg", 2),
+    "ts_percent": ("tsPercent", 3),
+    "assist_percent": ("astPercent", 1),
+    "steal_percent": ("stlPercent", 1),
+    "rebound_percent": ("trbPercent", 1),
+    "turnover_percent": ("tovPercent", 1),
+}
+
+TEAM_FEATURE_COLUMNS = ["game_number", "game_id", "opponent", "result", "streak", *STATS]
+
+
+def _update_streak(streak: int, win: bool) -> int:
+    """Racha con signo: +n victorias seguidas, -n derrotas seguidas."""
+    if win:
+        return streak + 1 if streak > 0 else 1
+    return streak - 1 if streak < 0 else -1
+
+
+def _streak_label(streak: int) -> str:
+    return f"{abs(streak)}{'W' if streak > 0 else 'L'}"
+
+
+class TeamState:
+    """Estado acumulado de un equipo hasta el último partido procesado."""
+
+    def __init__(self):
+        self.game_number = 0
+        self.streak = 0
+        self.home_streak = 0
+        self.away_streak = 0
+        self.wins = 0
+        self.losses = 0
+        self.last_10 = deque(maxlen=10)
+        self.stat_sum = dict.fromkeys(STATS, 0.0)
+        self.stat_count = dict.fromkeys(STATS, 0)
+
+    def ratings(self, own: dict) -> dict:
+        """Promedio de los partidos previos (o el propio si todavía no hay historial)."""
+        out = {}
+        for col, (_, decimals) in STATS.items():
+            if self.game_number < MIN_HISTORY or self.stat_count[col] == 0:
+                value = own.get(col, np.nan)
+            else:
+                value = self.stat_sum[col] / self.stat_count[col]
+            out[col] = round(value, decimals)
+        return out
+
+    def snapshot(self) -> dict:
+        """Estadísticas del equipo ANTES de jugar el próximo partido."""
+        played = self.wins + self.losses
+        last_w = sum(self.last_10)
+        return {
+            "streak": self.streak,
+            "home_streak": self.home_streak,
+            "away_streak": self.away_streak,
+            "last_10": f"{last_w}-{len(self.last_10) - last_w}",
+            "wins_percent": self.wins / played if played else 0.0,
+        }
+
+    def update(self, win: bool, is_home: bool, in_season: bool, own: dict):
+        self.game_number += 1
+        self.streak = _update_streak(self.streak, win)
+        if is_home:
+            self.home_streak = _update_streak(self.home_streak, win)
+        else:
+            self.away_streak = _update_streak(self.away_streak, win)
+        if in_season:
+            self.wins += win
+            self.losses += not win
+            self.last_10.append(int(win))
+        for col, value in own.items():
+            if not pd.isna(value):
+                self.stat_sum[col] += value
+                self.stat_count[col] += 1
+
+
+def _team_code(code: str) -> str:
+    return JSON_TEAM_ALIASES.get(code, code)
+
+
+def _own_stats(game: dict, team: str) -> dict:
+    """Métricas avanzadas del equipo en ese partido (vacío si el JSON no las trae)."""
+    for adv in game.get("teamGameAdvStats") or []:
+        if _team_code(adv["team"]) == team:
+            return {col: adv.get(key, np.nan) for col, (key, _) in STATS.items()}
+    return {}
+
+
+class FeatureEngine:
+    """Procesa partidos en orden cronológico y acumula las filas de cada tabla."""
+
+    def __init__(self, season=None):
+        self.season = season or seasons.current()
+        # Los archivos por equipo arrancan con los últimos partidos de la temporada anterior:
+        # cuentan para game_number y rachas, pero no para W/L, last_10 ni la tabla de partidos.
+        self.season_start = seasons.season_start(self.season)
+        self.teams = {}
+        self.seen = set()
+        self.team_rows = {}
+        self.game_rows = []
+        self.model_rows = []
+        self.elo = EloEngine()
+
+    def team(self, code: str) -> TeamState:
+        if code not in self.teams:
+            self.teams[code] = TeamState()
+        self.team_rows.setdefault(code, [])
+        return self.teams[code]
+
+    def add_game(self, game: dict, teams=None) -> dict:
+        """
+        Agrega UN partido (formato de los JSON por equipo) y devuelve sólo las filas
+        nuevas: {"team_rows": {TEAM: fila}, "game_row": fila|None, "model_row": fila|None}.
+
+        `teams` limita qué equipos registran el partido (por defecto, ambos): algunos
+        partidos de la temporada anterior figuran sólo en el archivo de uno de los dos.
+        """
+        game_id = game["gameId"]
+        if game_id in self.seen:
+            return {"team_rows": {}, "game_row": None, "model_row": None}
+        self.seen.add(game_id)
+
+        home, visitor = _team_code(game["homeTeam"]), _team_code(game["visitorTeam"])
+        home_win = game["homePts"] > game["visitorPts"]
+        in_season = pd.Timestamp(game["date"]) >= self.season_start
+
+        sides = {}
+        for code, opponent, is_home, win in ((home, visitor, True, home_win), (visitor, home, False, not home_win)):
+            if teams is not None and code not in teams:
+                continue
+            state = self.team(code)
+            own = _own_stats(game, code)
+            before = state.snapshot()
+            ratings = state.ratings(own)
+            state.update(win, is_home, in_season, own)
+
+            row = {
+                "game_number": state.game_number,
+                "game_id": game_id,
+                "opponent": opponent,
+                "result": "W" if win else "L",
+                "streak": _streak_label(state.streak),
+                **ratings,
+            }
+            self.team_rows[code].append(row)
+            sides[code] = (row, before)
+
+        # Elo: sólo partidos de la temporada con los dos equipos (ratings previos al partido)
+        elo_before = None
+        if in_season and len(sides) == 2:
+            elo_before = self.elo.add_game(game_id, game["date"], home, visitor, game["homePts"], game["visitorPts"])
+
+        new = {"team_rows": {code: row for code, (row, _) in sides.items()}, "game_row": None, "model_row": None}
+        if in_season and len(sides) == 2 and all(_own_stats(game, code) for code in sides):
+            (h, h_before), (v, v_before) = sides[home], sides[visitor]
+            new["game_row"] = {**self._game_row(game, home, visitor, h, v), **elo.game_columns(elo_before)}
+            new["model_row"] = self._model_row(new["game_row"], h_before, v_before)
+            self.game_rows.append(new["game_row"])
+            self.model_rows.append(new["model_row"])
+        return new
+
+    @staticmethod
+    def _game_row(game, home, visitor, h, v) -> dict:
+        row = {"game_id": game["gameId"], "date": game["date"], "home_team": home, "visitor_team": visitor}
+        for prefix, side in (("home", h), ("visitor", v)):
+            row[f"{prefix}_game_number"] = side["game_number"]
+            row[f"{prefix}_result"] = side["result"]
+            row[f"{prefix}_streak"] = side["streak"]
+            for col in STATS:
+                row[f"{prefix}_{col}"] = side[col]
+        return row
+
+    @staticmethod
+    def _model_row(g: dict, h_before: dict, v_before: dict) -> dict:
+        """Fila de entrenamiento: rachas y récord previos al partido + diferenciales."""
+        row = {
+            "game_id": g["game_id"],
+            "date": str(pd.Timestamp(g["date"])),
+            "home_team": g["home_team"],
+            "visitor_team": g["visitor_team"],
+        }
+        for prefix, before in (("home", h_before), ("visitor", v_before)):
+            row[f"{prefix}_game_number"] = g[f"{prefix}_game_number"]
+            row[f"{prefix}_result"] = g[f"{prefix}_result"]
+            row[f"{prefix}_streak"] = before["streak"]
+            row[f"{prefix}_home_streak"] = before["home_streak"]
+            row[f"{prefix}_away_streak"] = before["away_streak"]
+            for col in STATS:
+                value = g[f"{prefix}_{col}"]
+                row[f"{prefix}_{col}"] = value * 100 if col == "ts_percent" else value
+
+        row["home_last_10"] = h_before["last_10"]
+        row["visitor_last_10"] = v_before["last_10"]
+        row["home_wins_percent"] = h_before["wins_percent"]
+        row["visitor_wins_percent"] = v_before["wins_percent"]
+
+        # Diferenciales (positivo = ventaja del local)
+        row["wins_percent_diff"] = row["home_wins_percent"] - row["visitor_wins_percent"]
+        row["offensive_rating_diff"] = row["home_offensive_rating"] - row["visitor_offensive_rating"]
+        row["defensive_rating_diff"] = row["visitor_defensive_rating"] - row["home_defensive_rating"]
+        row["net_rating_diff"] = row["offensive_rating_diff"] + row["defensive_rating_diff"]
+        row["home_estimated_points"] = row["home_offensive_rating"] - (row["home_offensive_rating"] - row["visitor_defensive_rating"]) / 2
+        row["visitor_estimated_points"] = row["visitor_offensive_rating"] - (row["visitor_offensive_rating"] - row["home_defensive_rating"]) / 2
+        row["estimated_point_diff"] = row["home_estimated_points"] - row["visitor_estimated_points"]
+        row["ts_percent_diff"] = row["home_ts_percent"] - row["visitor_ts_percent"]
+        row["turnover_percent_diff"] = row["visitor_turnover_percent"] - row["home_turnover_percent"]
+        row["assist_percent_diff"] = row["home_assist_percent"] - row["visitor_assist_percent"]
+        row["steal_percent_diff"] = row["home_steal_percent"] - row["visitor_steal_percent"]
+        row["rebound_percent_diff"] = row["home_rebound_percent"] - row["visitor_rebound_percent"]
+
+        # Categóricas/umbrales
+        row["home_streak_extreme"] = categorize_streak_extreme(row["home_streak"])
+        row["visitor_streak_extreme"] = categorize_streak_extreme(row["visitor_streak"])
+        row["streak_extreme_diff"] = row["home_streak_extreme"] - row["visitor_streak_extreme"]
+        row["streak_diff"] = row["home_streak"] - row["visitor_streak"]
+        row["home_quality"] = categorize_team_quality(row["home_wins_percent"])
+        row["visitor_quality"] = categorize_team_quality(row["visitor_wins_percent"])
+        row["home_much_better"] = int(row["wins_percent_diff"] > 0.20)
+        row["visitor_much_better"] = int(row["wins_percent_diff"] < -0.20)
+        row["teams_evenly_matched"] = int(abs(row["wins_percent_diff"]) <= 0.10)
+        row["target"] = int(g["home_result"] == "W")
+        return row
+
+    # ---------- Tablas ----------
+    def team_features(self, code: str) -> pd.DataFrame:
+        return pd.DataFrame(self.team_rows.get(code, []), columns=TEAM_FEATURE_COLUMNS)
+
+    def games_final(self) -> pd.DataFrame:
+        return pd.DataFrame(self.game_rows)
+
+    def model_features(self) -> pd.DataFrame:
+        return pd.DataFrame(self.model_rows)
+
+    # ---------- Persistencia del estado ----------
+    # Sólo se guarda el estado por equipo (no las filas): alcanza para seguir agregando partidos.
+    def save(self, path=None):
+        with open(path or seasons.path(self.season, "feature_state"), "wb") as f:
+            pickle.dump({"season": self.season, "teams": self.teams, "seen": self.seen, "elo": self.elo}, f)
+
+    @staticmethod
+    def load(path) -> "FeatureEngine":
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        engine = FeatureEngine(state.get("season"))
+        engine.teams = state["teams"]
+        engine.seen = state["seen"]
+        engine.elo = state.get("elo") or engine.elo
+        return engine
+
+
+def load_raw_games(season=None, paths=None) -> list:
+    """
+    Partidos de la temporada deduplicados por gameId y ordenados por fecha, como
+    pares (partido, equipos en cuyo archivo aparece). Sin `paths` salen del store
+    canónico (`nba.gamestore`, que sólo reparsea los JSON si cambiaron); con
+    `paths` {TEAM: ruta} se leen esos archivos.
+    """
+    from nba import gamestore
+
+    if paths is None:
+        return gamestore.load_store(season).raw_games()
+    games, owners = gamestore.merge_games(paths)
+    ordered = sorted(games.values(), key=lambda g: (g["date"], g["gameId"]))
+    return [(game, owners[game["gameId"]]) for game in ordered]
+
+
+def rebuild(season=None, paths=None) -> FeatureEngine:
+    """Reconstrucción completa: reprocesa toda la temporada desde los JSON."""
+    engine = FeatureEngine(season)
+    for game, teams in load_raw_games(engine.season, paths):
+        engine.add_game(game, teams)
+    return engine
+
+
+def _tolerance(col: str, ts_scale: float = 1) -> float:
+    """Un paso del último decimal (dos en los diferenciales): empates de redondeo."""
+    for stat, (_, decimals) in STATS.items():
+        if stat in col:
+            step = 10.0 ** -decimals * (ts_scale if stat == "ts_percent" else 1)
+            return step * (2 if col.endswith("_diff") else 1) * 1.001
+    return 0.021 if col.endswith(("_diff", "_points")) else 1e-9
+
+
+def _compare(built: pd.DataFrame, shipped: pd.DataFrame, key: str, ts_scale: float = 1) -> dict:
+    """Cuenta diferencias celda a celda (tolerando el redondeo del último decimal)."""
+    built = built.set_index(key)
+    shipped = shipped.set_index(key)
+    common = shipped.index.intersection(built.index)
+    diffs = {}
+    for col in shipped.columns.intersection(built.columns):
+        a, b = built.loc[common, col], shipped.loc[common, col]
+        if pd.api.types.is_numeric_dtype(b) and pd.api.types.is_numeric_dtype(a):
+            same = np.isclose(a.astype(float), b.astype(float), rtol=0, atol=_tolerance(col, ts_scale), equal_nan=True)
+        else:
+            same = a.astype(str).to_numpy() == b.astype(str).to_numpy()
+        if (~same).sum():
+            diffs[col] = int((~same).sum())
+    return {
+        "rows_built": len(built),
+        "rows_shipped": len(shipped),
+        "missing": len(shipped.index.difference(built.index)),
+        "extra": len(built.index.difference(shipped.index)),
+        "column_diffs": diffs,
+    }
+
+
+def check_parity(engine: FeatureEngine) -> dict:
+    """Compara las tablas reconstruidas contra los CSV de la partición."""
+    report = {}
+    for code, path in seasons.team_paths(engine.season, "team_features").items():
+        report[path.name] = _compare(engine.team_features(code), pd.read_csv(path), "game_id")
+    games_final = seasons.path(engine.season, "games_final")
+    model_features = seasons.path(engine.season, "df_final")
+    report[games_final.name] = _compare(engine.games_final(), pd.read_csv(games_final), "game_id")
+    report[model_features.name] = _compare(engine.model_features(), pd.read_csv(model_features), "game_id", ts_scale=100)
+    return report
+
+
+def write_tables(engine: FeatureEngine):
+    for code in engine.team_rows:
+        engine.team_features(code).to_csv(seasons.path(engine.season, "team_features", code), index=False)
+    engine.games_final().to_csv(seasons.path(engine.season, "games_final"), index=False)
+    engine.model_features().to_csv(seasons.path(engine.season, "df_final"), index=False)
+    engine.save()
+    seasons.write_manifest()
+    rollups.write_cube(engine.season)
+
+
+def append_game(game: dict, season=None, state_path=None) -> dict:
+    """
+    Modo incremental: carga el estado guardado, procesa UN partido y agrega
+    sólo sus filas al final de cada CSV (sin recalcular la temporada).
+    """
+    season = season or seasons.current()
+    state_path = Path(state_path or seasons.path(season, "feature_state"))
+    engine = FeatureEngine.load(state_path) if state_path.exists() else rebuild(season)
+    new = engine.add_game(game)
+    for code, row in new["team_rows"].items():
+        pd.DataFrame([row], columns=TEAM_FEATURE_COLUMNS).to_csv(
+            seasons.path(season, "team_features", code), mode="a", header=False, index=False)
+    if new["game_row"] is not None:
+        pd.DataFrame([new["game_row"]]).to_csv(seasons.path(season, "games_final"), mode="a", header=False, index=False)
+        pd.DataFrame([new["model_row"]]).to_csv(seasons.path(season, "df_final"), mode="a", header=False, index=False)
+        rollups.write_cube(season)
+    engine.save(state_path)
+    return new
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Motor de features NBA")
+    parser.add_argument("--season", help="temporada (por defecto, la más reciente del manifiesto)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_rebuild = sub.add_parser("rebuild", help="reconstruye todas las tablas desde los JSON")
+    p_rebuild.add_argument("--check", action="store_true", help="compara contra los CSV del repo")
+    p_rebuild.add_argument("--write", action="store_true", help="sobrescribe los CSV y guarda el estado")
+    p_append = sub.add_parser("append", help="agrega un partido nuevo (JSON) de forma incremental")
+    p_append.add_argument("game_json", type=Path)
+    args = parser.parse_args()
+
+    if args.cmd == "rebuild":
+        engine = rebuild(args.season)
+        if args.check:
+            for name, result in check_parity(engine).items():
+                print(name, result)
+        if args.write:
+            write_tables(engine)
+    else:
+        new = append_game(json.loads(args.game_json.read_text(encoding="utf-8")), args.season)
+        print(json.dumps(new, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Construcción de las features que espera el pipeline de predicción.
+
+Todas las funciones trabajan sobre columnas completas, así que el mismo código
+sirve para un partido o para una jornada entera (N partidos en una sola pasada).
+"""
+import numpy as np
+import pandas as pd
+
+from nba import instrument
+from nba.elo import ELO_COLUMNS
+
+# Columnas del CSV de equipos -> nombres que usa el modelo
+TEAM_STAT_COLUMNS = {
+    "OffRtg": "off_rating",
+    "DefRtg": "def_rating",
+    "W": "wins",
+    "GP": "game_number",
+    "streak": "streak",
+    "streak_as_local": "streak_as_local",
+    "streak_as_visitor": "streak_as_visitor",
+}
+
+# Features de entrenamiento (nombres y orden EXACTOS)
+FEATURE_COLUMNS = [
+    "home_game_number", "home_streak", "home_home_streak", "home_away_streak",
+    "home_offensive_rating", "home_defensive_rating",
+    "visitor_game_number", "visitor_streak", "visitor_home_streak", "visitor_away_streak",
+    "visitor_offensive_rating", "visitor_defensive_rating",
+    "home_last_10", "visitor_last_10", "home_wins_percent", "visitor_wins_percent",
+    "wins_percent_diff", "offensive_rating_diff", "defensive_rating_diff", "net_rating_diff",
+    "home_estimated_points", "visitor_estimated_points", "estimated_point_diff",
+    "home_streak_extreme", "visitor_streak_extreme", "streak_extreme_diff", "streak_diff",
+    "home_quality", "visitor_quality",
+    "home_much_better", "visitor_much_better", "teams_evenly_matched",
+]
+
+QUALITY_BINS = [0.35, 0.45, 0.55, 0.65]
+QUALITY_LABELS = np.array(["Muy Débil", "Débil", "Promedio", "Fuerte", "Muy Fuerte"], dtype=object)
+
+
+def categorize_team_quality(wins_pct: float) -> str:
+    """Asigna una etiqueta de calidad basada en el porcentaje de victorias."""
+    if pd.isna(wins_pct):
+        return 'Desconocido'
+    elif wins_pct < 0.35:
+        return 'Muy Débil'
+    elif wins_pct < 0.45:
+        return 'Débil'
+    elif wins_pct < 0.55:
+        return 'Promedio'
+    elif wins_pct < 0.65:
+        return 'Fuerte'
+    else:
+        return 'Muy Fuerte'
+
+
+def categorize_streak_extreme(streak: int) -> int:
+    """Clasifica la racha en extrema (+1), muy negativa (-1), o normal (0)."""
+    if pd.isna(streak):
+        return 0
+    elif streak >= 6:
+        return 1
+    elif streak <= -6:
+        return -1
+    else:
+        return 0
+
+
+def team_quality(wins_pct) -> np.ndarray:
+    """Versión vectorizada de `categorize_team_quality`."""
+    wins_pct = np.asarray(wins_pct, dtype=float)
+    labels = QUALITY_LABELS[np.searchsorted(QUALITY_BINS, np.nan_to_num(wins_pct), side="right")]
+    return np.where(np.isnan(wins_pct), "Desconocido", labels)
+
+
+def streak_extreme(streak) -> np.ndarray:
+    """Versión vectorizada de `categorize_streak_extreme`."""
+    streak = np.nan_to_num(np.asarray(streak, dtype=float))
+    return (streak >= 6).astype(int) - (streak <= -6).astype(int)
+
+
+def team_stats(teams_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normaliza el CSV de equipos (TEAM, GP, W, OffRtg, DefRtg, rachas)
+    a una tabla indexada por nombre con las estadísticas del modelo.
+    """
+    stats = teams_df.set_index("TEAM")[list(TEAM_STAT_COLUMNS)].rename(columns=TEAM_STAT_COLUMNS)
+    stats = stats.astype({
+        "off_rating": float, "def_rating": float, "wins": int, "game_number": int,
+        "streak": int, "streak_as_local": int, "streak_as_visitor": int,
+    })
+    return stats[~stats.index.duplicated()]
+
+
+@instrument.timed()
+def build_features(home: pd.DataFrame, visitor: pd.DataFrame, with_elo: bool = False) -> pd.DataFrame:
+    """
+    Arma la matriz X a partir de las estadísticas del local y del visitante
+    (una fila por partido, mismas columnas que devuelve `team_stats`).
+
+    Con `with_elo`, agrega al final `home_elo`, `visitor_elo` y `elo_diff` (las
+    estadísticas tienen que traer la columna `elo`, como las del store "as of").
+    El pipeline entrenado no las usa: es para análisis y modelos nuevos.
+    """
+    h = {c: home[c].to_numpy() for c in TEAM_STAT_COLUMNS.values()}
+    v = {c: visitor[c].to_numpy() for c in TEAM_STAT_COLUMNS.values()}
+
+    # Diferenciales
+    h_win_percent = h["wins"] / h["game_number"]
+    v_win_percent = v["wins"] / v["game_number"]
+
+    wins_percent_diff = h_win_percent - v_win_percent
+    offensive_rating_diff = h["off_rating"] - v["off_rating"]
+    defensive_rating_diff = h["def_rating"] - v["def_rating"]
+    net_rating_diff = offensive_rating_diff + defensive_rating_diff
+
+    h_estimated_points = h["off_rating"] - (h["off_rating"] - v["def_rating"]) / 2
+    v_estimated_points = v["off_rating"] - (v["off_rating"] - h["def_rating"]) / 2
+
+    # Categóricas/umbrales
+    home_streak_extreme = streak_extreme(h["streak"])
+    visitor_streak_extreme = streak_extreme(v["streak"])
+
+    X = pd.DataFrame({
+        # --- Núcleo base ---
+        "home_game_number": h["game_number"],
+        "home_streak": h["streak"],
+        "home_home_streak": h["streak_as_local"],
+        "home_away_streak": h["streak_as_visitor"],
+        "home_offensive_rating": h["off_rating"],
+        "home_defensive_rating": h["def_rating"],
+
+        "visitor_game_number": v["game_number"],
+        "visitor_streak": v["streak"],
+        "visitor_home_streak": v["streak_as_local"],
+        "visitor_away_streak": v["streak_as_visitor"],
+        "visitor_offensive_rating": v["off_rating"],
+        "visitor_defensive_rating": v["def_rating"],
+
+        "home_last_10": h_win_percent,
+        "visitor_last_10": v_win_percent,
+        "home_wins_percent": h_win_percent,
+        "visitor_wins_percent": v_win_percent,
+
+        # --- Derivadas / flags (idénticas a entrenamiento) ---
+        "wins_percent_diff": wins_percent_diff,
+        "offensive_rating_diff": offensive_rating_diff,
+        "defensive_rating_diff": defensive_rating_diff,
+        "net_rating_diff": net_rating_diff,
+
+        "home_estimated_points": h_estimated_points,
+        "visitor_estimated_points": v_estimated_points,
+        "estimated_point_diff": h_estimated_points - v_estimated_points,
+
+        "home_streak_extreme": home_streak_extreme,
+        "visitor_streak_extreme": visitor_streak_extreme,
+        "streak_extreme_diff": home_streak_extreme - visitor_streak_extreme,
+        "streak_diff": h["streak"] - v["streak"],
+
+        "home_quality": team_quality(h_win_percent),
+        "visitor_quality": team_quality(v_win_percent),
+        "home_much_better": (wins_percent_diff > 0.20).astype(int),
+        "visitor_much_better": (wins_percent_diff < -0.20).astype(int),
+        "teams_evenly_matched": (np.abs(wins_percent_diff) <= 0.10).astype(int),
+    })
+    if not with_elo:
+        return X[FEATURE_COLUMNS]
+    X["home_elo"] = home["elo"].to_numpy()
+    X["visitor_elo"] = visitor["elo"].to_numpy()
+    X["elo_diff"] = X["home_elo"] - X["visitor_elo"]
+    return X[FEATURE_COLUMNS + ELO_COLUMNS]
+
+
+def build_matchups(stats: pd.DataFrame, home_teams, visitor_teams) -> pd.DataFrame:
+    """Matriz X para N cruces local/visitante (nombres de `stats.index`)."""
+    return build_features(stats.loc[list(home_teams)], stats.loc[list(visitor_teams)])
@@ -0,0 +1,205 @@
+"""Tabla canónica de partidos de una temporada, deduplicada e indexada por `gameId`.
+
+Cada partido aparece en el JSON de los dos equipos y otra vez en el calendario
+(`all_matches_<temporada>.json`). La ingesta recorre esos 31 archivos UNA vez,
+se queda con una fila por `gameId` (la versión que trae `teamGameAdvStats`, si
+alguna la trae) y arma:
+
+- `games`: DataFrame indexado por `game_id`, ordenado por fecha, con local,
+  visitante, tanteador, si tiene estadísticas avanzadas, si está en el
+  calendario, si es de la temporada (los JSON arrastran partidos de abril de la
+  temporada anterior), si es de temporada regular (`seasons.is_regular`: sin
+  play-in ni la final de la NBA Cup) y en qué archivos de equipo aparece,
+- `postings`: para cada equipo, las posiciones (ordenadas) de sus partidos en
+  `games`. Los partidos de un equipo son una lectura directa y los de un cruce,
+  la intersección de dos listas ordenadas, sin recorrer la tabla.
+
+El resultado se guarda en la partición (`processed/game_store.pkl`) con el hash
+de cada archivo de origen; mientras ninguno cambie, no se vuelve a parsear JSON.
+
+Uso:
+    python -m nba.gamestore                 # (re)genera el store de todas las temporadas
+    python -m nba.gamestore BOS NYK         # cruces de la temporada más reciente
+"""
+import argparse
+import json
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba import data, instrument, seasons
+from nba.teams import STATS_TEAM_NAMES
+
+FORMAT_VERSION = 2
+
+
+def merge_games(paths: dict) -> tuple:
+    """
+    Lee los JSON por equipo ({TEAM: ruta}) y deduplica por gameId.
+    Devuelve ({gameId: partido}, {gameId: equipos en cuyo archivo aparece}).
+    """
+    games, owners = {}, {}
+    for code, path in paths.items():
+        for game in json.loads(Path(path).read_text(encoding="utf-8")):
+            prev = games.get(game["gameId"])
+            if prev is None or (not prev.get("teamGameAdvStats") and game.get("teamGameAdvStats")):
+                games[game["gameId"]] = game
+            owners.setdefault(game["gameId"], set()).add(code)
+    return games, owners
+
+
+def _points(value):
+    # El calendario trae los puntos como texto ("" si no se jugó)
+    return int(value) if value not in (None, "") else pd.NA
+
+
+class GameStore:
+    """Partidos únicos de la temporada + listas de posiciones por equipo."""
+
+    def __init__(self, season: str, games: pd.DataFrame, raw: list, postings: dict, sources: dict = None):
+        self.season = season
+        self.games = games          # indexado por game_id, orden cronológico
+        self.raw = raw              # partido crudo (dict del JSON) de cada fila de `games`
+        self.postings = postings    # TEAM -> posiciones ordenadas en `games`
+        self.sources = sources or {}
+        self._schedule = None
+
+    @classmethod
+    def build(cls, season=None) -> "GameStore":
+        season = season or seasons.current()
+        games, owners = merge_games(seasons.team_paths(season, "team_games"))
+        schedule = seasons.path(season, "schedule")
+        scheduled = set()
+        if schedule.exists():
+            for game in json.loads(schedule.read_text(encoding="utf-8")):
+                scheduled.add(game["gameId"])
+                games.setdefault(game["gameId"], game)
+
+        raw = sorted(games.values(), key=lambda g: (g["date"], g["gameId"]))
+        ids = [g["gameId"] for g in raw]
+        dates = pd.to_datetime(pd.Series([g["date"] for g in raw], dtype=object), utc=True)
+        table = pd.DataFrame({
+            "date": dates.to_numpy(),
+            "home_team": [g["homeTeam"] for g in raw],
+            "visitor_team": [g["visitorTeam"] for g in raw],
+            "home_pts": pd.array([_points(g.get("homePts")) for g in raw], dtype="Int64"),
+            "visitor_pts": pd.array([_points(g.get("visitorPts")) for g in raw], dtype="Int64"),
+            "adv_stats": [bool(g.get("teamGameAdvStats")) for g in raw],
+            "scheduled": [gid in scheduled for gid in ids],
+            "in_season": (dates >= seasons.season_start(season)).to_numpy(),
+            "regular": seasons.is_regular(season, ids, dates),
+            "owners": [",".join(sorted(owners.get(gid, ()))) for gid in ids],
+        }, index=pd.Index(ids, name="game_id"))
+
+        # Listas de posiciones: local y visitante juntos, en orden cronológico
+        postings = {}
+        for col in ("home_team", "visitor_team"):
+            for team, pos in table.groupby(col, sort=False).indices.items():
+                postings.setdefault(team, []).append(pos)
+        postings = {team: np.sort(np.concatenate(parts)) for team, parts in postings.items()}
+        return cls(season, table, raw, postings, sources_fingerprint(season))
+
+    # ---------- Consultas ----------
+    def positions(self, teams) -> np.ndarray:
+        """Posiciones de los partidos en que juega alguno de `teams` (unión ordenada)."""
+        teams = [teams] if isinstance(teams, str) else list(teams)
+        parts = [self.postings[t] for t in teams if t in self.postings]
+        if not parts:
+            return np.array([], dtype=np.intp)
+        return parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+
+    def game_ids(self, teams) -> pd.Index:
+        return self.games.index[self.positions(teams)]
+
+    def team_games(self, team: str, in_season: bool = True) -> pd.DataFrame:
+        out = self.games.iloc[self.positions(team)]
+        return out[out["in_season"]] if in_season else out
+
+    def matchup(self, team_a: str, team_b: str, home: str = None, in_season: bool = True) -> pd.DataFrame:
+        """Partidos entre `team_a` y `team_b` (sólo con `home` de local, si se indica)."""
+        pos = np.intersect1d(self.positions(team_a), self.positions(team_b), assume_unique=True)
+        out = self.games.iloc[pos]
+        if home is not None:
+            out = out[out["home_team"] == home]
+        return out[out["in_season"]] if in_season else out
+
+    def raw_games(self) -> list:
+        """Pares (partido crudo, equipos en cuyo archivo aparece), como `feature_engine.load_raw_games`."""
+        owners = self.games["owners"].to_numpy()
+        return [(game, set(o.split(","))) for game, o in zip(self.raw, owners) if o]
+
+    def schedule(self) -> pd.DataFrame:
+        """Calendario de la temporada (partidos del `all_matches`) con nombres de equipo."""
+        if self._schedule is None:
+            games = self.games[self.games["scheduled"]].reset_index()
+            games = games[["game_id", "date", "visitor_team", "visitor_pts", "home_team", "home_pts", "regular"]]
+            games["day"] = games["date"].dt.date
+            games["home_name"] = games["home_team"].map(STATS_TEAM_NAMES)
+            games["visitor_name"] = games["visitor_team"].map(STATS_TEAM_NAMES)
+            self._schedule = games
+        return self._schedule
+
+    # ---------- Persistencia ----------
+    def save(self, path):
+        state = {"version": FORMAT_VERSION, "season": self.season, "games": self.games,
+                 "raw": self.raw, "postings": self.postings, "sources": self.sources}
+        # Se reemplaza de una vez: las sesiones y la precarga lo leen en paralelo
+        with data.atomic_path(path) as tmp, open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path) -> "GameStore":
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != FORMAT_VERSION:
+            return None
+        return GameStore(state["season"], state["games"], state["raw"], state["postings"], state["sources"])
+
+
+def store_path(season: str) -> Path:
+    return seasons.path(season, "game_store")
+
+
+def sources_fingerprint(season: str) -> dict:
+    """Hash de cada JSON de origen (los hashes se recalculan sólo si cambia el archivo)."""
+    paths = {**seasons.team_paths(season, "team_games"), "schedule": seasons.path(season, "schedule")}
+    return {name: data.CACHE.get(path, data.file_hash) for name, path in paths.items() if path.exists()}
+
+
+@instrument.timed()
+def load_store(season=None) -> GameStore:
+    """Store de la temporada; se reconstruye (y se guarda) sólo si cambió algún JSON."""
+    season = season or seasons.current()
+    path = store_path(season)
+    if path.exists():
+        store = data.CACHE.get(path, GameStore.load)
+        if store is not None and store.sources == sources_fingerprint(season):
+            return store
+    store = GameStore.build(season)
+    store.save(path)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tabla canónica de partidos por temporada")
+    parser.add_argument("teams", nargs="*", help="uno o dos equipos: sus partidos o sus cruces")
+    parser.add_argument("--season")
+    args = parser.parse_args()
+
+    if not args.teams:
+        for season in seasons.available():
+            store = GameStore.build(season)
+            store.save(store_path(season))
+            games = store.games
+            print(f"{season}: {len(games):,} partidos únicos ({int(games['in_season'].sum()):,} de la temporada, "
+                  f"{int(games['scheduled'].sum()):,} en el calendario) -> {store_path(season)}")
+        return
+    store = load_store(args.season)
+    found = store.matchup(*args.teams[:2]) if len(args.teams) > 1 else store.team_games(args.teams[0])
+    print(found[["date", "home_team", "home_pts", "visitor_pts", "visitor_team"]].to_string())
+
+
+if __name__ == "__main__":
+    main()
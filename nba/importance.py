@@ -0,0 +1,156 @@
+"""Regenera los CSV de importancia de features a partir de los modelos.
+
+Por cada modelo de `evaluation.MODELS` con artefacto:
+- importancia propia del modelo, en el archivo que ya lee la página 03
+  (`data.FEATURE_IMPORTANCE_FILES`): coeficientes para la regresión logística
+  (sin escalar, con los nombres de salida del ColumnTransformer, p. ej.
+  `num__net_rating_diff`, `cat__home_last_10_2-1`) o `feature_importances_`
+  para los modelos de árboles,
+- importancia por permutación sobre el held-out de `evaluation`: cuánto cae el
+  ROC-AUC al permutar cada columna de entrada (media y desvío de `repeats`
+  permutaciones), en `<archivo>_permutation.csv`.
+
+Las permutaciones se puntúan en lotes: todas las repeticiones de una columna se
+apilan en una sola matriz y se predicen con un único `predict_proba`; las
+columnas se reparten entre procesos. Se guarda el hash del modelo, de los datos y
+de los parámetros de cada corrida; si no cambiaron, el modelo se saltea.
+
+Uso:
+    python -m nba.importance                 # sólo lo desactualizado
+    python -m nba.importance --force --repeats 50 --workers 4
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba import data, evaluation, seasons
+
+META_PATH = Path("data/models_feature_importance/importance_meta.json")
+DEFAULT_REPEATS = 30
+
+
+def permutation_path(name: str) -> Path:
+    path = data.FEATURE_IMPORTANCE_FILES[name]
+    return path.with_name(f"{path.stem}_permutation.csv")
+
+
+# ---------- Importancia propia del modelo ----------
+def coef_importance(model) -> pd.DataFrame:
+    """Coeficientes de la regresión logística exportada (mismos nombres que sklearn)."""
+    params = model.params
+    names = [f"num__{c}" for c in params["numeric"]["columns"]]
+    for col, cats in zip(params["categorical"]["columns"], params["categorical"]["categories"]):
+        names += [f"cat__{col}_{cat}" for cat in cats]
+    out = pd.DataFrame({"feature": names, "coef": params["coef"]})
+    return out.reindex(out["coef"].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+
+def native_importance(pipeline) -> pd.DataFrame:
+    """`feature_importances_` del último paso de un pipeline de árboles."""
+    column_transform = pipeline.named_steps["preprocessing"].named_steps["column_transform"]
+    clf = pipeline.steps[-1][1]
+    out = pd.DataFrame({"feature": column_transform.get_feature_names_out(), "importance": clf.feature_importances_})
+    return out.sort_values("importance", ascending=False).reset_index(drop=True)
+
+
+def model_importance(name: str, model) -> pd.DataFrame:
+    return coef_importance(model) if evaluation.MODELS[name]["portable"] else native_importance(model)
+
+
+# ---------- Permutación ----------
+_state = {}
+
+
+def _init_worker(name: str, X: pd.DataFrame, y: np.ndarray):
+    _state.update(model=evaluation.load_model(name), X=X, y=y)
+
+
+def _permute_columns(columns: list, repeats: int, seed: int) -> list:
+    """Caída de ROC-AUC de cada columna: las `repeats` permutaciones en un solo lote."""
+    model, X, y = _state["model"], _state["X"], _state["y"]
+    base = evaluation.roc_auc(y, model.predict_proba(X)[:, 1])
+    n = len(X)
+    stacked = pd.concat([X] * repeats, ignore_index=True)
+    out = []
+    for col in columns:
+        rng = np.random.default_rng([seed, X.columns.get_loc(col)])
+        order = np.argsort(rng.random((repeats, n)), axis=1).ravel()
+        batch = stacked.copy()
+        batch[col] = X[col].to_numpy()[order]
+        p = model.predict_proba(batch)[:, 1].reshape(repeats, n)
+        drops = base - np.array([evaluation.roc_auc(y, row) for row in p])
+        out.append({"feature": col, "importance": drops.mean(), "std": drops.std()})
+    return out
+
+
+def permutation_importance(name: str, X: pd.DataFrame, y: np.ndarray, repeats: int = DEFAULT_REPEATS,
+                           seed: int = 0, workers: int = None) -> pd.DataFrame:
+    columns = list(X.columns)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(columns)))
+    chunks = [columns[i::workers] for i in range(workers)]
+    if workers == 1:
+        _init_worker(name, X, y)
+        rows = _permute_columns(columns, repeats, seed)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(name, X, y)) as pool:
+            rows = [r for part in pool.map(_permute_columns, chunks, [repeats] * workers, [seed] * workers)
+                    for r in part]
+    return pd.DataFrame(rows).sort_values("importance", ascending=False).reset_index(drop=True)
+
+
+# ---------- Job ----------
+def _read_meta() -> dict:
+    return json.loads(META_PATH.read_text(encoding="utf-8")) if META_PATH.exists() else {}
+
+
+def run(season=None, repeats: int = DEFAULT_REPEATS, seed: int = 0, workers: int = None, force: bool = False) -> dict:
+    """Regenera los CSV de los modelos desactualizados; devuelve {modelo: estado}."""
+    season = season or seasons.current()
+    meta = _read_meta()
+    status = {}
+    X = y = None
+    for name in evaluation.MODELS:
+        if name not in evaluation.available_models():
+            status[name] = "sin artefacto"
+            continue
+        key = {**evaluation.cache_key(name, season), "season": season, "repeats": repeats, "seed": seed}
+        outputs = (data.FEATURE_IMPORTANCE_FILES[name], permutation_path(name))
+        if not force and meta.get(name) == key and all(p.exists() for p in outputs):
+            status[name] = "al día"
+            continue
+        if X is None:
+            X, y = evaluation.holdout(season)
+        # Cada CSV (y la meta, al final) se reemplaza de una vez: la página de modelos
+        # y la precarga los leen en paralelo
+        frames = (model_importance(name, evaluation.load_model(name)),
+                  permutation_importance(name, X, y, repeats, seed, workers))
+        for frame, path in zip(frames, outputs):
+            with data.atomic_path(path) as tmp:
+                frame.to_csv(tmp, index=False)
+        meta[name] = key
+        with data.atomic_path(META_PATH) as tmp:
+            tmp.write_text(json.dumps(meta, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+        status[name] = "regenerado"
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenera la importancia de features de cada modelo")
+    parser.add_argument("--season", help="temporada del held-out (por defecto, la más reciente)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="permutaciones por columna")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="procesos (por defecto, uno por CPU)")
+    parser.add_argument("--force", action="store_true", help="regenerar aunque no haya cambios")
+    args = parser.parse_args()
+
+    for name, state in run(args.season, args.repeats, args.seed, args.workers, args.force).items():
+        print(f"{name:20} {state}")
+
+
+if __name__ == "__main__":
+    main()
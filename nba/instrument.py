@@ -0,0 +1,153 @@
+"""Instrumentación liviana: tiempos y contadores por sesión de Streamlit.
+
+- `@timed()` envuelve loaders, transformaciones, predicciones y armado de
+  gráficos; `span(nombre)` mide un bloque (`with instrument.span("..."):`).
+- `count(nombre)` suma eventos; `data.CACHE` cuenta así sus aciertos y fallos.
+
+Cada medición se guarda bajo la sesión de Streamlit que la generó (los hilos sin
+sesión, como la precarga, quedan como "proceso"), con las últimas `MAX_SAMPLES`
+duraciones por nombre. La página oculta `/diagnostico` muestra los percentiles
+y permite exportarlos.
+
+Apagada (por defecto; se prende con NBA_INSTRUMENT=1 o desde la página) cada
+función envuelta paga sólo una llamada extra y la lectura de un flag.
+"""
+import functools
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# NumPy y pandas se importan recién en los reportes: `app.py` importa este módulo
+# antes de renderizar la portada y no debe pagarlos
+
+ENABLED = os.environ.get("NBA_INSTRUMENT", "") not in ("", "0")
+MAX_SAMPLES = 2000
+PERCENTILES = (50, 90, 99)
+
+_lock = threading.Lock()
+_samples = {}     # (sesión, nombre) -> deque de ms
+_counters = {}    # (sesión, nombre) -> int
+_OFF = nullcontext()
+
+
+def enable(on: bool = True):
+    global ENABLED
+    ENABLED = bool(on)
+
+
+def session_id() -> str:
+    # Sin Streamlit cargado (CLI, jobs) no se importa: todo va a "proceso"
+    if "streamlit" not in sys.modules:
+        return "proceso"
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else "proceso"
+
+
+def record(name: str, ms: float):
+    key = (session_id(), name)
+    with _lock:
+        if key not in _samples:
+            _samples[key] = deque(maxlen=MAX_SAMPLES)
+        _samples[key].append(ms)
+
+
+def count(name: str, n: int = 1):
+    if not ENABLED:
+        return
+    key = (session_id(), name)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        # También se registra si el bloque corta con st.stop() o una excepción
+        record(self.name, (time.perf_counter() - self.t0) * 1000)
+        return False
+
+
+def span(name: str):
+    return _Span(name) if ENABLED else _OFF
+
+
+def timed(name: str = None):
+    """Decorador: registra la duración de cada llamada como `name` (por defecto, módulo.función)."""
+    def decorator(fn):
+        label = name or f"{fn.__module__.removeprefix('nba.')}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(label, (time.perf_counter() - t0) * 1000)
+        return wrapper
+    return decorator
+
+
+# ---------- Consultas ----------
+def sessions() -> list:
+    with _lock:
+        return sorted({s for s, _ in _samples} | {s for s, _ in _counters})
+
+
+def summary(session: str = None) -> "pd.DataFrame":
+    """Una fila por medición: llamadas, total y percentiles (de `session`, o de todas)."""
+    import numpy as np
+    import pandas as pd
+
+    with _lock:
+        items = [(name, list(values)) for (s, name), values in _samples.items() if session in (None, s)]
+    merged = {}
+    for name, values in items:
+        merged.setdefault(name, []).extend(values)
+    rows = []
+    for name, values in merged.items():
+        ms = np.asarray(values)
+        rows.append({
+            "nombre": name, "llamadas": len(ms), "total_ms": ms.sum(), "media_ms": ms.mean(),
+            **{f"p{q}_ms": np.percentile(ms, q) for q in PERCENTILES}, "max_ms": ms.max(),
+        })
+    columns = ["nombre", "llamadas", "total_ms", "media_ms", *(f"p{q}_ms" for q in PERCENTILES), "max_ms"]
+    return pd.DataFrame(rows, columns=columns).sort_values("total_ms", ascending=False, ignore_index=True)
+
+
+def counters(session: str = None) -> "pd.DataFrame":
+    import pandas as pd
+
+    with _lock:
+        items = [(name, n) for (s, name), n in _counters.items() if session in (None, s)]
+    out = pd.DataFrame(items, columns=["nombre", "cantidad"])
+    return out.groupby("nombre", as_index=False)["cantidad"].sum().sort_values("nombre", ignore_index=True)
+
+
+def samples(session: str = None) -> "pd.DataFrame":
+    """Todas las mediciones crudas (para exportar)."""
+    import pandas as pd
+
+    with _lock:
+        rows = [(s, name, ms) for (s, name), values in _samples.items() if session in (None, s) for ms in values]
+    return pd.DataFrame(rows, columns=["sesion", "nombre", "ms"])
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _counters.clear()
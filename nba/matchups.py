@@ -0,0 +1,81 @@
+"""Matriz precalculada de probabilidades local × visitante (30 × 29 = 870 cruces).
+
+Se calcula con UNA llamada a `predict_proba` y se guarda en disco junto con el
+hash del CSV de equipos y del modelo que la generaron. Mientras ninguno de los
+dos cambie, la página de predicción sólo hace búsquedas O(1) en la matriz y no
+necesita cargar el modelo. Hay una matriz por temporada, dentro de su partición.
+"""
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from nba import data, instrument, seasons
+from nba.features import build_matchups, team_stats
+
+MODEL_PATH = Path("models/logreg_no_percents_pipeline.pkl")
+
+
+def matrix_path(season: str) -> Path:
+    return seasons.path(season, "matchup_matrix")
+
+
+def sources_fingerprint(season: str, model_path=MODEL_PATH) -> dict:
+    """Hash de los archivos de los que depende la matriz (se rehashea sólo si cambian)."""
+    return {
+        "teams": data.CACHE.get(seasons.resolve(season, "teams"), data.file_hash),
+        "model": data.CACHE.get(model_path, data.file_hash),
+    }
+
+
+def home_win_proba(model, X: pd.DataFrame):
+    """P(gana el local) para cada fila de X (target del entrenamiento: 1 = victoria local)."""
+    return model.predict_proba(X)[:, list(model.classes_).index(1)]
+
+
+@instrument.timed()
+def compute_matrix(model, stats: pd.DataFrame) -> pd.DataFrame:
+    """Todos los cruces local/visitante en una sola pasada por el pipeline."""
+    names = list(stats.index)
+    pairs = [(home, visitor) for home in names for visitor in names if home != visitor]
+    home, visitor = (list(x) for x in zip(*pairs))
+    X = build_matchups(stats, home, visitor)
+    return pd.DataFrame({"home": home, "visitor": visitor, "p_home": home_win_proba(model, X)})
+
+
+def _read_matrix(path):
+    return pd.read_csv(path).set_index(["home", "visitor"]).sort_index()
+
+
+def is_current(season: str, fingerprint: dict) -> bool:
+    path = matrix_path(season)
+    meta = path.with_suffix(".json")
+    if not (path.exists() and meta.exists()):
+        return False
+    return json.loads(meta.read_text(encoding="utf-8")) == fingerprint
+
+
+@instrument.timed()
+def load_matrix(load_model, season=None) -> pd.DataFrame:
+    """
+    Devuelve la matriz de `season` indexada por (home, visitor). Si el CSV de
+    equipos o el modelo cambiaron, la recalcula (`load_model` sólo se llama en ese caso).
+    """
+    season = season or seasons.current()
+    path = matrix_path(season)
+    fingerprint = sources_fingerprint(season)
+    if not is_current(season, fingerprint):
+        matrix = compute_matrix(load_model(), team_stats(data.load_teams(season)))
+        # Primero la matriz y después su huella, cada una reemplazada de una vez: un
+        # lector concurrente nunca ve una huella nueva con la matriz vieja o cortada
+        with data.atomic_path(path) as tmp:
+            matrix.to_csv(tmp, index=False)
+        with data.atomic_path(path.with_suffix(".json")) as tmp:
+            tmp.write_text(json.dumps(fingerprint, indent=2), encoding="utf-8")
+    return data.CACHE.get(path, _read_matrix)
+
+
+def lookup(matrix: pd.DataFrame, home_teams, visitor_teams):
+    """P(gana el local) para N cruces (NaN si el cruce no está en la matriz)."""
+    idx = pd.MultiIndex.from_arrays([list(home_teams), list(visitor_teams)])
+    return matrix["p_home"].reindex(idx).to_numpy()
@@ -0,0 +1,69 @@
+"""Reporte de memoria: qué ocupa cada objeto cacheado y cuánto ahorran los esquemas.
+
+- `cache_report`: una fila por entrada de `data.CACHE` (DataFrames, stores,
+  modelo, hashes) con su tamaño, de la más grande a la más chica.
+- `schema_savings`: para cada dataset columnar de la temporada, la memoria con
+  los tipos por defecto de `pd.read_csv` contra la de su esquema tipado
+  (`columnar.SCHEMAS`).
+
+Uso:
+    python -m nba.memory            # precarga la app (`nba.warmup`) y muestra ambos reportes
+"""
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from nba import columnar, data, seasons
+
+MB = 1024 ** 2
+
+
+def cache_report() -> pd.DataFrame:
+    info = data.CACHE.info()
+    info["objeto"] = [f"{Path(p).name} · {reader}" for p, reader in zip(info["path"], info["reader"])]
+    # Lecturas columnar: cuántas columnas se pidieron (None = todas)
+    info["columnas"] = [len(args[0]) if args and args[0] else None for args in info["args"]]
+    info["MB"] = info["bytes"] / MB
+    columns = ["objeto", "type", "rows", "columnas", "MB"]
+    return info.sort_values("bytes", ascending=False)[columns].reset_index(drop=True)
+
+
+def schema_savings(season=None) -> pd.DataFrame:
+    season = season or seasons.current()
+    rows = []
+    for name in columnar.DATASETS:
+        path = seasons.path(season, name)
+        if not path.exists():
+            continue
+        default = pd.read_csv(path)
+        typed = columnar.read_columns(path)
+        rows.append({
+            "dataset": name,
+            "filas": len(typed),
+            "MB por defecto": data._nbytes(default) / MB,
+            "MB tipado": data._nbytes(typed) / MB,
+        })
+    out = pd.DataFrame(rows)
+    out["ahorro"] = 1 - out["MB tipado"] / out["MB por defecto"]
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria de los objetos cacheados")
+    parser.add_argument("--season")
+    args = parser.parse_args()
+
+    from nba import warmup
+
+    warmup.start(args.season).join()
+    report = cache_report()
+    print(report.to_string(float_format="{:.3f}".format))
+    print(f"\nTotal: {data.CACHE.nbytes / MB:.2f} MB de {data.CACHE.max_bytes / MB:.0f} MB "
+          f"({len(report)} objetos)\n")
+    savings = schema_savings(args.season)
+    print(savings.to_string(index=False, float_format="{:.3f}".format, formatters={"ahorro": "{:.0%}".format}))
+
+
+if __name__ == "__main__":
+    main()
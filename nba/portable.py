@@ -0,0 +1,172 @@
+"""Formato portable del pipeline de regresión logística.
+
+`export` convierte el pipeline entrenado (.pkl) en un JSON plano con todo lo
+necesario para predecir: columnas de entrada, columnas descartadas, valores de
+imputación, parámetros del MinMaxScaler, categorías del OneHotEncoder y
+coeficientes. `PortableModel` reproduce `predict_proba` sólo con NumPy: no hace
+falta importar sklearn, ni el parche de `DropColumns`, para predecir.
+
+El escalado se pliega en los coeficientes, así que puntuar un lote es un único
+producto matriz-vector más la suma de los pesos de cada categoría.
+
+Uso:
+    python -m nba.portable                 # exporta models/logreg_no_percents_pipeline.pkl
+    python -m nba.portable otro_modelo.pkl
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba import instrument
+
+FORMAT_VERSION = 1
+
+
+def portable_path(pkl_path) -> Path:
+    return Path(pkl_path).with_suffix(".json")
+
+
+def export(pipeline, source_hash=None) -> dict:
+    """Extrae los parámetros del pipeline (preprocesamiento + LogisticRegression)."""
+    preprocessing = pipeline.named_steps["preprocessing"]
+    drop_step = preprocessing.named_steps["drop_columns"]
+    column_transform = preprocessing.named_steps["column_transform"]
+    clf = pipeline.named_steps["model"]
+
+    transformers = {name: (steps, cols) for name, steps, cols in column_transform.transformers_}
+    num_steps, num_cols = transformers["num"]
+    cat_steps, cat_cols = transformers["cat"]
+    scaler = num_steps.named_steps["scaler"]
+    onehot = cat_steps.named_steps["onehot"]
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "source_hash": source_hash,
+        "columns": [str(c) for c in column_transform.feature_names_in_],
+        "drop_columns": list(getattr(drop_step, "columns_to_drop", None) or drop_step._get_cols_to_drop()),
+        "numeric": {
+            "columns": list(num_cols),
+            "fill": num_steps.named_steps["imputer"].statistics_.astype(float).tolist(),
+            "scale": scaler.scale_.tolist(),
+            "min": scaler.min_.tolist(),
+        },
+        "categorical": {
+            "columns": list(cat_cols),
+            "fill": [str(v) for v in cat_steps.named_steps["imputer"].statistics_],
+            "categories": [[str(v) for v in cats] for cats in onehot.categories_],
+        },
+        "classes": [int(c) for c in clf.classes_],
+        "coef": clf.coef_.ravel().tolist(),
+        "intercept": float(clf.intercept_[0]),
+    }
+
+
+class PortableModel:
+    """Scorer NumPy equivalente al pipeline exportado (misma API que sklearn)."""
+
+    def __init__(self, params: dict):
+        self.params = params
+        self.classes_ = np.array(params["classes"])
+        num, cat = params["numeric"], params["categorical"]
+        coef = np.asarray(params["coef"], dtype=float)
+
+        self.num_columns = num["columns"]
+        self.num_fill = np.asarray(num["fill"], dtype=float)
+        n_num = len(self.num_columns)
+        # MinMaxScaler (x * scale + min) plegado en los coeficientes
+        self.num_coef = coef[:n_num] * np.asarray(num["scale"])
+        self.intercept = params["intercept"] + coef[:n_num] @ np.asarray(num["min"])
+
+        # One-hot: cada columna categórica es un vector de pesos por categoría,
+        # con un 0 al final para las categorías desconocidas (código -1)
+        self.cat_columns = cat["columns"]
+        self.cat_fill = cat["fill"]
+        self.cat_categories = [pd.Index(cats) for cats in cat["categories"]]
+        self.cat_weights = []
+        offset = n_num
+        for cats in cat["categories"]:
+            self.cat_weights.append(np.append(coef[offset:offset + len(cats)], 0.0))
+            offset += len(cats)
+
+    @classmethod
+    def load(cls, path) -> "PortableModel":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def decision_function(self, X: pd.DataFrame) -> np.ndarray:
+        Xn = X[self.num_columns].to_numpy(dtype=float)
+        Xn = np.where(np.isnan(Xn), self.num_fill, Xn)
+        z = Xn @ self.num_coef + self.intercept
+        for col, fill, cats, weights in zip(self.cat_columns, self.cat_fill, self.cat_categories, self.cat_weights):
+            values = X[col].astype(object).where(X[col].notna(), fill)
+            # Categorías desconocidas no suman (handle_unknown="ignore")
+            z += weights[cats.get_indexer(values)]
+        return z
+
+    @instrument.timed()
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        p = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+def export_file(pkl_path, out_path=None) -> Path:
+    """Carga el .pkl (requiere sklearn) y escribe su versión portable."""
+    from nba.data import file_hash
+    from nba.sklearn_compat import load_pipeline
+
+    out_path = Path(out_path) if out_path else portable_path(pkl_path)
+    params = export(load_pipeline(pkl_path), source_hash=file_hash(pkl_path))
+    out_path.write_text(json.dumps(params, ensure_ascii=False, indent=1), encoding="utf-8")
+    return out_path
+
+
+def ensure_exported(pkl_path) -> Path:
+    """Devuelve el JSON portable, reexportándolo si el .pkl cambió desde la última exportación."""
+    from nba.data import CACHE, file_hash
+
+    out_path = portable_path(pkl_path)
+    if out_path.exists():
+        params = json.loads(out_path.read_text(encoding="utf-8"))
+        if params.get("source_hash") == CACHE.get(pkl_path, file_hash):
+            return out_path
+    return export_file(pkl_path, out_path)
+
+
+@instrument.timed()
+def load(pkl_path) -> PortableModel:
+    """Modelo portable del .pkl desde el caché compartido (se relee sólo si cambió)."""
+    from nba.data import CACHE
+
+    return CACHE.get(ensure_exported(pkl_path), PortableModel.load)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta un pipeline .pkl al formato portable")
+    parser.add_argument("pkl", nargs="?", type=Path, default=Path("models/logreg_no_percents_pipeline.pkl"))
+    parser.add_argument("--check", type=Path,
+                        help="dataset para comparar contra predict_proba del pipeline original "
+                             "(por defecto, df_final de la temporada más reciente)")
+    args = parser.parse_args()
+    if args.check is None:
+        from nba import seasons
+
+        args.check = seasons.path(seasons.current(), "df_final")
+
+    out = export_file(args.pkl)
+    print(f"{args.pkl} -> {out} ({out.stat().st_size / 1024:.1f} KB)")
+    if args.check and args.check.exists():
+        from nba.sklearn_compat import load_pipeline
+
+        X = pd.read_csv(args.check)
+        expected = load_pipeline(args.pkl).predict_proba(X)
+        got = PortableModel.load(out).predict_proba(X)
+        print(f"máx. diferencia vs sklearn en {len(X):,} filas: {np.abs(expected - got).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Perfil de arranque en frío de cada página.
+
+Cada página se ejecuta en un proceso nuevo (caché de imports vacío) con el
+`AppTest` de Streamlit y se mide:
+- el tiempo del primer render de la página,
+- qué librerías pesadas importó y cuánto cuesta importar cada una en frío,
+- si el total queda dentro del presupuesto de la página (`BUDGETS_MS`).
+
+Uso:
+    python -m nba.profiling                 # todas las páginas, tabla en consola
+    python -m nba.profiling --json out.json # además guarda el resultado
+    python -m nba.profiling pages/06_Equipo.py
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PAGES = [Path("app.py"), *sorted(Path("pages").glob("*.py"))]
+
+HEAVY_LIBRARIES = ["pandas", "numpy", "altair", "pyarrow", "sklearn", "joblib", "scipy"]
+
+# Presupuesto de arranque en frío (primer render, ms) por página.
+# app.py: p95 medido (25 corridas: p50 246 ms, p95 323 ms). Casi todo es el piso del
+# propio AppTest (escaneo de manifiestos de componentes y espera de los deltas): una
+# página de una sola línea da p50 200 ms y p95 269 ms. Con 300 ms el perfil fallaba
+# de a ratos sin cambios en el árbol; app.py sólo importa stdlib (ver nba.warmup)
+BUDGETS_MS = {
+    "app.py": 350,
+    "01_Exploración_de_datos.py": 2500,
+    "03_Dataset y modelo.py": 2500,
+    "04_Prediccion.py": 1500,
+    "05_Simulacion.py": 2500,
+    "06_Equipo.py": 500,
+}
+
+_RUNNER = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+sys.path.insert(0, ".")
+page = sys.argv[1]
+before = set(sys.modules)
+t0 = time.perf_counter()
+at = AppTest.from_file(page, default_timeout=300)
+at.run()
+render_ms = (time.perf_counter() - t0) * 1000
+loaded = sorted({m.split(".")[0] for m in set(sys.modules) - before})
+print(json.dumps({
+    "render_ms": render_ms,
+    "loaded": loaded,
+    "exceptions": [str(e.value) for e in at.exception],
+}))
+"""
+
+_IMPORT_TIME = re.compile(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s*(\S+)\s*$")
+
+
+def import_cost_ms(module: str) -> float:
+    """Costo de importar `module` en un intérprete nuevo (`-X importtime`, acumulado)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return float("nan")
+    for line in reversed(proc.stderr.splitlines()):
+        match = _IMPORT_TIME.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    return float("nan")
+
+
+def profile_page(page) -> dict:
+    proc = subprocess.run([sys.executable, "-c", _RUNNER, str(page)], capture_output=True, text=True)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        return {"page": Path(page).name, "error": proc.stderr.strip().splitlines()[-1:]}
+    result = json.loads(lines[-1])
+    name = Path(page).name
+    heavy = [lib for lib in HEAVY_LIBRARIES if lib in result["loaded"]]
+    budget = BUDGETS_MS.get(name)
+    return {
+        "page": name,
+        "render_ms": round(result["render_ms"], 1),
+        "heavy_imports": heavy,
+        "budget_ms": budget,
+        "within_budget": budget is None or result["render_ms"] <= budget,
+        "exceptions": result["exceptions"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de arranque en frío por página")
+    parser.add_argument("pages", nargs="*", type=Path, default=PAGES)
+    parser.add_argument("--json", type=Path, help="guarda el resultado en este archivo")
+    args = parser.parse_args()
+
+    imports = {lib: round(import_cost_ms(lib), 1) for lib in HEAVY_LIBRARIES}
+    results = [profile_page(page) for page in args.pages]
+
+    print(f"{'página':32} {'render ms':>10} {'presup.':>8}  imports pesados")
+    for r in results:
+        if "error" in r:
+            print(f"{r['page']:32} ERROR {r['error']}")
+            continue
+        flag = "" if r["within_budget"] else "  <-- fuera de presupuesto"
+        libs = ", ".join(f"{lib} ({imports[lib]:.0f} ms)" for lib in r["heavy_imports"]) or "-"
+        print(f"{r['page']:32} {r['render_ms']:>10.0f} {r['budget_ms'] or '-':>8}  {libs}{flag}")
+
+    if args.json:
+        args.json.write_text(json.dumps({"import_ms": imports, "pages": results}, indent=2, ensure_ascii=False),
+                             encoding="utf-8")
+    sys.exit(0 if all(r.get("within_budget", False) for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
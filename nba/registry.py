@@ -0,0 +1,83 @@
+"""Registro de equipos de una temporada: código, nombre y estadísticas en un solo lugar.
+
+Las páginas y los módulos nombran a los equipos de tres formas: código de tres
+letras (BOS, y los alias de basketball-reference como BRK), nombre del CSV de
+estadísticas ("LA Clippers") y nombre completo ("Los Angeles Clippers").
+`TeamRegistry` resuelve cualquiera de ellas al mismo equipo con una búsqueda en
+un dict, y guarda ya armadas las estadísticas que usa el modelo (una fila por
+equipo en `stats`, y el mismo dato como dict en `record`).
+
+`load_registry(season)` lo arma una vez por versión del CSV de equipos (queda en
+`data.CACHE`: si el archivo cambia, se reconstruye).
+"""
+import numpy as np
+import pandas as pd
+
+from nba import data, instrument, seasons
+from nba.features import TEAM_STAT_COLUMNS, team_stats
+from nba.teams import JSON_TEAM_ALIASES, STATS_TEAM_NAMES, TEAM_NAMES
+
+STAT_COLUMNS = list(TEAM_STAT_COLUMNS.values())
+
+
+class TeamRegistry:
+    """Equipos de la temporada con búsquedas O(1) por código, alias o nombre."""
+
+    def __init__(self, teams_df: pd.DataFrame = None):
+        # Nombre que se muestra en toda la app: el del CSV de estadísticas (NBA.com)
+        self.names_by_code = dict(sorted(STATS_TEAM_NAMES.items()))
+        self._codes = {}
+        for code, name in self.names_by_code.items():
+            self._codes.update({code: code, name: code, TEAM_NAMES[code]: code})
+        self._codes.update({alias: code for alias, code in JSON_TEAM_ALIASES.items()})
+
+        # Estadísticas del modelo de los equipos que están en el CSV, ordenados por nombre
+        stats = team_stats(teams_df) if teams_df is not None and not teams_df.empty else None
+        if stats is None:
+            stats = pd.DataFrame(columns=STAT_COLUMNS, index=pd.Index([], name="TEAM"))
+        self.stats = stats[stats.index.isin(list(self._codes))].sort_index()
+        self.names = list(self.stats.index)
+        self._rows = {self._codes[name]: i for i, name in enumerate(self.names)}
+        self._records = self.stats.to_dict("records")
+
+    def __contains__(self, team) -> bool:
+        return self._codes.get(team) in self._rows
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def code(self, team):
+        """Código de tres letras (None si no es un equipo conocido)."""
+        return self._codes.get(team)
+
+    def name(self, team):
+        """Nombre que se muestra en la app."""
+        return self.names_by_code.get(self._codes.get(team))
+
+    def row(self, team):
+        """Posición del equipo en `stats` (None si no tiene estadísticas)."""
+        return self._rows.get(self._codes.get(team))
+
+    def rows(self, teams) -> np.ndarray:
+        """Posiciones en `stats` de varios equipos (-1 para los que no están)."""
+        return np.array([self._rows.get(self._codes.get(t), -1) for t in teams], dtype=int)
+
+    def record(self, team):
+        """Estadísticas del modelo del equipo como dict (None si no está en el CSV)."""
+        row = self.row(team)
+        return None if row is None else self._records[row]
+
+
+def _read_registry(path, season):
+    # `path` sólo versiona la entrada del caché: el CSV se lee con el loader público
+    return TeamRegistry(data.load_teams(season))
+
+
+@instrument.timed()
+def load_registry(season=None) -> TeamRegistry:
+    """Registro de la temporada (sin CSV de equipos: sólo códigos y nombres, sin estadísticas)."""
+    season = season or seasons.current()
+    try:
+        return data.CACHE.get(seasons.resolve(season, "teams"), _read_registry, season)
+    except FileNotFoundError:
+        return TeamRegistry()
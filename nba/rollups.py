@@ -0,0 +1,187 @@
+"""Cubo de agregados por equipo para la página de exploración.
+
+Una fila por (equipo, condición, métrica) con count/sum/mean, los cuantiles
+min/q1/median/q3/max y los bigotes del boxplot (lower/upper: el dato más extremo
+dentro de 1,5 × IQR), calculado UNA vez por temporada a partir de:
+- `games_clean` (por equipo y partido): métricas con condición "all"
+  (oRtg, dRtg, net_rating, tsPercent, W_percent, win_game, loss_game),
+- `games_final` (local vs visitante): métricas de partido con condición
+  "home", "away" y "all" (las dos juntas).
+
+Junto al cubo se guardan los atípicos: los valores por partido que quedan fuera
+de los bigotes (una fila por equipo, condición, métrica y valor).
+
+Se guarda en la partición (`graph/rollup_cube.csv` y `graph/rollup_outliers.csv`)
+junto con el hash de los archivos de origen; si alguno cambia se recalcula. La
+página sólo filtra filas del cubo en cada cambio de selector, sin recorrer las
+tablas por partido.
+
+Uso:
+    python -m nba.rollups        # (re)genera el cubo de todas las temporadas
+"""
+import json
+
+import pandas as pd
+
+from nba import data, instrument, seasons
+
+TEAM_METRICS = ["oRtg", "dRtg", "net_rating", "tsPercent", "W_percent", "win_game", "loss_game"]
+GAME_METRICS = ["offensive_rating", "defensive_rating", "ts_percent", "assist_percent",
+                "rebound_percent", "turnover_percent"]
+
+SOURCE_DECIMALS = 4
+WHISKER_IQR = 1.5
+# Se guarda con el hash de los orígenes: si cambian las columnas del cubo, se recalcula
+CUBE_VERSION = 2
+
+CUBE_COLUMNS = ["team", "side", "metric", "count", "sum", "mean", "min", "q1", "median", "q3", "max",
+                "lower", "upper"]
+OUTLIER_COLUMNS = ["team", "side", "metric", "value"]
+
+
+def _rollup(long: pd.DataFrame, side: str) -> tuple:
+    """`long` = (team, metric, value) -> (una fila de agregados por (team, metric), atípicos)."""
+    grouped = long.groupby(["team", "metric"], observed=True)["value"]
+    out = grouped.agg(["count", "sum", "mean", "min", "median", "max"])
+    out["q1"] = grouped.quantile(0.25)
+    out["q3"] = grouped.quantile(0.75)
+    # Bigotes: el valor más extremo que no se aleja más de 1,5 × IQR de la caja
+    q1, q3 = grouped.transform("quantile", 0.25), grouped.transform("quantile", 0.75)
+    iqr = q3 - q1
+    value = long["value"]
+    keys = [long["team"], long["metric"]]
+    inside = value.between(q1 - WHISKER_IQR * iqr, q3 + WHISKER_IQR * iqr)
+    out["lower"] = value.where(inside).groupby(keys, observed=True).min()
+    out["upper"] = value.where(inside).groupby(keys, observed=True).max()
+    out = out.reset_index()
+    out["team"] = out["team"].astype(str)
+    out["side"] = side
+    outliers = long[~inside].assign(team=lambda d: d["team"].astype(str), side=side)
+    return out, outliers
+
+
+def _melt(df: pd.DataFrame, team_col: str, columns: dict) -> pd.DataFrame:
+    # columns: columna original -> nombre de la métrica en el cubo
+    long = df[[team_col, *columns]].rename(columns={team_col: "team", **columns})
+    long = long.melt(id_vars="team", var_name="metric", value_name="value")
+    # Las tablas se leen en float32: los CSV tienen a lo sumo 3 decimales, así que
+    # redondear a 4 recupera el valor exacto en float64 (el cubo no cambia)
+    long["value"] = long["value"].astype("float64").round(SOURCE_DECIMALS)
+    return long
+
+
+def build_cube(team_df: pd.DataFrame, games_df: pd.DataFrame) -> tuple:
+    """Arma el cubo y sus atípicos a partir de `games_clean` y `games_final` completos."""
+    home = _melt(games_df, "home_team", {f"home_{m}": m for m in GAME_METRICS})
+    away = _melt(games_df, "visitor_team", {f"visitor_{m}": m for m in GAME_METRICS})
+    parts = [
+        _rollup(_melt(team_df, "team", {m: m for m in TEAM_METRICS}), "all"),
+        _rollup(home, "home"),
+        _rollup(away, "away"),
+        _rollup(pd.concat([home, away], ignore_index=True), "all"),
+    ]
+    cube = pd.concat([p[0] for p in parts], ignore_index=True)[CUBE_COLUMNS]
+    outliers = pd.concat([p[1] for p in parts], ignore_index=True)[OUTLIER_COLUMNS]
+    return (cube.sort_values(["team", "side", "metric"]).reset_index(drop=True),
+            outliers.sort_values(OUTLIER_COLUMNS).reset_index(drop=True))
+
+
+def cube_path(season: str):
+    return seasons.path(season, "rollup_cube")
+
+
+def outliers_path(season: str):
+    return seasons.path(season, "rollup_outliers")
+
+
+def sources_fingerprint(season: str) -> dict:
+    return {
+        "version": CUBE_VERSION,
+        **{name: data.CACHE.get(seasons.resolve(season, name), data.file_hash)
+           for name in ("games_clean", "games_final")},
+    }
+
+
+def write_cube(season=None) -> pd.DataFrame:
+    """Recalcula y guarda el cubo de `season` (se llama al ingerir datos nuevos)."""
+    season = season or seasons.current()
+    team_df = data.load_team_data(["team", *TEAM_METRICS], season=season)
+    games_df = data.load_games_data(
+        ["home_team", "visitor_team", *(f"{side}_{m}" for side in ("home", "visitor") for m in GAME_METRICS)],
+        season=season,
+    )
+    cube, outliers = build_cube(team_df, games_df)
+    path = cube_path(season)
+    # Cada archivo se reemplaza de una vez (la huella al final): las sesiones y la
+    # precarga que leen en paralelo nunca ven un CSV cortado
+    with data.atomic_path(path) as tmp:
+        cube.to_csv(tmp, index=False)
+    with data.atomic_path(outliers_path(season)) as tmp:
+        outliers.to_csv(tmp, index=False)
+    with data.atomic_path(path.with_suffix(".json")) as tmp:
+        tmp.write_text(json.dumps(sources_fingerprint(season), indent=2), encoding="utf-8")
+    return cube
+
+
+def is_current(season: str) -> bool:
+    path = cube_path(season)
+    meta = path.with_suffix(".json")
+    if not (path.exists() and outliers_path(season).exists() and meta.exists()):
+        return False
+    return json.loads(meta.read_text(encoding="utf-8")) == sources_fingerprint(season)
+
+
+@instrument.timed()
+def load_cube(season=None) -> pd.DataFrame:
+    """Cubo de la temporada (lo recalcula sólo si cambiaron los datasets de origen)."""
+    season = season or seasons.current()
+    if not is_current(season):
+        write_cube(season)
+    return data.CACHE.get(cube_path(season), pd.read_csv)
+
+
+@instrument.timed()
+def load_outliers(season=None) -> pd.DataFrame:
+    """Atípicos del cubo de la temporada (se regeneran junto con el cubo)."""
+    season = season or seasons.current()
+    if not is_current(season):
+        write_cube(season)
+    return data.CACHE.get(outliers_path(season), pd.read_csv)
+
+
+@instrument.timed()
+def slice_cube(cube: pd.DataFrame, metrics, side="all", teams=None) -> pd.DataFrame:
+    """Filas del cubo para esas métricas/condición (y equipos, si se indican)."""
+    metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+    mask = cube["metric"].isin(metrics) & (cube["side"] == side)
+    if teams is not None:
+        mask &= cube["team"].isin(list(teams))
+    return cube[mask]
+
+
+@instrument.timed()
+def slice_outliers(outliers: pd.DataFrame, metric: str, side="all", teams=None) -> pd.DataFrame:
+    """Atípicos de una métrica/condición (y equipos): la capa de puntos del boxplot."""
+    mask = (outliers["metric"] == metric) & (outliers["side"] == side)
+    if teams is not None:
+        mask &= outliers["team"].isin(list(teams))
+    return outliers[mask]
+
+
+@instrument.timed()
+def pivot(cube: pd.DataFrame, metrics, stat="mean", side="all", teams=None) -> pd.DataFrame:
+    """Tabla equipo × métrica con un estadístico (p. ej. el `team_summary` de la página 01)."""
+    metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+    sliced = slice_cube(cube, metrics, side, teams)
+    return sliced.pivot(index="team", columns="metric", values=stat).reindex(columns=metrics)
+
+
+def main():
+    for season in seasons.available():
+        cube = write_cube(season)
+        print(f"{season}: {len(cube):,} filas -> {cube_path(season)} "
+              f"(atípicos en {outliers_path(season).name})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Datos particionados por temporada: `data/<temporada>/...` + un índice liviano.
+
+Cada temporada vive en su propio directorio con la misma estructura:
+
+    data/<temporada>/
+        <TEAM>_<temporada>.json               partidos crudos por equipo
+        all_matches_<temporada>.json          calendario
+        graph/games_clean.csv, graph/df_final.csv, graph/rollup_cube.csv
+        processed/games_final_csv.csv, processed/<TEAM>_features.csv
+        prediction/teams_advanced_<temporada>.csv, prediction/matchup_matrix.csv
+
+`data/manifest.json` describe cada partición (rango de fechas, cantidad de
+partidos, equipos y qué datasets tiene). Los loaders lo consultan para resolver
+rutas y leer sólo la temporada pedida; las páginas, para armar el selector.
+
+Uso:
+    python -m nba.seasons        # regenera data/manifest.json escaneando data/
+"""
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba.teams import TEAM_NAMES
+
+DATA_DIR = Path("data")
+MANIFEST_PATH = DATA_DIR / "manifest.json"
+MANIFEST_VERSION = 1
+
+SEASON_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+
+# Datasets de una temporada (ruta relativa al directorio de la partición)
+DATASETS = {
+    "games_clean": "graph/games_clean.csv",
+    "df_final": "graph/df_final.csv",
+    "games_final": "processed/games_final_csv.csv",
+    "teams": "prediction/teams_advanced_{season_}.csv",
+    "schedule": "all_matches_{season}.json",
+    "matchup_matrix": "prediction/matchup_matrix.csv",
+    "rollup_cube": "graph/rollup_cube.csv",
+    "rollup_outliers": "graph/rollup_outliers.csv",
+    "game_store": "processed/game_store.pkl",
+    "asof_store": "processed/asof_store.npz",
+    "backtest": "processed/backtest.json",
+    "evaluation": "processed/evaluation.json",
+    "feature_state": "processed/feature_engine_state.pkl",
+}
+
+# Datasets particionados además por equipo
+TEAM_DATASETS = {
+    "team_games": "{team}_{season}.json",
+    "team_features": "processed/{team}_features.csv",
+}
+
+# Los que se generan (no describen la partición)
+DERIVED = {"matchup_matrix", "rollup_cube", "rollup_outliers", "game_store", "asof_store", "backtest", "evaluation", "feature_state"}
+
+# Los JSON no dicen de qué tipo es cada partido. Quedan fuera de la temporada regular
+# los posteriores a `end` (play-in y playoffs) y los de `exclude`: la final de la
+# NBA Cup, que no cuenta para el récord (82 partidos por equipo, como GP del CSV)
+REGULAR_SEASON = {
+    "2024-25": {"end": "2025-04-13", "exclude": ["202412170OKC"]},
+}
+
+
+def season_start(season: str) -> pd.Timestamp:
+    """Inicio de la temporada regular (los partidos anteriores son de la temporada pasada)."""
+    return pd.Timestamp(f"{season[:4]}-10-01", tz="UTC")
+
+
+def is_regular(season: str, game_ids, dates) -> np.ndarray:
+    """True para cada partido de la temporada regular (fechas naive = UTC)."""
+    spec = REGULAR_SEASON.get(season, {})
+    dates = pd.to_datetime(pd.Series(list(dates)), utc=True)
+    regular = dates >= season_start(season)
+    if spec.get("end"):
+        regular &= dates < pd.Timestamp(spec["end"], tz="UTC") + pd.Timedelta(days=1)
+    regular &= ~pd.Series(list(game_ids), index=dates.index).isin(spec.get("exclude", []))
+    return regular.to_numpy()
+
+
+def path(season: str, dataset: str, team: str = None) -> Path:
+    """Ruta de un dataset dentro de la partición de `season`."""
+    pattern = TEAM_DATASETS[dataset] if team else DATASETS[dataset]
+    rel = pattern.format(season=season, season_=season.replace("-", "_"), team=team)
+    return DATA_DIR / season / rel
+
+
+def team_paths(season: str, dataset: str, teams=None) -> dict:
+    """Rutas por equipo que existen en la partición (sólo los `teams` pedidos)."""
+    teams = TEAM_NAMES if teams is None else teams
+    return {team: path(season, dataset, team) for team in teams if path(season, dataset, team).exists()}
+
+
+# ---------- Índice ----------
+def describe(season: str) -> dict:
+    """Entrada del manifiesto para una partición (sin leer los CSV grandes)."""
+    entry = {
+        "path": str(DATA_DIR / season),
+        "datasets": {
+            name: path(season, name).relative_to(DATA_DIR / season).as_posix()
+            for name in DATASETS if name not in DERIVED and path(season, name).exists()
+        },
+        "team_datasets": {
+            name: sorted(team_paths(season, name)) for name in TEAM_DATASETS
+        },
+    }
+    schedule = path(season, "schedule")
+    if schedule.exists():
+        games = json.loads(schedule.read_text(encoding="utf-8"))
+        dates = sorted(g["date"] for g in games)
+        entry.update({
+            "start": dates[0][:10] if dates else None,
+            "end": dates[-1][:10] if dates else None,
+            "games": len(games),
+            "teams": sorted({g["homeTeam"] for g in games} | {g["visitorTeam"] for g in games}),
+        })
+    else:
+        entry["teams"] = entry["team_datasets"]["team_games"]
+    return entry
+
+
+def build_manifest(data_dir=DATA_DIR) -> dict:
+    found = sorted(p.name for p in Path(data_dir).iterdir() if p.is_dir() and SEASON_PATTERN.match(p.name))
+    return {"version": MANIFEST_VERSION, "seasons": {season: describe(season) for season in found}}
+
+
+def write_manifest() -> dict:
+    manifest = build_manifest()
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    _memo.clear()
+    return manifest
+
+
+_memo = {}
+
+
+def load_manifest() -> dict:
+    """Manifiesto de `data/` (se relee sólo si cambió el archivo; se genera si falta)."""
+    if not MANIFEST_PATH.exists():
+        return write_manifest()
+    mtime = MANIFEST_PATH.stat().st_mtime_ns
+    if _memo.get("mtime") != mtime:
+        _memo.update(mtime=mtime, manifest=json.loads(MANIFEST_PATH.read_text(encoding="utf-8")))
+    return _memo["manifest"]
+
+
+def available() -> list:
+    """Temporadas disponibles, de la más reciente a la más vieja."""
+    return sorted(load_manifest()["seasons"], reverse=True)
+
+
+def current() -> str:
+    seasons = available()
+    if not seasons:
+        raise FileNotFoundError(f"No hay temporadas en {DATA_DIR} (¿falta correr `python -m nba.seasons`?)")
+    return seasons[0]
+
+
+def partition(season: str = None) -> dict:
+    """Entrada del manifiesto de `season` (por defecto, la más reciente)."""
+    season = season or current()
+    try:
+        return load_manifest()["seasons"][season]
+    except KeyError:
+        raise ValueError(f"Temporada desconocida: {season} (disponibles: {', '.join(available())})") from None
+
+
+def resolve(season: str, dataset: str, team: str = None) -> Path:
+    """
+    Ruta de un dataset que el manifiesto registra para `season` (FileNotFoundError
+    si la partición no lo tiene): así un loader nunca abre otra temporada.
+    """
+    entry = partition(season)
+    if team is not None:
+        if team not in entry["team_datasets"].get(dataset, []):
+            raise FileNotFoundError(f"{dataset} de {team} no está en la partición {season}")
+        return path(season, dataset, team)
+    if dataset not in entry["datasets"]:
+        raise FileNotFoundError(f"{dataset} no está en la partición {season}")
+    return Path(entry["path"]) / entry["datasets"][dataset]
+
+
+def main():
+    manifest = write_manifest()
+    for season, entry in manifest["seasons"].items():
+        print(f"{season}: {entry.get('games', '?')} partidos ({entry.get('start')} → {entry.get('end')}), "
+              f"{len(entry['teams'])} equipos, datasets: {', '.join(entry['datasets'])}")
+
+
+if __name__ == "__main__":
+    main()
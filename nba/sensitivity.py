@@ -0,0 +1,124 @@
+"""Barridos "qué pasaría si": P(gana el local) sobre una grilla de estadísticas perturbadas.
+
+Parte de las estadísticas de un cruce (local y visitante, como las de
+`registry.record`) y mueve dos variables a la vez (net rating, OffRtg, DefRtg o
+racha de cada lado) sobre una grilla de n × n valores alrededor de los actuales.
+Las n² filas se arman con NumPy, pasan UNA vez por `build_features` y se
+puntúan con un único `predict_proba`: 100 × 100 = 10.000 escenarios tardan
+decenas de milisegundos.
+
+Uso:
+    python -m nba.sensitivity BOS NYK       # mide un barrido de 100 × 100 net ratings
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from nba import instrument
+from nba.features import TEAM_STAT_COLUMNS, build_features
+from nba.matchups import home_win_proba
+
+STAT_COLUMNS = list(TEAM_STAT_COLUMNS.values())
+
+# Variables que se pueden barrer: etiqueta -> (lado, pesos de cada columna en su valor).
+# Un cambio Δ en la variable se reparte entre sus columnas en proporción a los pesos
+# (net rating = OffRtg - DefRtg: +Δ/2 al ofensivo y -Δ/2 al defensivo).
+VARIABLES = {
+    "Net rating local": ("home", {"off_rating": 1, "def_rating": -1}),
+    "Net rating visitante": ("visitor", {"off_rating": 1, "def_rating": -1}),
+    "OffRtg local": ("home", {"off_rating": 1}),
+    "DefRtg local": ("home", {"def_rating": 1}),
+    "OffRtg visitante": ("visitor", {"off_rating": 1}),
+    "DefRtg visitante": ("visitor", {"def_rating": 1}),
+    "Racha local": ("home", {"streak": 1}),
+    "Racha visitante": ("visitor", {"streak": 1}),
+}
+# Columnas enteras: su eje avanza de a 1
+INTEGER_COLUMNS = {"streak"}
+
+
+def current(variable: str, home: dict, visitor: dict) -> float:
+    """Valor actual de la variable para el cruce."""
+    side, weights = VARIABLES[variable]
+    stats = home if side == "home" else visitor
+    return float(sum(w * stats[col] for col, w in weights.items()))
+
+
+def overlaps(x: str, y: str) -> bool:
+    """True si las dos variables mueven alguna columna en común (no se pueden barrer juntas)."""
+    (x_side, x_weights), (y_side, y_weights) = VARIABLES[x], VARIABLES[y]
+    return x_side == y_side and not x_weights.keys().isdisjoint(y_weights)
+
+
+def axis(variable: str, home: dict, visitor: dict, span: float, n: int) -> np.ndarray:
+    """Hasta `n` valores de la variable en [actual - span, actual + span], simétricos y con el actual."""
+    base = current(variable, home, visitor)
+    if INTEGER_COLUMNS.issuperset(VARIABLES[variable][1]):
+        # Pasos enteros iguales a cada lado del actual: 2·half + 1 <= n valores
+        half = min(int(span), max(n - 1, 0) // 2)
+        step = int(span) // max(half, 1)
+        return base + step * np.arange(-half, half + 1, dtype=float)
+    return base + np.linspace(-span, span, n)
+
+
+@instrument.timed()
+def sweep(model, home: dict, visitor: dict, x: str, y: str, x_values, y_values) -> pd.DataFrame:
+    """
+    P(gana el local) para cada combinación de `x_values` × `y_values` (columnas x,
+    y, p_home; una fila por punto de la grilla), con un solo `predict_proba`.
+    Las variables no pueden compartir columnas (ver `overlaps`).
+    """
+    if overlaps(x, y):
+        raise ValueError(f"{x!r} y {y!r} mueven las mismas columnas")
+    gx, gy = (g.ravel() for g in np.meshgrid(np.asarray(x_values, float), np.asarray(y_values, float)))
+    size = len(gx)
+    sides = {
+        "home": {col: np.full(size, float(home[col])) for col in STAT_COLUMNS},
+        "visitor": {col: np.full(size, float(visitor[col])) for col in STAT_COLUMNS},
+    }
+    for variable, values in ((x, gx), (y, gy)):
+        side, weights = VARIABLES[variable]
+        delta = values - current(variable, home, visitor)
+        norm = sum(w * w for w in weights.values())
+        for col, w in weights.items():
+            sides[side][col] = sides[side][col] + w * delta / norm
+
+    X = build_features(pd.DataFrame(sides["home"]), pd.DataFrame(sides["visitor"]))
+    return pd.DataFrame({"x": gx, "y": gy, "p_home": home_win_proba(model, X)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido de sensibilidad de un cruce")
+    parser.add_argument("home")
+    parser.add_argument("visitor")
+    parser.add_argument("-n", type=int, default=100, help="puntos por eje")
+    parser.add_argument("--span", type=float, default=10.0, help="rango (±) alrededor del valor actual")
+    parser.add_argument("--season")
+    args = parser.parse_args()
+
+    from nba import portable
+    from nba.matchups import MODEL_PATH
+    from nba.registry import load_registry
+
+    registry = load_registry(args.season)
+    home, visitor = registry.record(args.home), registry.record(args.visitor)
+    if home is None or visitor is None:
+        parser.error("equipo desconocido")
+    model = portable.load(MODEL_PATH)
+    x, y = "Net rating local", "Net rating visitante"
+    xs = axis(x, home, visitor, args.span, args.n)
+    ys = axis(y, home, visitor, args.span, args.n)
+
+    sweep(model, home, visitor, x, y, xs[:2], ys[:2])    # calentamiento
+    t0 = time.perf_counter()
+    grid = sweep(model, home, visitor, x, y, xs, ys)
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"{registry.name(args.home)} (local) vs {registry.name(args.visitor)}: "
+          f"{len(grid):,} escenarios en {ms:.1f} ms")
+    print(f"P(local) entre {grid['p_home'].min():.1%} y {grid['p_home'].max():.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""Servicio local de predicción con micro-batching.
+
+Mantiene en memoria el modelo (versión portable) y la tabla de equipos de la
+temporada, y atiende pedidos en el proceso o por HTTP en localhost. Los pedidos
+concurrentes se juntan en micro-lotes: el primer pedido abre una ventana corta
+(`WINDOW_MS`) y todo lo que llega en ese lapso (hasta `MAX_BATCH` partidos) se
+puntúa con UNA llamada a `build_features` + `predict_proba`.
+
+Cada partido se pide por equipos (nombre, código o alias, vía `nba.registry`) o con sus estadísticas:
+
+    {"games": [{"home": "Boston Celtics", "visitor": "NYK"},
+               {"home_stats": {...}, "visitor_stats": {...}}]}
+    -> {"p_home": [0.71, 0.43]}
+
+con las mismas columnas que devuelve `features.team_stats`.
+
+Uso:
+    python -m nba.service serve --port 8765      # POST /predict, GET /health
+    python -m nba.service bench                  # throughput y latencias p50/p99
+    python -m nba.service bench --clients 64 --requests 5000 --window-ms 5
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from nba import matchups, portable, seasons
+from nba.features import TEAM_STAT_COLUMNS, build_features
+from nba.registry import load_registry
+from nba.teams import STATS_TEAM_NAMES
+
+STAT_COLUMNS = list(TEAM_STAT_COLUMNS.values())
+WINDOW_MS = 2.0
+MAX_BATCH = 4096
+DEFAULT_PORT = 8765
+_STOP = object()    # marca de cierre en la cola del `MicroBatcher`
+
+
+class MicroBatcher:
+    """Junta pedidos concurrentes y los puntúa en lote en un hilo propio."""
+
+    def __init__(self, score, window_ms: float = WINDOW_MS, max_batch: int = MAX_BATCH):
+        self.score = score              # (home [n, k], visitor [n, k]) -> p_home [n]
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.queue = queue.Queue()
+        self.stats = {"requests": 0, "games": 0, "batches": 0}
+        self.closed = False
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="nba-microbatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, home: np.ndarray, visitor: np.ndarray) -> Future:
+        if self.closed:
+            raise RuntimeError("el micro-batcher está cerrado")
+        future = Future()
+        self.queue.put((home, visitor, future))
+        return future
+
+    def close(self, timeout: float = None):
+        """Puntúa los pedidos que ya están en la cola y detiene el hilo."""
+        self.closed = True
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _collect(self) -> list:
+        # Bloquea hasta el primer pedido y espera a los demás hasta que se cierra la ventana
+        first = self.queue.get()
+        if first is _STOP:
+            self._stopping = True
+            return []
+        batch = [first]
+        size = len(first[0])
+        deadline = time.perf_counter() + self.window
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._stopping = True
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while not self._stopping:
+            batch = self._collect()
+            if not batch:
+                continue
+            try:
+                p_home = self.score(np.concatenate([b[0] for b in batch]), np.concatenate([b[1] for b in batch]))
+            except Exception as exc:
+                for *_, future in batch:
+                    future.set_exception(exc)
+                continue
+            self.stats["requests"] += len(batch)
+            self.stats["games"] += len(p_home)
+            self.stats["batches"] += 1
+            bounds = np.cumsum([len(b[0]) for b in batch])[:-1]
+            for (*_, future), part in zip(batch, np.split(p_home, bounds)):
+                future.set_result(part)
+        # Lo que llegó después del cierre ya no se puntúa
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item is not _STOP:
+                item[2].set_exception(RuntimeError("el micro-batcher está cerrado"))
+
+
+class PredictionService:
+    """Modelo + tabla de equipos en memoria, con los pedidos agrupados por `MicroBatcher`."""
+
+    def __init__(self, model=None, season=None, window_ms: float = WINDOW_MS, max_batch: int = MAX_BATCH):
+        self.season = season or seasons.current()
+        self.model = model or portable.load(matchups.MODEL_PATH)
+        # Equipos por nombre, código o alias (BOS, BRK, "LA Clippers", ...) -> fila de la tabla
+        self.registry = load_registry(self.season)
+        self.teams = self.registry.stats[STAT_COLUMNS].to_numpy(dtype=float)
+        self.batcher = MicroBatcher(self._score, window_ms, max_batch)
+
+    def _score(self, home: np.ndarray, visitor: np.ndarray) -> np.ndarray:
+        X = build_features(pd.DataFrame(home, columns=STAT_COLUMNS), pd.DataFrame(visitor, columns=STAT_COLUMNS))
+        return matchups.home_win_proba(self.model, X)
+
+    def _side(self, game: dict, side: str) -> np.ndarray:
+        if f"{side}_stats" in game:
+            stats = game[f"{side}_stats"]
+            return np.array([float(stats[col]) for col in STAT_COLUMNS])
+        team = game[side]
+        row = self.registry.row(team)
+        if row is None:
+            raise ValueError(f"equipo desconocido: {team}")
+        return self.teams[row]
+
+    def submit(self, games: list) -> Future:
+        home = np.array([self._side(g, "home") for g in games]).reshape(-1, len(STAT_COLUMNS))
+        visitor = np.array([self._side(g, "visitor") for g in games]).reshape(-1, len(STAT_COLUMNS))
+        return self.batcher.submit(home, visitor)
+
+    def predict(self, games: list) -> list:
+        """P(gana el local) para cada partido pedido (espera a que se puntúe su lote)."""
+        return self.submit(games).result().tolist()
+
+    def close(self):
+        """Detiene el hilo del micro-batcher (los pedidos ya encolados se responden)."""
+        self.batcher.close()
+
+    def health(self) -> dict:
+        return {"season": self.season, "teams": len(self.teams), "window_ms": self.batcher.window * 1000,
+                "max_batch": self.batcher.max_batch, **self.batcher.stats}
+
+
+class Client:
+    """Misma interfaz que `PredictionService`, pero contra el servicio HTTP."""
+
+    def __init__(self, url: str = f"http://127.0.0.1:{DEFAULT_PORT}", timeout: float = 10):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def predict(self, games: list) -> list:
+        body = json.dumps({"games": games}).encode()
+        request = urllib.request.Request(f"{self.url}/predict", body, {"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())["p_home"]
+
+    def health(self) -> dict:
+        with urllib.request.urlopen(f"{self.url}/health", timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+
+def connect(url: str = None, model=None, season=None):
+    """Cliente HTTP si se pasa `url`; si no, el servicio en el mismo proceso."""
+    return Client(url) if url else PredictionService(model, season)
+
+
+# ---------- HTTP ----------
+def make_handler(service: PredictionService):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, payload: dict):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, service.health())
+            else:
+                self._reply(404, {"error": "ruta desconocida"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._reply(404, {"error": "ruta desconocida"})
+                return
+            try:
+                games = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))["games"]
+                self._reply(200, {"p_home": service.predict(games)})
+            except (KeyError, ValueError, TypeError) as exc:
+                self._reply(400, {"error": str(exc)})
+            except Exception as exc:
+                # Cualquier otra falla (del modelo, del lote, ...) vuelve como JSON, no como conexión cortada
+                self._reply(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class LocalServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256    # el default (5) corta conexiones con muchos clientes a la vez
+
+
+def make_server(service: PredictionService, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> LocalServer:
+    return LocalServer((host, port), make_handler(service))
+
+
+# ---------- Carga concurrente ----------
+def load_test(predictor, clients: int, requests: int, seed: int = 0) -> dict:
+    """`clients` hilos mandan `requests` pedidos de un partido; mide throughput y latencias."""
+    teams = list(STATS_TEAM_NAMES)
+    rng = np.random.default_rng(seed)
+    pairs = [tuple(rng.choice(teams, 2, replace=False)) for _ in range(requests)]
+
+    def one(pair):
+        t0 = time.perf_counter()
+        predictor.predict([{"home": pair[0], "visitor": pair[1]}])
+        return time.perf_counter() - t0
+
+    predictor.predict([{"home": teams[0], "visitor": teams[1]}])    # calentamiento
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        latencies = np.array(list(pool.map(one, pairs))) * 1000
+    seconds = time.perf_counter() - t0
+    return {
+        "clients": clients, "requests": requests, "seconds": seconds,
+        "throughput": requests / seconds,
+        "p50_ms": float(np.percentile(latencies, 50)), "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+def bench(clients: int, requests: int, window_ms: float, season=None) -> list:
+    """Carga concurrente en el proceso (sin y con micro-batching) y por HTTP."""
+    model = portable.load(matchups.MODEL_PATH)
+    results = []
+    for name, window, max_batch in (("proceso, sin lotes", 0.0, 1), ("proceso", window_ms, MAX_BATCH)):
+        service = PredictionService(model, season, window, max_batch)
+        try:
+            stats_before = dict(service.batcher.stats)
+            result = load_test(service, clients, requests)
+            batches = service.batcher.stats["batches"] - stats_before["batches"]
+        finally:
+            service.close()
+        results.append({"mode": name, **result, "mean_batch": requests / max(batches, 1)})
+
+    service = PredictionService(model, season, window_ms)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = Client(f"http://127.0.0.1:{server.server_address[1]}")
+        batches = service.batcher.stats["batches"]
+        result = load_test(client, clients, requests)
+        batches = service.batcher.stats["batches"] - batches
+        results.append({"mode": "HTTP localhost", **result, "mean_batch": requests / max(batches, 1)})
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio local de predicción NBA")
+    parser.add_argument("--season")
+    parser.add_argument("--window-ms", type=float, default=WINDOW_MS, help="ventana de micro-batching")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_serve = sub.add_parser("serve", help="atiende POST /predict y GET /health")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_bench = sub.add_parser("bench", help="carga concurrente: throughput y latencias")
+    p_bench.add_argument("--clients", type=int, default=32)
+    p_bench.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        service = PredictionService(season=args.season, window_ms=args.window_ms)
+        server = make_server(service, args.host, args.port)
+        print(f"Sirviendo en http://{args.host}:{server.server_address[1]} (Ctrl+C para cortar)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.close()
+        return
+
+    print(f"{'modo':20} {'clientes':>8} {'pedidos':>8} {'pedidos/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'lote medio':>10}")
+    for r in bench(args.clients, args.requests, args.window_ms, args.season):
+        print(f"{r['mode']:20} {r['clients']:>8} {r['requests']:>8,} {r['throughput']:>10,.0f} "
+              f"{r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['mean_batch']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""Simulación Monte Carlo del resto de la temporada regular, el play-in y los playoffs.
+
+Estado inicial: el W/L de cada equipo según `teams_advanced` (o, con `as_of`,
+según el feature store a esa fecha) y los partidos del calendario que quedan
+por jugar (sin resultado, o desde `as_of` en adelante). La probabilidad de cada
+partido sale del modelo con las estadísticas de ese estado (matriz local ×
+visitante de `nba.matchups`); no se actualizan dentro de la simulación.
+
+Cada lote de N temporadas es puro NumPy:
+- una matriz aleatoria N × partidos decide todos los resultados de una vez,
+- las victorias se acumulan con un scatter-add (`bincount` sobre índices
+  sim × equipo aplanados),
+- el orden de cada conferencia es un `argsort` por victorias (empates al azar),
+- play-in (7-8 y 9-10) y series al mejor de 7 (localía 2-2-1-1-1 para el de
+  mejor récord) se juegan en paralelo para las N simulaciones con índices en
+  la matriz de probabilidades.
+Los lotes se reparten entre procesos; cada uno tiene su propia semilla derivada
+de la semilla pedida, así que el resultado no depende de cuántos procesos haya.
+
+Uso:
+    python -m nba.simulation                          # desde el estado de teams_advanced
+    python -m nba.simulation --as-of 2025-01-15 --sims 200000 --workers 4
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from nba import data, instrument, seasons
+from nba.teams import CONFERENCES, STATS_TEAM_NAMES
+
+DEFAULT_SIMS = 100_000
+BATCH = 5_000
+STAGES = ["Play-in", "Playoffs", "Semis de conferencia", "Final de conferencia", "Final", "Campeón"]
+# Localía del equipo con mejor récord en los 7 partidos de una serie
+SERIES_HOME = np.array([True, True, False, False, True, False, True])
+
+
+# ---------- Estado inicial ----------
+@instrument.timed()
+def prepare(model, season=None, as_of=None) -> dict:
+    """
+    Arreglos de entrada de la simulación: equipos, W/L iniciales, partidos que
+    faltan (índices local/visitante y P(gana el local)) y la matriz P[local, visitante].
+    """
+    from nba.matchups import compute_matrix
+    from nba.registry import load_registry
+
+    season = season or seasons.current()
+    teams = sorted(STATS_TEAM_NAMES)
+    names = [STATS_TEAM_NAMES[t] for t in teams]
+    # Sólo la temporada regular: el play-in y la final de la NBA Cup no suman al récord
+    schedule = data.load_schedule(season)
+    schedule = schedule[schedule["regular"]]
+
+    if as_of is None:
+        stats = load_registry(season).stats.reindex(names)
+        remaining = schedule[schedule["home_pts"].isna()]
+    else:
+        from nba import asof
+
+        cutoff = pd.Timestamp(as_of, tz="UTC")
+        state = asof.load_store(season).lookup_many(teams, [cutoff] * len(teams))
+        stats = state.set_axis(names)
+        remaining = schedule[schedule["date"] >= cutoff]
+
+    matrix = compute_matrix(model, stats)
+    index = {name: i for i, name in enumerate(names)}
+    P = np.full((len(teams), len(teams)), 0.5)
+    P[matrix["home"].map(index), matrix["visitor"].map(index)] = matrix["p_home"]
+
+    code = {t: i for i, t in enumerate(teams)}
+    home = remaining["home_team"].map(code).to_numpy()
+    visitor = remaining["visitor_team"].map(code).to_numpy()
+    return {
+        "season": season,
+        "as_of": None if as_of is None else str(pd.Timestamp(as_of).date()),
+        "teams": teams,
+        "conferences": {conf: np.array([code[t] for t in members]) for conf, members in CONFERENCES.items()},
+        "wins": stats["wins"].to_numpy(dtype=np.int64),
+        "losses": (stats["game_number"] - stats["wins"]).to_numpy(dtype=np.int64),
+        "home": home,
+        "visitor": visitor,
+        "p_game": P[home, visitor],
+        "P": P,
+    }
+
+
+# ---------- Un lote de simulaciones ----------
+def _game(P, home, away, rng):
+    return np.where(rng.random(len(home)) < P[home, away], home, away)
+
+
+def _series(P, key, rows, a, b, rng):
+    """Serie al mejor de 7 entre `a` y `b` (arreglos de equipos, uno por simulación)."""
+    a_first = key[rows, a] >= key[rows, b]
+    hi, lo = np.where(a_first, a, b), np.where(a_first, b, a)
+    # P(gana `hi`) en cada partido: de local P[hi, lo], de visitante 1 - P[lo, hi]
+    p = np.where(SERIES_HOME, P[hi, lo][:, None], 1 - P[lo, hi][:, None])
+    hi_wins = (rng.random(p.shape) < p).sum(axis=1) >= 4
+    return np.where(hi_wins, hi, lo)
+
+
+def _count(teams, n_teams, width=1, column=0):
+    # scatter-add: cuántas veces quedó cada equipo en esa columna
+    return np.bincount((teams * width + column).ravel(), minlength=n_teams * width)
+
+
+def simulate_batch(setup: dict, n: int, seed) -> dict:
+    """Simula `n` temporadas y devuelve los conteos por equipo."""
+    rng = np.random.default_rng(seed)
+    n_teams = len(setup["teams"])
+    rows = np.arange(n)
+
+    # Temporada regular: todos los partidos que faltan, en una matriz n × partidos
+    wins = np.broadcast_to(setup["wins"], (n, n_teams)).copy()
+    if len(setup["home"]):
+        home_win = rng.random((n, len(setup["home"])), dtype=np.float32) < setup["p_game"]
+        winners = np.where(home_win, setup["home"], setup["visitor"])
+        wins += np.bincount((rows[:, None] * n_teams + winners).ravel(), minlength=n * n_teams).reshape(n, n_teams)
+
+    # Ancho de la fila de cada equipo en el bincount: el máximo posible (récord inicial +
+    # partidos que le quedan), igual en todos los lotes para poder sumar los conteos
+    remaining = np.bincount(np.concatenate([setup["home"], setup["visitor"]]), minlength=n_teams)
+    max_wins = int((setup["wins"] + remaining).max()) + 1
+    counts = {
+        "wins": np.bincount((np.arange(n_teams) * max_wins + wins).ravel(), minlength=n_teams * max_wins)
+        .reshape(n_teams, max_wins),
+        "seed": np.zeros((n_teams, 15), dtype=np.int64),
+        "stages": np.zeros((n_teams, len(STAGES)), dtype=np.int64),
+    }
+
+    # Orden por victorias; el ruido en [0, 1) sólo desempata
+    key = wins + rng.random((n, n_teams))
+    P = setup["P"]
+    champions = {}
+    for conf, idx in setup["conferences"].items():
+        order = idx[np.argsort(-key[:, idx], axis=1)]                       # n × 15, de 1º a 15º
+        counts["seed"] += _count(order, n_teams, 15, np.arange(15)).reshape(n_teams, 15)
+        s = order[:, :10]
+
+        # Play-in: 7-8 (el ganador es 7º); el perdedor contra el ganador de 9-10 (el que gana es 8º)
+        seventh = _game(P, s[:, 6], s[:, 7], rng)
+        loser78 = np.where(seventh == s[:, 6], s[:, 7], s[:, 6])
+        eighth = _game(P, loser78, _game(P, s[:, 8], s[:, 9], rng), rng)
+        bracket = np.column_stack([s[:, :6], seventh, eighth])             # sembrados 1..8
+
+        semis = [
+            _series(P, key, rows, bracket[:, 0], bracket[:, 7], rng),
+            _series(P, key, rows, bracket[:, 3], bracket[:, 4], rng),
+            _series(P, key, rows, bracket[:, 2], bracket[:, 5], rng),
+            _series(P, key, rows, bracket[:, 1], bracket[:, 6], rng),
+        ]
+        finals = [_series(P, key, rows, semis[0], semis[1], rng), _series(P, key, rows, semis[3], semis[2], rng)]
+        champions[conf] = _series(P, key, rows, finals[0], finals[1], rng)
+
+        for stage, teams in enumerate([s[:, 6:10], bracket, np.column_stack(semis),
+                                       np.column_stack(finals), champions[conf]]):
+            counts["stages"][:, stage] += _count(teams, n_teams)
+
+    east, west = champions.values()
+    counts["stages"][:, 5] += _count(_series(P, key, rows, east, west, rng), n_teams)
+    return counts
+
+
+def _run_chunk(setup, sizes, seeds) -> dict:
+    total = None
+    for n, seed in zip(sizes, seeds):
+        counts = simulate_batch(setup, n, seed)
+        total = counts if total is None else {k: total[k] + v for k, v in counts.items()}
+    return total
+
+
+@instrument.timed()
+def simulate(setup: dict, n_sims: int = DEFAULT_SIMS, seed: int = 0, workers: int = None, batch: int = BATCH) -> dict:
+    """Corre `n_sims` temporadas en lotes repartidos entre procesos y suma los conteos."""
+    t0 = time.perf_counter()
+    sizes = [batch] * (n_sims // batch) + ([n_sims % batch] if n_sims % batch else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(sizes)))
+    if workers == 1:
+        totals = [_run_chunk(setup, sizes, seeds)]
+    else:
+        chunks = [(sizes[i::workers], seeds[i::workers]) for i in range(workers)]
+        with ProcessPoolExecutor(workers) as pool:
+            totals = list(pool.map(_run_chunk, [setup] * workers, *zip(*chunks)))
+    counts = {k: sum(t[k] for t in totals) for k in totals[0]}
+    counts.update(n_sims=n_sims, seconds=time.perf_counter() - t0, workers=workers)
+    return counts
+
+
+# ---------- Resúmenes ----------
+def standings(setup: dict, counts: dict) -> pd.DataFrame:
+    """Una fila por equipo: récord inicial, victorias esperadas y probabilidad de cada instancia."""
+    n = counts["n_sims"]
+    wins_range = np.arange(counts["wins"].shape[1])
+    conference = {t: conf for conf, members in CONFERENCES.items() for t in members}
+    out = pd.DataFrame({
+        "team": setup["teams"],
+        "name": [STATS_TEAM_NAMES[t] for t in setup["teams"]],
+        "conference": [conference[t] for t in setup["teams"]],
+        "W": setup["wins"],
+        "L": setup["losses"],
+        "remaining": np.bincount(np.concatenate([setup["home"], setup["visitor"]]), minlength=len(setup["teams"])),
+        "mean_wins": counts["wins"] @ wins_range / n,
+        "mean_seed": counts["seed"] @ np.arange(1, 16) / n,
+    })
+    for stage, name in enumerate(STAGES):
+        out[name] = counts["stages"][:, stage] / n
+    out["Top 6"] = counts["seed"][:, :6].sum(axis=1) / n
+    return out.sort_values(["conference", "mean_wins"], ascending=[True, False]).reset_index(drop=True)
+
+
+def seed_distribution(setup: dict, counts: dict) -> pd.DataFrame:
+    """Formato largo (team, seed, p) con la probabilidad de cada posición en la conferencia."""
+    probs = counts["seed"] / counts["n_sims"]
+    return pd.DataFrame({
+        "team": np.repeat(setup["teams"], 15),
+        "seed": np.tile(np.arange(1, 16), len(setup["teams"])),
+        "p": probs.ravel(),
+    })
+
+
+def wins_distribution(setup: dict, counts: dict) -> pd.DataFrame:
+    """Formato largo (team, wins, p), sólo con las victorias que tienen probabilidad > 0."""
+    probs = counts["wins"] / counts["n_sims"]
+    team, wins = np.nonzero(probs)
+    return pd.DataFrame({"team": np.asarray(setup["teams"])[team], "wins": wins, "p": probs[team, wins]})
+
+
+def main():
+    from pathlib import Path
+
+    from nba.matchups import MODEL_PATH
+    from nba.portable import PortableModel, ensure_exported
+
+    parser = argparse.ArgumentParser(description="Monte Carlo de temporada regular, play-in y playoffs")
+    parser.add_argument("--season")
+    parser.add_argument("--as-of", help="simular desde esta fecha (AAAA-MM-DD); por defecto, el estado de teams_advanced")
+    parser.add_argument("--sims", type=int, default=DEFAULT_SIMS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    model = PortableModel.load(ensure_exported(Path(MODEL_PATH)))
+    setup = prepare(model, args.season, args.as_of)
+    counts = simulate(setup, args.sims, args.seed, args.workers)
+    table = standings(setup, counts)
+    print(f"{setup['season']} desde {setup['as_of'] or 'teams_advanced'}: {len(setup['home'])} partidos por jugar, "
+          f"{args.sims:,} simulaciones en {counts['seconds']:.2f} s ({counts['workers']} procesos)")
+    cols = ["team", "W", "L", "mean_wins", "mean_seed", "Playoffs", "Final de conferencia", "Final", "Campeón"]
+    for conf, group in table.groupby("conference"):
+        print(f"\n{conf}")
+        print(group[cols].to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Parche para deserializar los pipelines de sklearn entrenados en notebooks.
+
+Los .pkl referencian `__main__.DropColumns` (la clase se definió en el notebook),
+así que hay que registrarla en `__main__` antes de llamar a `joblib.load`.
+Sólo lo usan las herramientas que necesitan el pipeline original; la app usa
+la exportación portable (`nba.portable`).
+"""
+import sys, types
+
+import joblib
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+
+class DropColumns(BaseEstimator, TransformerMixin):
+    def __init__(self, columns=None, cols=None, to_drop=None, drop_cols=None):
+        # Estos son para el caso de que se instancie “nuevo”
+        self.columns   = list(columns) if columns is not None else None
+        self.cols      = list(cols) if cols is not None else None
+        self.to_drop   = list(to_drop) if to_drop is not None else None
+        self.drop_cols = list(drop_cols) if drop_cols is not None else None
+
+    def _get_cols_to_drop(self):
+        # Cubrimos los nombres comunes que puede haber tenido el objeto entrenado
+        candidate_names = [
+            "columns", "cols", "to_drop", "drop_cols",
+            "columns_", "cols_", "to_drop_", "drop_cols_",
+        ]
+        for name in candidate_names:
+            val = getattr(self, name, None)
+            if val is not None:
+                try:
+                    return list(val)
+                except Exception:
+                    pass
+        return []  # default seguro si no había nada serializado
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        cols = self._get_cols_to_drop()
+        if not isinstance(X, pd.DataFrame):
+            # Si llegara un ndarray, no dropeamos (o convertir a DF con mismas cols si las conocés)
+            return X
+        safe_cols = [c for c in cols if c in X.columns]
+        return X.drop(columns=safe_cols, errors="ignore")
+
+# Asegurar que __main__ tenga DropColumns exactamente con ese nombre
+if '__main__' not in sys.modules:
+    sys.modules['__main__'] = types.ModuleType('__main__')
+setattr(sys.modules['__main__'], 'DropColumns', DropColumns)
+
+def _ensure_dropcolumns(model):
+    from sklearn.pipeline import Pipeline
+    def touch(step):
+        if isinstance(step, DropColumns) and not hasattr(step, "columns"):
+            step.columns = []
+        # manejar ColumnTransformer / Pipelines anidados
+        try:
+            from sklearn.compose import ColumnTransformer
+            if isinstance(step, ColumnTransformer):
+                for _, transformer, _ in step.transformers:
+                    touch(transformer)
+            if isinstance(step, Pipeline):
+                for _, sub in step.steps:
+                    touch(sub)
+        except Exception:
+            pass
+
+    touch(model)
+    return model
+
+
+def load_pipeline(path):
+    """Carga un pipeline .pkl aplicando el parche de DropColumns."""
+    return _ensure_dropcolumns(joblib.load(path))
@@ -0,0 +1,201 @@
+"""Precarga en segundo plano de datasets, stores y modelo al abrir la app.
+
+`app.py` arranca la precarga (`prepare()` y, terminado el primer render,
+`launch()`): las cargas que hacen las páginas (modelo portable, registro de
+equipos, tablas columnar, store de partidos, feature store "as of", matriz de
+cruces, métricas, ...) corren en un pool de hilos mientras el usuario lee la portada. Todas dejan su resultado en los
+cachés compartidos del proceso (`data.CACHE` y los archivos de la partición),
+así que la primera visita a cada página ya los encuentra calientes. Los módulos
+de las tareas se importan dentro del hilo: `app.py` sólo paga la stdlib.
+
+Las tareas van en dos etapas: la primera genera lo que otras leen o escriben
+(export del modelo, store de partidos); la segunda corre todo lo demás en
+paralelo. Cada tarea registra su estado y su duración (`Warmup.rows()`).
+
+Uso:
+    python -m nba.warmup            # precarga la temporada más reciente y muestra los tiempos
+"""
+import argparse
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+WORKERS = 4
+
+
+# Las tareas importan sus módulos recién al correr, en el hilo de la precarga: así
+# `app.py` no carga pandas, NumPy ni pyarrow en el hilo principal antes de renderizar
+def _call(path: str):
+    """Tarea que llama a `módulo.función(season)`."""
+    module, func = path.rsplit(".", 1)
+
+    def task(season):
+        return getattr(importlib.import_module(module), func)(season)
+    return task
+
+
+def _model(season):
+    from nba import matchups, portable
+
+    return portable.load(matchups.MODEL_PATH)
+
+
+def _team_data(season):
+    from nba import data
+
+    return data.load_team_data(data.EXPLORATION_COLUMNS, season=season)
+
+
+def _games_data(season):
+    from nba import data
+
+    return data.load_games_data(season=season)
+
+
+def _df(season):
+    from nba import data
+
+    return data.load_df(season=season)
+
+
+def _matrix(season):
+    from nba import matchups
+
+    return matchups.load_matrix(lambda: _model(season), season)
+
+
+def _rollups(season):
+    from nba import rollups
+
+    # En serie: si el cubo está viejo, lo regenera una sola vez (con sus atípicos)
+    return rollups.load_cube(season), rollups.load_outliers(season)
+
+
+def _importances(season):
+    from nba import data
+
+    return [data.load_feature_importance(p) for p in data.FEATURE_IMPORTANCE_FILES.values()]
+
+
+# Etapas de (tarea, función de la temporada), en el orden en que se ejecutan
+STAGES = [
+    [
+        ("Modelo portable", _model),
+        ("Store de partidos", _call("nba.gamestore.load_store")),
+        ("Registro de equipos", _call("nba.registry.load_registry")),
+    ],
+    [
+        ("Altair", lambda season: importlib.import_module("altair")),
+        ("Calendario", _call("nba.data.load_schedule")),
+        ("Partidos por equipo", _team_data),
+        ("Cubo de agregados", _rollups),
+        ("Partidos local/visitante", _games_data),
+        ("Dataset del modelo", _df),
+        ("Matriz de cruces", _matrix),
+        ("Feature store as of", _call("nba.asof.load_store")),
+        ("Métricas del held-out", _call("nba.evaluation.evaluate")),
+        ("Importancias", _importances),
+    ],
+]
+
+
+class Warmup:
+    """Corre las etapas en un hilo propio; cada tarea anota estado y milisegundos."""
+
+    def __init__(self, season=None, stages=STAGES, workers: int = WORKERS):
+        self.season = season
+        self.stages = stages
+        self.workers = workers
+        self.tasks = {name: {"estado": "pendiente", "ms": None, "error": None}
+                      for stage in stages for name, _ in stage}
+        self.started = None
+        self.seconds = None
+        self._thread = threading.Thread(target=self._run, name="nba-warmup", daemon=True)
+
+    def launch(self) -> "Warmup":
+        """Arranca el hilo (una sola vez)."""
+        with _LOCK:
+            if self.started is None:
+                self.started = time.perf_counter()
+                self._thread.start()
+        return self
+
+    def _task(self, name, fn):
+        task = self.tasks[name]
+        task["estado"] = "cargando"
+        t0 = time.perf_counter()
+        try:
+            fn(self.season)
+            task["estado"] = "lista"
+        except Exception as exc:
+            # Un archivo que falta no frena el resto: la página mostrará su propio aviso
+            task["estado"] = "error"
+            task["error"] = f"{type(exc).__name__}: {exc}"
+        task["ms"] = (time.perf_counter() - t0) * 1000
+
+    def _run(self):
+        if self.season is None:
+            from nba import seasons
+
+            self.season = seasons.current()
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="nba-warmup") as pool:
+            for stage in self.stages:
+                wait([pool.submit(self._task, name, fn) for name, fn in stage])
+        self.seconds = time.perf_counter() - self.started
+
+    @property
+    def done(self) -> bool:
+        return self.seconds is not None
+
+    def progress(self) -> float:
+        finished = sum(t["estado"] in ("lista", "error") for t in self.tasks.values())
+        return finished / len(self.tasks)
+
+    def join(self, timeout=None) -> "Warmup":
+        self.launch()._thread.join(timeout)
+        return self
+
+    def rows(self) -> list:
+        """Estado de cada tarea como lista de dicts (sin pandas: se llama desde app.py)."""
+        return [{"tarea": name, **task} for name, task in self.tasks.items()]
+
+
+_RUNS = {}
+_LOCK = threading.Lock()
+
+
+def prepare(season=None, workers: int = WORKERS) -> Warmup:
+    """
+    Precarga de la temporada (una sola por proceso), sin arrancar. Sin temporada,
+    el hilo resuelve la actual: el hilo principal no importa nada más que stdlib.
+    """
+    with _LOCK:
+        if season not in _RUNS:
+            _RUNS[season] = Warmup(season, workers=workers)
+        return _RUNS[season]
+
+
+def start(season=None, workers: int = WORKERS) -> Warmup:
+    """Arranca la precarga de la temporada (una sola vez por proceso)."""
+    return prepare(season, workers).launch()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precarga de datasets y modelo")
+    parser.add_argument("--season")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args()
+
+    run = start(args.season, args.workers).join()
+    import pandas as pd
+
+    table = pd.DataFrame(run.rows())
+    print(table[["tarea", "estado", "ms"]].to_string(index=False, float_format="{:.0f}".format))
+    for _, row in table[table["error"].notna()].iterrows():
+        print(f"{row['tarea']}: {row['error']}")
+    print(f"Total: {run.seconds * 1000:.0f} ms en paralelo ({table['ms'].sum():.0f} ms sumando las tareas)")
+
+
+if __name__ == "__main__":
+    main()
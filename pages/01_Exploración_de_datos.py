@@ -2,52 +2,16 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 
-st.title("📊 Exploración de Datos NBA 2024-25")
+from nba import charts, data, instrument, rollups, seasons
+from nba.registry import load_registry
 
-# ================================
-# 🔹 1. Dataset principal (por equipo)
-# ================================
-@st.cache_data
-def load_team_data():
-    df = pd.read_csv("data/graph/games_clean.csv")
-    df['date'] = pd.to_datetime(df['date'])
-    return df
-
-df = load_team_data()
-
-# --- Diccionario nombres de equipos ---
-team_names = {
-    "ATL": "Atlanta Hawks",
-    "BOS": "Boston Celtics",
-    "BKN": "Brooklyn Nets",
-    "CHA": "Charlotte Hornets",
-    "CHI": "Chicago Bulls",
-    "CLE": "Cleveland Cavaliers",
-    "DAL": "Dallas Mavericks",
-    "DEN": "Denver Nuggets",
-    "DET": "Detroit Pistons",
-    "GSW": "Golden State Warriors",
-    "HOU": "Houston Rockets",
-    "IND": "Indiana Pacers",
-    "LAC": "Los Angeles Clippers",
-    "LAL": "Los Angeles Lakers",
-    "MEM": "Memphis Grizzlies",
-    "MIA": "Miami Heat",
-    "MIL": "Milwaukee Bucks",
-    "MIN": "Minnesota Timberwolves",
-    "NOP": "New Orleans Pelicans",
-    "NYK": "New York Knicks",
-    "OKC": "Oklahoma City Thunder",
-    "ORL": "Orlando Magic",
-    "PHI": "Philadelphia 76ers",
-    "PHX": "Phoenix Suns",
-    "POR": "Portland Trail Blazers",
-    "SAC": "Sacramento Kings",
-    "SAS": "San Antonio Spurs",
-    "TOR": "Toronto Raptors",
-    "UTA": "Utah Jazz",
-    "WAS": "Washington Wizards"
-}
+# --- Temporada (sólo se lee su partición) ---
+season = st.sidebar.selectbox("🗓️ Temporada", seasons.available(), key="season")
+
+st.title(f"📊 Exploración de Datos NBA {season}")
+
+# --- Códigos y nombres de equipos (registro compartido con el resto de la app) ---
+team_names = load_registry(season).names_by_code
 
 # --- Selección global de equipos ---
 st.sidebar.markdown("### 🏀 Selección de equipos")
@@ -65,6 +29,21 @@ else:
         code for code, name in team_names.items() if name in selected_team_names
     ]
 
+# ================================
+# 🔹 1. Dataset principal (por equipo)
+# ================================
+# Columnas que usan los gráficos (se lee sólo eso del archivo columnar)
+TEAM_COLUMNS = data.EXPLORATION_COLUMNS
+
+# Fechas y códigos de equipo ya vienen tipados; el filtro de equipos se aplica al leer
+team_filter = selected_teams if selected_team_names else None
+df = data.load_team_data(TEAM_COLUMNS, season=season, teams=team_filter)
+
+# Agregados por equipo precalculados al ingerir los datos: los resúmenes y gráficos
+# de abajo sólo filtran filas del cubo (no recorren las tablas por partido)
+cube = rollups.load_cube(season)
+cube_outliers = rollups.load_outliers(season)
+
 # --- Traducción de métricas ---
 metric_labels = {
     "W_percent": "% Victorias",
@@ -76,29 +55,23 @@ metric_labels = {
     "loss_game": "Derrotas Totales"
 }
 
-# --- Resumen por equipo ---
-team_summary = (
-    df.groupby('team')
-    .agg({
-        'oRtg': 'mean',
-        'dRtg': 'mean',
-        'net_rating': 'mean',
-        'tsPercent': 'mean',
-        'W_percent': 'mean',
-        'win_game': 'sum',
-        'loss_game': 'sum'
-    })
-    .reset_index()
-)
-team_summary['team_name'] = team_summary['team'].map(team_names)
-team_summary = team_summary[team_summary['team'].isin(selected_teams)]
+# --- Resumen por equipo (media de cada métrica, suma de victorias/derrotas) ---
+summary_stats = {
+    'oRtg': 'mean',
+    'dRtg': 'mean',
+    'net_rating': 'mean',
+    'tsPercent': 'mean',
+    'W_percent': 'mean',
+    'win_game': 'sum',
+    'loss_game': 'sum'
+}
+team_summary_long = rollups.slice_cube(cube, list(summary_stats), teams=selected_teams)
+team_summary_long = team_summary_long.assign(
+    team_name=team_summary_long['team'].map(team_names),
+    value=team_summary_long['sum'].where(team_summary_long['metric'].map(summary_stats) == 'sum', team_summary_long['mean']),
+)[['team', 'team_name', 'metric', 'value']]
 
-team_summary_long = team_summary.melt(
-    id_vars=['team', 'team_name'],
-    value_vars=['oRtg', 'dRtg', 'net_rating', 'tsPercent', 'W_percent', 'win_game', 'loss_game'],
-    var_name='metric',
-    value_name='value'
-)
+team_summary = team_summary_long.pivot(index=['team', 'team_name'], columns='metric', values='value').reset_index()
 
 # --- Selector de métrica ---
 metric_es = st.selectbox(
@@ -110,17 +83,17 @@ metric = {v: k for k, v in metric_labels.items()}[metric_es]
 
 st.markdown(f"### 📊 Evolución de **{metric_labels[metric]}**")
 
-# --- Filtrar dataset según equipos ---
-df_filtered = df[df['team'].isin(selected_teams)]
+# --- Gráfico principal (df ya viene filtrado por equipos) ---
+# Al navegador van sólo las columnas codificadas y a lo sumo charts.MAX_POINTS puntos por equipo
+tooltip_metrics = ['W_percent', 'net_rating', 'oRtg', 'dRtg', 'tsPercent']
+df_chart = charts.chart_data(df, x='game_number', y=metric, series='team', columns=tooltip_metrics)
 
-# --- Gráfico principal ---
 line_chart = (
-    alt.Chart(df_filtered)
-    .transform_calculate(metric_value=f"datum['{metric}']")
+    alt.Chart(df_chart)
     .mark_line(point=True, interpolate='monotone', strokeWidth=2)
     .encode(
         x=alt.X('game_number:Q', title='Número de Partido'),
-        y=alt.Y('metric_value:Q', title=metric_labels[metric]),
+        y=alt.Y(f'{metric}:Q', title=metric_labels[metric]),
         color=alt.Color(
             'team:N',
             legend=alt.Legend(title='Equipo'),
@@ -139,7 +112,11 @@ line_chart = (
     .properties(width=700, height=400, title="Evolución de la Métrica por Partido")
 )
 
-st.altair_chart(line_chart, use_container_width=True)
+# Se mide el armado del spec Vega-Lite y su envío al navegador (con la instrumentación prendida)
+with instrument.span("exploracion.grafico.evolucion"):
+    st.altair_chart(line_chart, use_container_width=True)
+if len(df_chart) < len(df):
+    st.caption(f"Se muestran {len(df_chart):,} de {len(df):,} puntos (submuestreo LTTB por equipo).")
 
 # ================================
 # 🔹 2. Nuevos gráficos con el CSV de partidos
@@ -147,20 +124,6 @@ st.altair_chart(line_chart, use_container_width=True)
 st.markdown("---")
 st.header("📈 Análisis por Partido")
 
-@st.cache_data
-def load_games_data():
-    df = pd.read_csv("data/processed/games_final_csv.csv")
-    df['date'] = pd.to_datetime(df['date'])
-    return df
-
-df_games = load_games_data()
-
-# --- Filtrar equipos ---
-df_games = df_games[
-    (df_games['home_team'].isin(selected_teams)) |
-    (df_games['visitor_team'].isin(selected_teams))
-]
-
 # --- Diccionario para nombres de métricas ---
 metricas_map = {
     "offensive_rating": "Rating Ofensivo",
@@ -175,17 +138,16 @@ metricas_map = {
 metrica_es = st.selectbox("📊 Elegí la métrica a comparar:", list(metricas_map.values()), index=0)
 metrica = {v: k for k, v in metricas_map.items()}[metrica_es]
 
-# --- Datos por condición ---
-home_data = df_games.groupby('home_team')[f'home_{metrica}'].mean().reset_index()
+# --- Datos por condición (promedio como local y como visitante, del cubo) ---
+home_data = rollups.slice_cube(cube, metrica, side='home', teams=selected_teams)[['team', 'mean']]
 home_data.columns = ['team', 'home_value']
 
-visitor_data = df_games.groupby('visitor_team')[f'visitor_{metrica}'].mean().reset_index()
+visitor_data = rollups.slice_cube(cube, metrica, side='away', teams=selected_teams)[['team', 'mean']]
 visitor_data.columns = ['team', 'visitor_value']
 
 # Merge para incluir todos los equipos seleccionados
 home_away = pd.merge(home_data, visitor_data, on='team', how='outer')
 home_away['team_name'] = home_away['team'].map(team_names)
-home_away = home_away[home_away['team'].isin(selected_teams)]
 
 home_away_long = home_away.melt(
     id_vars=['team', 'team_name'],
@@ -219,44 +181,62 @@ chart_home_away = (
     )
 )
 
-st.altair_chart(chart_home_away, use_container_width=True)
+with instrument.span("exploracion.grafico.local_visitante"):
+    st.altair_chart(chart_home_away, use_container_width=True)
 
 # --- Distribución de Tiro Verdadero ---
 st.subheader("🎯 Distribución de Tiro Verdadero (TS%) por Equipo")
 
-df_long_ts = pd.concat([
-    df_games[['home_team', 'home_ts_percent']].rename(columns={'home_team': 'team', 'home_ts_percent': 'ts'}),
-    df_games[['visitor_team', 'visitor_ts_percent']].rename(columns={'visitor_team': 'team', 'visitor_ts_percent': 'ts'})
-])
-df_long_ts = df_long_ts[df_long_ts['team'].isin(selected_teams)]
-df_long_ts['team_name'] = df_long_ts['team'].map(team_names)
-
-chart_ts = (
-    alt.Chart(df_long_ts)
-    .mark_boxplot(extent='min-max')
-    .encode(
-        x=alt.X('team_name:N', sort='-y', title='Equipo'),
-        y=alt.Y('ts:Q', title='% Tiro Verdadero', scale=alt.Scale(domain=[0.4, 0.7])),
-        color=alt.Color('team_name:N', legend=None),
-        tooltip=[
-            alt.Tooltip('team_name:N', title='Equipo'),
-            alt.Tooltip('ts:Q', title='% Tiro Verdadero', format='.2f')
-        ]
-    )
-    .properties(width=900, height=500, title='Distribución del % de Tiro Verdadero')
+# Cuantiles, bigotes (1,5 × IQR) y atípicos ya calculados al ingerir (local +
+# visitante): el boxplot se dibuja con capas y los atípicos viajan como puntos
+ts_box = rollups.slice_cube(cube, 'ts_percent', teams=selected_teams).copy()
+ts_box['team_name'] = ts_box['team'].map(team_names)
+ts_out = rollups.slice_outliers(cube_outliers, 'ts_percent', teams=selected_teams).copy()
+ts_out['team_name'] = ts_out['team'].map(team_names)
+
+# Orden explícito por mediana: la capa de atípicos no tiene la columna `median`
+ts_x = alt.X('team_name:N', sort=list(ts_box.sort_values('median', ascending=False)['team_name']), title='Equipo')
+ts_base = alt.Chart(ts_box).encode(
+    x=ts_x,
+    color=alt.Color('team_name:N', legend=None),
+    tooltip=[
+        alt.Tooltip('team_name:N', title='Equipo'),
+        alt.Tooltip('lower:Q', title='Bigote inferior', format='.3f'),
+        alt.Tooltip('q1:Q', title='Q1', format='.3f'),
+        alt.Tooltip('median:Q', title='Mediana', format='.3f'),
+        alt.Tooltip('q3:Q', title='Q3', format='.3f'),
+        alt.Tooltip('upper:Q', title='Bigote superior', format='.3f'),
+        alt.Tooltip('min:Q', title='Mínimo', format='.3f'),
+        alt.Tooltip('max:Q', title='Máximo', format='.3f')
+    ]
 )
+ts_values = ts_out['value'].tolist()
+ts_scale = alt.Scale(domain=[min([0.4, *ts_values]), max([0.7, *ts_values])])
+ts_points = alt.Chart(ts_out).mark_point(size=30).encode(
+    x=ts_x,
+    y=alt.Y('value:Q', scale=ts_scale),
+    color=alt.Color('team_name:N', legend=None),
+    tooltip=[alt.Tooltip('team_name:N', title='Equipo'), alt.Tooltip('value:Q', title='TS% (atípico)', format='.3f')]
+)
+chart_ts = (
+    ts_base.mark_rule().encode(y=alt.Y('lower:Q', title='% Tiro Verdadero', scale=ts_scale), y2='upper:Q')
+    + ts_base.mark_bar(size=14).encode(y=alt.Y('q1:Q', scale=ts_scale), y2='q3:Q')
+    + ts_base.mark_tick(color='white', size=14).encode(y=alt.Y('median:Q', scale=ts_scale))
+    + ts_points
+).properties(width=900, height=500, title='Distribución del % de Tiro Verdadero')
 
-st.altair_chart(chart_ts, use_container_width=True)
+with instrument.span("exploracion.grafico.ts_percent"):
+    st.altair_chart(chart_ts, use_container_width=True)
 
 # --- Correlación OffRtg vs DefRtg ---
 st.subheader("⚖️ Correlación entre Rating Ofensivo y Defensivo")
 
 team_eff = (
-    df_games.groupby('home_team')
-    .agg({'home_offensive_rating': 'mean', 'home_defensive_rating': 'mean'})
+    rollups.pivot(cube, ['offensive_rating', 'defensive_rating'], side='home', teams=selected_teams)
+    .add_prefix('home_')
+    .rename_axis('home_team')
     .reset_index()
 )
-team_eff = team_eff[team_eff['home_team'].isin(selected_teams)]
 team_eff['team_name'] = team_eff['home_team'].map(team_names)
 
 mean_off = team_eff['home_offensive_rating'].mean()
@@ -289,7 +269,8 @@ mean_lines = (
     .encode(y='y:Q')
 )
 
-st.altair_chart(scatter + text + mean_lines, use_container_width=True)
+with instrument.span("exploracion.grafico.ofensiva_defensiva"):
+    st.altair_chart(scatter + text + mean_lines, use_container_width=True)
 
 st.markdown("---")
-st.caption("Visualización interactiva creada con Altair y Streamlit • Datos NBA 2024-25")
+st.caption(f"Visualización interactiva creada con Altair y Streamlit • Datos NBA {season}")
@@ -1,21 +1,20 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from pathlib import Path
+
+from nba import backtest, data, evaluation, importance, seasons
 
 st.title("! Exploración nuestros datos !")
 
-DATA_PATH = Path("data/graph/df_final.csv")
+season = st.sidebar.selectbox("🗓️ Temporada", seasons.available(), key="season")
 
-@st.cache_data
-def load_df():
-    if not DATA_PATH.exists():
-        st.error(f"No se encontró el dataset: {DATA_PATH}")
-        st.stop()
-    return pd.read_csv(DATA_PATH)
+try:
+    df = data.load_df(season=season)
+except FileNotFoundError:
+    st.error(f"No se encontró el dataset: {seasons.path(season, 'df_final')}")
+    st.stop()
 
-df = load_df()
-st.caption(f"{len(df):,} filas × {len(df.columns)} columnas")
+st.caption(f"Temporada {season}: {len(df):,} filas × {len(df.columns)} columnas")
 st.dataframe(df.head(20), use_container_width=True)
 
 # ---------- DESCRIPCIONES DE COLUMNAS ----------
@@ -92,151 +91,196 @@ st.info("""
 Resultado del equipo Local en el partido.
 """)
 
-# Datos de matrices de confusión para cada modelo
-model_data = {
-    "Logistic Regression": {
-        "data": pd.DataFrame({
-            "Real": ["Derrota", "Derrota", "Victoria", "Victoria"],
-            "Predicción": ["Derrota", "Victoria", "Derrota", "Victoria"],
-            "Cantidad": [79, 34, 42, 93]
-        }),
-        "metrics": {
-            "Accuracy": "69.3 %",
-            "ROC-AUC": "74.0 %",
-            "F1 (Test)": "71.0 %"
-        }
-    },
-    "XGBoost": {
-        "data": pd.DataFrame({
-            "Real": ["Derrota", "Derrota", "Victoria", "Victoria"],
-            "Predicción": ["Derrota", "Victoria", "Derrota", "Victoria"],
-            "Cantidad": [45, 68, 12, 123]
-        }),
-        "metrics": {
-            "Accuracy": "67.7 %",
-            "ROC-AUC": "74.7 %",
-            "F1 (Test)": "75.5 %"
-        }
-    },
-    "LightGBM": {
-        "data": pd.DataFrame({
-            "Real": ["Derrota", "Derrota", "Victoria", "Victoria"],
-            "Predicción": ["Derrota", "Victoria", "Derrota", "Victoria"],
-            "Cantidad": [30, 83, 8, 127]
-        }),
-        "metrics": {
-            "Accuracy": "63.3 %",
-            "ROC-AUC": "72.7 %",
-            "F1 (Test)": "73.6 %"
-        }
-    }
-}
+# Matrices de confusión y métricas calculadas sobre el held-out (cacheadas por hash de modelo y datos)
+model_results = evaluation.evaluate(season)
 
 # Crear tabs para cada modelo
-tab1, tab2, tab3 = st.tabs(["Logistic Regression", "XGBoost", "LightGBM"])
+tabs = st.tabs(list(evaluation.MODELS))
 
 # Mapeo de archivos de feature importance
-feature_importance_files = {
-    "Logistic Regression": "data/models_feature_importance/log_reg_feature_importances.csv",
-    "XGBoost": "data/models_feature_importance/xgboost_feature_importances.csv",
-    "LightGBM": "data/models_feature_importance/lgbm_feature_importances.csv"
-}
-
-@st.cache_data
-def load_feature_importance(filepath):
-    """Carga el CSV de feature importance."""
-    if Path(filepath).exists():
-        return pd.read_csv(filepath)
-    return None
+feature_importance_files = data.FEATURE_IMPORTANCE_FILES
 
-def show_model_performance(tab, model_name, model_info):
+def show_model_performance(tab, model_name, result):
     with tab:
-        col1, col2 = st.columns([1, 1.2])
-        
-        with col1:
-            # Crear gráfico Altair
-            chart = (
-                alt.Chart(model_info["data"])
-                .mark_rect()
-                .encode(
-                    x=alt.X("Predicción:N", title="Predicción del modelo"),
-                    y=alt.Y("Real:N", title="Resultado real"),
-                    color=alt.Color("Cantidad:Q", scale=alt.Scale(scheme="blues")),
-                    tooltip=["Real", "Predicción", "Cantidad"]
-                )
-                .properties(
-                    width=400,
-                    height=400,
-                    title=f"Matriz de Confusión – {model_name}"
-                )
+        if result is None:
+            st.info(f"No está el artefacto de {model_name} ({evaluation.MODELS[model_name]['path']}): no se puede evaluar.")
+        else:
+            show_metrics(model_name, result)
+        show_feature_importance(model_name)
+
+
+def show_metrics(model_name, result):
+    confusion = evaluation.confusion_frame(result)
+    col1, col2 = st.columns([1, 1.2])
+    
+    with col1:
+        # Crear gráfico Altair
+        chart = (
+            alt.Chart(confusion)
+            .mark_rect()
+            .encode(
+                x=alt.X("Predicción:N", title="Predicción del modelo"),
+                y=alt.Y("Real:N", title="Resultado real"),
+                color=alt.Color("Cantidad:Q", scale=alt.Scale(scheme="blues")),
+                tooltip=["Real", "Predicción", "Cantidad"]
             )
+            .properties(
+                width=400,
+                height=400,
+                title=f"Matriz de Confusión – {model_name}"
+            )
+        )
 
-            # Agregar texto en las celdas
-            text = (
-                alt.Chart(model_info["data"])
-                .mark_text(baseline="middle", fontSize=16)
+        # Agregar texto en las celdas
+        text = (
+            alt.Chart(confusion)
+            .mark_text(baseline="middle", fontSize=16)
+            .encode(
+                x="Predicción:N",
+                y="Real:N",
+                text="Cantidad:Q"
+            )
+        )
+        
+        st.altair_chart(chart + text, use_container_width=True)
+    
+    with col2:
+        metrics = {
+            "Accuracy": f"{result['accuracy']:.1%}",
+            "ROC-AUC": f"{result['roc_auc']:.1%}",
+            "F1 (Test)": f"{result['f1']:.1%}",
+        }
+        st.metric("Accuracy", metrics["Accuracy"])
+        st.metric("ROC-AUC", metrics["ROC-AUC"])
+        st.metric("F1 (Test)", metrics["F1 (Test)"])
+        st.markdown(f"""
+        **Interpretación rápida:**
+        - La diagonal principal son aciertos (predicciones correctas).  
+        - Los valores fuera de la diagonal son errores.  
+        - El modelo acierta el **{metrics["Accuracy"]}** de los partidos, con un **F1 ≈ {metrics["F1 (Test)"]}**.  
+        """)
+        st.caption(f"Held-out: {result['n']} partidos · log-loss {result['log_loss']:.3f} · Brier {result['brier']:.3f}")
+
+
+def show_feature_importance(model_name):
+    # Mostrar Feature Importance debajo
+    st.markdown("---")
+    st.subheader(f"🎯 Feature Importance – {model_name}")
+    
+    fi_filepath = feature_importance_files.get(model_name)
+    if fi_filepath:
+        fi_df = data.load_feature_importance(fi_filepath)
+        if fi_df is not None:
+            # Mostrar las top 15 features ordenadas por valor absoluto
+            fi_df_sorted = fi_df.copy()
+            fi_df_sorted['abs_importance'] = fi_df_sorted.iloc[:, 1].abs()
+            fi_df_sorted = fi_df_sorted.sort_values('abs_importance', ascending=False).head(15)
+            fi_df_sorted = fi_df_sorted.drop('abs_importance', axis=1)
+            
+            # Crear gráfico de barras
+            chart_fi = (
+                alt.Chart(fi_df_sorted)
+                .mark_bar()
                 .encode(
-                    x="Predicción:N",
-                    y="Real:N",
-                    text="Cantidad:Q"
+                    x=alt.X(fi_df_sorted.columns[1], title="Importancia"),
+                    y=alt.Y(fi_df_sorted.columns[0], title="Feature", sort='-x'),
+                    color=alt.condition(
+                        alt.datum[fi_df_sorted.columns[1]] > 0,
+                        alt.value("#1f77b4"),  # azul para positivo
+                        alt.value("#ff7f0e")   # naranja para negativo
+                    )
                 )
+                .properties(height=400, width=600)
             )
             
-            st.altair_chart(chart + text, use_container_width=True)
-        
-        with col2:
-            metrics = model_info["metrics"]
-            st.metric("Accuracy", metrics["Accuracy"])
-            st.metric("ROC-AUC", metrics["ROC-AUC"])
-            st.metric("F1 (Test)", metrics["F1 (Test)"])
-            st.markdown(f"""
-            **Interpretación rápida:**
-            - La diagonal principal son aciertos (predicciones correctas).  
-            - Los valores fuera de la diagonal son errores.  
-            - El modelo acierta el **{metrics["Accuracy"]}** de los partidos, con un **F1 ≈ {metrics["F1 (Test)"]}**.  
-            """)
-        
-        # Mostrar Feature Importance debajo
-        st.markdown("---")
-        st.subheader(f"🎯 Feature Importance – {model_name}")
-        
-        fi_filepath = feature_importance_files.get(model_name)
-        if fi_filepath:
-            fi_df = load_feature_importance(fi_filepath)
-            if fi_df is not None:
-                # Mostrar las top 15 features ordenadas por valor absoluto
-                fi_df_sorted = fi_df.copy()
-                fi_df_sorted['abs_importance'] = fi_df_sorted.iloc[:, 1].abs()
-                fi_df_sorted = fi_df_sorted.sort_values('abs_importance', ascending=False).head(15)
-                fi_df_sorted = fi_df_sorted.drop('abs_importance', axis=1)
-                
-                # Crear gráfico de barras
-                chart_fi = (
-                    alt.Chart(fi_df_sorted)
+            st.altair_chart(chart_fi, use_container_width=True)
+            
+            # Mostrar tabla completa en expander
+            with st.expander("📋 Ver todas las features"):
+                st.dataframe(fi_df, use_container_width=True)
+
+            # Importancia por permutación (caída de ROC-AUC en el held-out), si ya se generó
+            perm_df = data.load_feature_importance(importance.permutation_path(model_name))
+            if perm_df is not None:
+                st.markdown("**Importancia por permutación** (caída de ROC-AUC al desordenar cada columna)")
+                perm_df = perm_df.head(15).assign(low=lambda d: d["importance"] - d["std"], high=lambda d: d["importance"] + d["std"])
+                bars = (
+                    alt.Chart(perm_df)
                     .mark_bar()
                     .encode(
-                        x=alt.X(fi_df_sorted.columns[1], title="Importancia"),
-                        y=alt.Y(fi_df_sorted.columns[0], title="Feature", sort='-x'),
-                        color=alt.condition(
-                            alt.datum[fi_df_sorted.columns[1]] > 0,
-                            alt.value("#1f77b4"),  # azul para positivo
-                            alt.value("#ff7f0e")   # naranja para negativo
-                        )
+                        x=alt.X("importance:Q", title="Caída de ROC-AUC"),
+                        y=alt.Y("feature:N", title="Feature", sort="-x"),
+                        tooltip=["feature", alt.Tooltip("importance:Q", format=".4f"), alt.Tooltip("std:Q", format=".4f")],
                     )
-                    .properties(height=400, width=600)
                 )
-                
-                st.altair_chart(chart_fi, use_container_width=True)
-                
-                # Mostrar tabla completa en expander
-                with st.expander("📋 Ver todas las features"):
-                    st.dataframe(fi_df, use_container_width=True)
-            else:
-                st.warning(f"No se encontró el archivo de feature importance para {model_name}")
+                whiskers = alt.Chart(perm_df).mark_rule(color="black").encode(x="low:Q", x2="high:Q", y=alt.Y("feature:N", sort="-x"))
+                st.altair_chart((bars + whiskers).properties(height=400), use_container_width=True)
         else:
-            st.warning(f"Archivo no configurado para {model_name}")
+            st.warning(f"No se encontró el archivo de feature importance para {model_name}")
+    else:
+        st.warning(f"Archivo no configurado para {model_name}")
 
 # Mostrar el rendimiento de cada modelo en su respectiva tab
-show_model_performance(tab1, "Logistic Regression", model_data["Logistic Regression"])
-show_model_performance(tab2, "XGBoost", model_data["XGBoost"])
-show_model_performance(tab3, "LightGBM", model_data["LightGBM"])
+for tab, model_name in zip(tabs, evaluation.MODELS):
+    show_model_performance(tab, model_name, model_results.get(model_name))
+
+
+# ---------- BACKTEST WALK-FORWARD ----------
+st.markdown("---")
+st.subheader("🔁 Backtest walk-forward")
+
+report = backtest.load_report(season)
+if report is None:
+    st.info("Todavía no hay backtest para esta temporada: correr `python -m nba.backtest`.")
+else:
+    st.markdown(f"""
+    La temporada se recorre en orden cronológico, en ventanas de **{report['window_days']} días**:
+    cada ventana se predice con un modelo entrenado sólo con los partidos anteriores.
+    - **refit**: se reentrena desde cero; **warm**: se actualiza desde los coeficientes previos.
+    - **static**: el modelo guardado, que ya vio la temporada (referencia optimista).
+    """)
+
+    overall = pd.DataFrame([
+        {
+            "Configuración": config["name"],
+            "Partidos": config["overall"]["n"],
+            "Accuracy": f"{config['overall']['accuracy']:.1%}",
+            "Log-loss": round(config["overall"]["log_loss"], 4),
+            "Brier": round(config["overall"]["brier"], 4),
+        }
+        for config in report["configs"]
+    ])
+    st.dataframe(overall, hide_index=True, use_container_width=True)
+
+    windows = backtest.windows_frame(report)
+    chart_windows = (
+        alt.Chart(windows)
+        .mark_line(point=True)
+        .encode(
+            x=alt.X("start:T", title="Inicio de la ventana"),
+            y=alt.Y("accuracy:Q", title="Accuracy", axis=alt.Axis(format="%")),
+            color=alt.Color("config:N", title="Configuración"),
+            tooltip=["config:N", "start:T", "end:T", "n:Q", "n_train:Q",
+                     alt.Tooltip("accuracy:Q", format=".1%"), alt.Tooltip("log_loss:Q", format=".3f")],
+        )
+        .properties(height=320, title="Accuracy por ventana")
+    )
+    st.altair_chart(chart_windows, use_container_width=True)
+
+    calibration = pd.DataFrame([
+        {"config": config["name"], **row} for config in report["configs"] for row in config["calibration"]
+    ])
+    diagonal = alt.Chart(pd.DataFrame({"x": [0, 1], "y": [0, 1]})).mark_line(color="gray", strokeDash=[4, 4]).encode(x="x:Q", y="y:Q")
+    chart_calibration = (
+        alt.Chart(calibration)
+        .mark_line(point=True)
+        .encode(
+            x=alt.X("mean_p:Q", title="Probabilidad predicha (local)", scale=alt.Scale(domain=[0, 1])),
+            y=alt.Y("home_rate:Q", title="Victorias locales reales", scale=alt.Scale(domain=[0, 1])),
+            color=alt.Color("config:N", title="Configuración"),
+            tooltip=["config:N", "bin:N", "n:Q", alt.Tooltip("mean_p:Q", format=".2f"), alt.Tooltip("home_rate:Q", format=".2f")],
+        )
+    )
+    st.altair_chart((diagonal + chart_calibration).properties(height=320, title="Calibración"), use_container_width=True)
+    st.caption(f"{report['model']} · {len(windows) // len(report['configs'])} ventanas · "
+               f"mínimo {report['min_train']} partidos de entrenamiento · {report['seconds']:.1f} s")
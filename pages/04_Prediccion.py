@@ -1,186 +1,288 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import joblib
-from pathlib import Path
-
-st.title("🤖 Modelo y Predicción")
-MODEL_PATH = Path("models/logreg_no_percents_pipeline.pkl")
-TEAMS_PATH = Path("data/prediction/teams_advanced_2024_25.csv")
-
-
-# --- parche robusto para unpickle de __main__.DropColumns ---
-import sys, types
-import pandas as pd
-from sklearn.base import BaseEstimator, TransformerMixin
-
-class DropColumns(BaseEstimator, TransformerMixin):
-    def __init__(self, columns=None, cols=None, to_drop=None, drop_cols=None):
-        # Estos son para el caso de que se instancie “nuevo”
-        self.columns   = list(columns) if columns is not None else None
-        self.cols      = list(cols) if cols is not None else None
-        self.to_drop   = list(to_drop) if to_drop is not None else None
-        self.drop_cols = list(drop_cols) if drop_cols is not None else None
-
-    def _get_cols_to_drop(self):
-        # Cubrimos los nombres comunes que puede haber tenido el objeto entrenado
-        candidate_names = [
-            "columns", "cols", "to_drop", "drop_cols",
-            "columns_", "cols_", "to_drop_", "drop_cols_",
-        ]
-        for name in candidate_names:
-            val = getattr(self, name, None)
-            if val is not None:
-                try:
-                    return list(val)
-                except Exception:
-                    pass
-        return []  # default seguro si no había nada serializado
-
-    def fit(self, X, y=None):
-        return self
-
-    def transform(self, X):
-        cols = self._get_cols_to_drop()
-        if not isinstance(X, pd.DataFrame):
-            # Si llegara un ndarray, no dropeamos (o convertir a DF con mismas cols si las conocés)
-            return X
-        safe_cols = [c for c in cols if c in X.columns]
-        return X.drop(columns=safe_cols, errors="ignore")
-
-# Asegurar que __main__ tenga DropColumns exactamente con ese nombre
-if '__main__' not in sys.modules:
-    sys.modules['__main__'] = types.ModuleType('__main__')
-setattr(sys.modules['__main__'], 'DropColumns', DropColumns)
-
-def _ensure_dropcolumns(model):
-    from sklearn.pipeline import Pipeline
-    def touch(step):
-        if isinstance(step, DropColumns) and not hasattr(step, "columns"):
-            step.columns = []
-        # manejar ColumnTransformer / Pipelines anidados
-        try:
-            from sklearn.compose import ColumnTransformer
-            if isinstance(step, ColumnTransformer):
-                for _, transformer, _ in step.transformers:
-                    touch(transformer)
-            if isinstance(step, Pipeline):
-                for _, sub in step.steps:
-                    touch(sub)
-        except Exception:
-            pass
-
-    touch(model)
-    return model
-# --- fin del parche ---
+import os
+import time
+from datetime import date, timedelta
 
+from nba import asof, charts, data, ensemble, matchups, portable, seasons, sensitivity, service
+from nba.features import TEAM_STAT_COLUMNS, build_features
+from nba.registry import TeamRegistry, load_registry
 
-# ====== Carga del pipeline entrenado desde el archivo .pkl ======
+st.title("🤖 Modelo y Predicción")
+MODEL_PATH = matchups.MODEL_PATH
+
+# ====== Temporada (cada una tiene sus equipos, calendario y matriz) ======
+season = st.sidebar.selectbox("🗓️ Temporada", seasons.available(), key="season")
+TEAMS_PATH = seasons.path(season, "teams")
+SCHEDULE_PATH = seasons.path(season, "schedule")
+
+# ====== Fecha de referencia: estadísticas de cada equipo ANTES de ese día ======
+partition = seasons.partition(season)
+as_of = st.sidebar.date_input(
+    "📅 Estadísticas al (as of)",
+    value=None,
+    min_value=date.fromisoformat(partition["start"]),
+    max_value=date.fromisoformat(partition["end"]) + timedelta(days=1),
+    help="Vacío = estadísticas actuales del CSV de equipos. Con una fecha, se usan las "
+         "estadísticas de cada equipo previas a ese día (feature store as of).",
+)
+
+
+# ====== Carga del pipeline entrenado (versión portable, sólo NumPy) ======
 @st.cache_resource
 def load_model():
     if not MODEL_PATH.exists():
         st.error(f"No se encontró el modelo: {MODEL_PATH}")
         st.stop()
-    m = joblib.load(MODEL_PATH)
-    m = _ensure_dropcolumns(m)  # el parche 
-    return m
+    # Se reexporta desde el .pkl (con sklearn) sólo si el .pkl cambió
+    return portable.load(MODEL_PATH)
 
-model = load_model()
 
+# ====== Servicio de predicción (en el proceso, o el de localhost si está NBA_PREDICTION_URL) ======
+@st.cache_resource
+def load_predictor(season):
+    return service.connect(os.environ.get("NBA_PREDICTION_URL"), load_model(), season)
 
-# ====== Carga de datos actuales de equipos desde el csv ======
-@st.cache_data
-def load_teams():
-    try:
-        df = pd.read_csv(TEAMS_PATH,  sep=";") 
-    except FileNotFoundError:
-        st.warning(f"No se encontró el archivo de equipos: {TEAMS_PATH}")
-        return pd.DataFrame()
 
-    # columnas que realmente usás de ese Excel
-    cols_necesarias = ["TEAM", "GP", "W", "OffRtg", "DefRtg", "streak", "streak_as_local", "streak_as_visitor"]
-    faltan = [c for c in cols_necesarias if c not in df.columns]
-    if faltan:
-        st.error(f"Faltan columnas {faltan} en {TEAMS_PATH}")
-        return pd.DataFrame()
+# ====== Ensamble: todos los modelos disponibles (se cargan recién al primer uso) ======
+@st.cache_resource
+def load_ensemble():
+    return ensemble.ModelEnsemble()
 
-    return df
 
-teams_df = load_teams()
+# ====== Equipos de la temporada (registro compartido: código, nombre y estadísticas del CSV) ======
+try:
+    registry = load_registry(season)
+except KeyError as exc:
+    st.error(f"Faltan columnas {exc} en {TEAMS_PATH}")
+    registry = TeamRegistry()
+if not len(registry):
+    st.warning(f"No se encontró el archivo de equipos: {TEAMS_PATH}")
 
 
-def get_team_data(team_name, df):
-    match = df[df["TEAM"] == team_name]
-    if match.empty:
-        return None
-    row = match.iloc[0]
-    return normalize_team_row(row)
+# ====== Matriz precalculada de probabilidades (local × visitante) ======
+# Se recalcula (y recién ahí se carga el modelo) sólo si cambió el CSV de equipos o el .pkl
+matrix = matchups.load_matrix(load_model, season) if len(registry) else pd.DataFrame()
 
 
-def get_team_data(team_name: str, df: pd.DataFrame):
-    """
-    Busca el equipo por nombre en el DataFrame y devuelve el dict normalizado.
-    """
-    if df.empty or not team_name:
-        return None
+def asof_team_stats(names, day) -> pd.DataFrame:
+    """Estadísticas de cada equipo (por nombre) previas a `day`, desde el feature store."""
+    names = list(names)
+    stats = asof.load_store(season).lookup_many([registry.code(n) for n in names], [day] * len(names))
+    return stats.set_index(pd.Index(names, name="TEAM"))[list(TEAM_STAT_COLUMNS.values())]
+
+
+# Con fecha "as of" la matriz se arma con las estadísticas de ese día (870 cruces, un solo predict)
+asof_stats = None
+if as_of is not None and len(registry):
+    asof_stats = asof_team_stats(registry.names, as_of)
+    sin_partidos = asof_stats.index[asof_stats["game_number"] == 0].tolist()
+    if sin_partidos:
+        st.sidebar.warning(f"Sin partidos de temporada antes del {as_of}: {', '.join(sin_partidos)}")
+    matrix = matchups.compute_matrix(load_model(), asof_stats).set_index(["home", "visitor"]).sort_index()
+    st.sidebar.caption(f"Estadísticas previas al {as_of:%d/%m/%Y}")
+
+
+def team_form_stats(team_name):
+    """Estadísticas que precargan el formulario: las del CSV, o las previas a la fecha "as of"."""
+    if asof_stats is not None:
+        return asof_stats.loc[team_name].to_dict() if team_name in asof_stats.index else {}
+    return registry.record(team_name) or {}
+
+
+TEAM_LIST = registry.names
 
-    match = df[df["TEAM"] == team_name]
-    if match.empty:
-        return None
 
-    row = match.iloc[0]
-    return normalize_team_row(row)
+# ====== Calendario de partidos (para el modo jornada completa) ======
+def load_schedule():
+    try:
+        return data.load_schedule(season)
+    except (FileNotFoundError, ValueError):
+        st.warning(f"No se encontró el calendario: {SCHEDULE_PATH}")
+        return pd.DataFrame()
+
 
-def normalize_team_row(row):
+def predict_slate(matrix: pd.DataFrame, games: pd.DataFrame) -> pd.DataFrame:
     """
-    Convierte una fila del CSV (TEAM, GP, W, OffRtg, DefRtg)
-    a las estadísticas que usa tu modelo para ese equipo.
+    Predice N partidos buscando cada cruce en la matriz precalculada
+    (una búsqueda vectorizada, sin pasar por el pipeline).
     """
-    return {
-        "off_rating": float(row["OffRtg"]),
-        "def_rating": float(row["DefRtg"]),
-        "wins": int(row["W"]),
-        "game_number": int(row["GP"]),
-        "streak": int(row["streak"]),
-        "streak_as_local": int(row["streak_as_local"]),
-        "streak_as_visitor": int(row["streak_as_visitor"]),
-    }
+    p_home = matchups.lookup(matrix, games["home_name"], games["visitor_name"])
+    return slate_table(games[~pd.isna(p_home)], p_home[~pd.isna(p_home)])
+
+
+def slate_table(games: pd.DataFrame, p_home) -> pd.DataFrame:
+    """Tabla de resultados de la jornada (con el ganador real si el partido ya se jugó)."""
+    out = pd.DataFrame({
+        "Fecha": games["day"].to_numpy(),
+        "Local": games["home_name"].to_numpy(),
+        "Visitante": games["visitor_name"].to_numpy(),
+        "Prob. local": p_home,
+        "Prob. visitante": 1 - p_home,
+    })
+    out["Ganador predicho"] = out["Local"].where(out["Prob. local"] >= 0.5, out["Visitante"])
+    if {"home_pts", "visitor_pts"} <= set(games.columns):
+        real = games["home_pts"].to_numpy() > games["visitor_pts"].to_numpy()
+        out["Ganador real"] = out["Local"].where(real, out["Visitante"])
+    return out
+
+
+def predict_slate_asof(games: pd.DataFrame) -> pd.DataFrame:
+    """
+    Predice N partidos con las estadísticas de cada equipo previas a su fecha:
+    2N búsquedas en lote en el feature store + un único predict_proba.
+    """
+    store = asof.load_store(season)
+    stat_cols = list(TEAM_STAT_COLUMNS.values())
+    home = store.lookup_many(games["home_team"], games["date"])[stat_cols]
+    visitor = store.lookup_many(games["visitor_team"], games["date"])[stat_cols]
+    # Sin partidos previos no hay récord: esos cruces no se pueden predecir
+    ok = ((home["game_number"] > 0) & (visitor["game_number"] > 0)).to_numpy()
+    p_home = matchups.home_win_proba(load_model(), build_features(home[ok], visitor[ok]))
+    return slate_table(games[ok], p_home)
+
+
+modo = st.radio("Modo de predicción", ["Partido individual", "Jornada completa", "Matriz de cruces", "Sensibilidad"],
+                horizontal=True)
+
+if modo == "Matriz de cruces":
+    st.markdown("Probabilidad de victoria del **local** para cada cruce posible (fila = local, columna = visitante).")
+    if matrix.empty:
+        st.stop()
+    import altair as alt  # sólo este modo grafica: no se paga el import en el resto de la página
+
+    heat = matrix.reset_index()
+    heatmap = (
+        alt.Chart(heat)
+        .mark_rect()
+        .encode(
+            x=alt.X("visitor:N", title="Visitante", axis=alt.Axis(labelAngle=-45)),
+            y=alt.Y("home:N", title="Local"),
+            color=alt.Color("p_home:Q", title="Prob. local", scale=alt.Scale(scheme="redblue", domain=[0, 1])),
+            tooltip=[
+                alt.Tooltip("home:N", title="Local"),
+                alt.Tooltip("visitor:N", title="Visitante"),
+                alt.Tooltip("p_home:Q", title="Prob. local", format=".2f"),
+            ],
+        )
+        .properties(height=700, title="Probabilidad de victoria del local")
+    )
+    st.altair_chart(heatmap, use_container_width=True)
+    st.stop()
+
+if modo == "Jornada completa":
+    st.markdown("Predice **todos los partidos** de una fecha (o de toda la temporada) de una sola vez.")
+    schedule = load_schedule()
+    if schedule.empty or matrix.empty:
+        st.stop()
 
+    TODAS = "Toda la temporada"
+    dias = sorted(schedule["day"].unique())
+    dia = st.selectbox("Elegí la fecha", [TODAS] + dias, index=0)
+    slate = schedule if dia == TODAS else schedule[schedule["day"] == dia]
 
+    previas = st.checkbox(
+        "Usar las estadísticas previas a cada partido (as of su fecha)",
+        help="Cada partido se predice con el estado de los equipos justo antes de jugarlo, "
+             "como si se hubiera predicho ese día.",
+    )
 
+    t0 = time.perf_counter()
+    if previas:
+        results = predict_slate_asof(slate)
+    else:
+        results = predict_slate(matrix, slate)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    st.caption(f"{len(results):,} partidos evaluados en {elapsed_ms:.1f} ms")
+    st.dataframe(
+        results,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Prob. local": st.column_config.ProgressColumn("Prob. local", format="%.2f", min_value=0, max_value=1),
+            "Prob. visitante": st.column_config.ProgressColumn("Prob. visitante", format="%.2f", min_value=0, max_value=1),
+        },
+    )
+    if "Ganador real" in results.columns and len(results):
+        acierto = (results["Ganador predicho"] == results["Ganador real"]).mean()
+        st.metric("Aciertos sobre partidos ya jugados", f"{acierto:.1%}")
+    st.stop()
+
+
+if modo == "Sensibilidad":
+    st.markdown("Cómo cambia la probabilidad del **local** si se mueven dos estadísticas del cruce a la vez "
+                "(todos los escenarios se puntúan en un solo lote).")
+    if len(TEAM_LIST) < 2:
+        st.stop()
+    import altair as alt
 
-import pandas as pd
+    c1, c2 = st.columns(2)
+    home_name = c1.selectbox("Equipo local", TEAM_LIST, index=0, key="sens_home")
+    visitor_name = c2.selectbox("Equipo visitante", [t for t in TEAM_LIST if t != home_name], index=0, key="sens_away")
+    home_stats, visitor_stats = team_form_stats(home_name), team_form_stats(visitor_name)
+    if not home_stats or not visitor_stats:
+        st.stop()
+
+    variables = list(sensitivity.VARIABLES)
+    c1, c2, c3, c4 = st.columns(4)
+    x_var = c1.selectbox("Eje X", variables, index=0)
+    # Sin variables que compartan columnas con X (p. ej. net rating y OffRtg del mismo lado)
+    y_var = c2.selectbox("Eje Y", [v for v in variables if not sensitivity.overlaps(x_var, v)], index=0)
+    span = c3.slider("Rango (±)", 1, 30, 10, help="Alrededor del valor actual de cada variable")
+    n = c4.slider("Puntos por eje", 10, 200, 100, step=10)
+
+    xs = sensitivity.axis(x_var, home_stats, visitor_stats, span, n)
+    ys = sensitivity.axis(y_var, home_stats, visitor_stats, span, n)
+    t0 = time.perf_counter()
+    grid = sensitivity.sweep(load_model(), home_stats, visitor_stats, x_var, y_var, xs, ys)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    st.caption(f"{len(grid):,} escenarios ({len(xs)} × {len(ys)}) puntuados en {elapsed_ms:.1f} ms")
+
+    # El gráfico lleva a lo sumo charts.MAX_ROWS celdas; el CSV, la grilla completa
+    shown = charts.grid_data(grid, "x", "y")
+    dx = float(np.diff(np.unique(shown["x"]))[0]) if shown["x"].nunique() > 1 else 1.0
+    dy = float(np.diff(np.unique(shown["y"]))[0]) if shown["y"].nunique() > 1 else 1.0
+    base = pd.DataFrame({"x": [sensitivity.current(x_var, home_stats, visitor_stats)],
+                         "y": [sensitivity.current(y_var, home_stats, visitor_stats)]})
+    surface = (
+        alt.Chart(shown)
+        .transform_calculate(x0=f"datum.x - {dx / 2}", x1=f"datum.x + {dx / 2}",
+                             y0=f"datum.y - {dy / 2}", y1=f"datum.y + {dy / 2}")
+        .mark_rect()
+        .encode(
+            x=alt.X("x0:Q", title=x_var, scale=alt.Scale(zero=False, nice=False)),
+            x2="x1:Q",
+            y=alt.Y("y0:Q", title=y_var, scale=alt.Scale(zero=False, nice=False)),
+            y2="y1:Q",
+            color=alt.Color("p_home:Q", title="Prob. local", scale=alt.Scale(scheme="redblue", domain=[0, 1])),
+            tooltip=[
+                alt.Tooltip("x:Q", title=x_var, format=".1f"),
+                alt.Tooltip("y:Q", title=y_var, format=".1f"),
+                alt.Tooltip("p_home:Q", title="Prob. local", format=".3f"),
+            ],
+        )
+    )
+    actual = alt.Chart(base).mark_point(shape="cross", size=200, color="black", filled=True).encode(x="x:Q", y="y:Q")
+    st.altair_chart(
+        (surface + actual).properties(height=550, title=f"{home_name} (local) vs {visitor_name}: valores actuales en ✚"),
+        use_container_width=True,
+    )
+    st.download_button(
+        "Descargar la grilla completa (CSV)",
+        grid.rename(columns={"x": x_var, "y": y_var, "p_home": "Prob. local"}).to_csv(index=False),
+        "sensibilidad.csv",
+        "text/csv",
+    )
+    st.stop()
 
-def categorize_team_quality(wins_pct: float) -> str:
-    """Asigna una etiqueta de calidad basada en el porcentaje de victorias."""
-    if pd.isna(wins_pct):
-        return 'Desconocido'
-    elif wins_pct < 0.35:
-        return 'Muy Débil'
-    elif wins_pct < 0.45:
-        return 'Débil'
-    elif wins_pct < 0.55:
-        return 'Promedio'
-    elif wins_pct < 0.65:
-        return 'Fuerte'
-    else:
-        return 'Muy Fuerte'
-
-def categorize_streak_extreme(streak: int) -> int:
-    """Clasifica la racha en extrema (+1), muy negativa (-1), o normal (0)."""
-    if pd.isna(streak):
-        return 0
-    elif streak >= 6:
-        return 1
-    elif streak <= -6:
-        return -1
-    else:
-        return 0
 
 # ====== Formulario en español ======
 st.markdown("Completá los datos del **equipo local** y **visitante**. Los nombres están en lenguaje común (NBA).")
 
 PLACEHOLDER = "— Seleccioná —"
-TEAM_LIST = sorted(teams_df["TEAM"].unique())
+
 
 with st.form("pred_v3"):
     c1, c2 = st.columns(2)
@@ -190,7 +292,7 @@ with st.form("pred_v3"):
     home_choice = c1.selectbox("Elegí el equipo local", [PLACEHOLDER] + TEAM_LIST, index=0, key="home_lbl")
     home_name = None if home_choice == PLACEHOLDER else home_choice
 
-    home_stats = get_team_data(home_name, teams_df) or {}
+    home_stats = team_form_stats(home_name)
 
     h_off_rating   = home_stats.get("off_rating", 110.0)
     h_def_rating   = home_stats.get("def_rating", 110.0)
@@ -224,7 +326,7 @@ with st.form("pred_v3"):
     visitor_name = None if visitor_choice == PLACEHOLDER else visitor_choice
 
     # Datos del visitante automáticamente desde el CSV
-    visitor_stats = get_team_data(visitor_name, teams_df) or {}
+    visitor_stats = team_form_stats(visitor_name)
 
     v_off_rating = visitor_stats.get("off_rating", 109.0)
     v_def_rating = visitor_stats.get("def_rating", 109.0)
@@ -263,104 +365,58 @@ if ok:
         st.error("El equipo visitante no puede ser el mismo que el local.")
         st.stop()
 
-# ====== Construcción EXACTA de features que pide tu pipeline ====== h_wins 
+# ====== Construcción EXACTA de features que pide tu pipeline ======
 if ok:
     # Etiquetas para mostrar resultado
     home_label = home_name if home_name else "Local"
     visitor_label = visitor_name if visitor_name else "Visitante"
 
-    # Diferenciales 
-    h_win_perent = h_wins / h_game_number           #home_wins_percent
-    v_win_perent = v_wins / v_game_number
-
-    wins_percent_diff     = h_win_perent - v_win_perent     
-    offensive_rating_diff = h_off_rating - v_off_rating     
-    defensive_rating_diff = h_def_rating - v_def_rating      
-    
-    net_rating_diff       = offensive_rating_diff + defensive_rating_diff #offensive_rating_diff + defensive_rating_diff
-    
-    h_estimated_points = h_off_rating - (h_off_rating - v_def_rating) / 2
-    v_estimated_points = v_off_rating - (v_off_rating - h_def_rating) / 2
-    
-    estimated_point_diff  = h_estimated_points - v_estimated_points     #home_pts - vis_pts
-    streak_diff           = h_streak - v_streak                         #home_str - vis_str
-
-    # Categóricas/umbrales
-    home_quality          = categorize_team_quality(h_win_perent)
-    visitor_quality       = categorize_team_quality(v_win_perent)
-    home_much_better     = int(wins_percent_diff > 0.20)
-    visitor_much_better  = int(wins_percent_diff < -0.20)
-    teams_evenly_matched = int(abs(wins_percent_diff) <= 0.10)
-    home_streak_extreme    = categorize_streak_extreme(h_streak)    #streak_extreme(home_str)
-    visitor_streak_extreme = categorize_streak_extreme(v_streak)    #streak_extreme(vis_str)
-    streak_extreme_diff    = home_streak_extreme - visitor_streak_extreme
-
-    home_last10 = h_win_perent 
-    vis_last10  = v_win_perent
-
-
-  
+    # Estadísticas del formulario (una fila por equipo)
+    home_row = pd.DataFrame([{
+        "off_rating": h_off_rating, "def_rating": h_def_rating,
+        "wins": h_wins, "game_number": h_game_number, "streak": h_streak,
+        "streak_as_local": home_home_str, "streak_as_visitor": home_away_str,
+    }])
+    visitor_row = pd.DataFrame([{
+        "off_rating": v_off_rating, "def_rating": v_def_rating,
+        "wins": v_wins, "game_number": v_game_number, "streak": v_streak,
+        "streak_as_local": vis_home_str, "streak_as_visitor": vis_away_str,
+    }])
 
     # DataFrame con TODAS las features de entrenamiento (nombres EXACTOS)
-    X = pd.DataFrame([{
-        # --- Núcleo base ---
-        "home_game_number": h_game_number,
-        "home_streak": h_streak,
-        "home_home_streak": home_home_str,
-        "home_away_streak": home_away_str,
-        "home_offensive_rating": h_off_rating,
-        "home_defensive_rating": h_def_rating,
-
-        "visitor_game_number": v_game_number,
-        "visitor_streak": v_streak,
-        "visitor_home_streak": vis_home_str,
-        "visitor_away_streak": vis_away_str,
-        "visitor_offensive_rating": v_off_rating,
-        "visitor_defensive_rating": v_def_rating,
-
-        "home_last_10": home_last10,
-        "visitor_last_10": vis_last10,
-        "home_wins_percent": h_win_perent,
-        "visitor_wins_percent": v_win_perent,
-
-        # --- Derivadas / flags (idénticas a entrenamiento) ---
-        "wins_percent_diff": wins_percent_diff,
-        "offensive_rating_diff": offensive_rating_diff,
-        "defensive_rating_diff": defensive_rating_diff,
-        "net_rating_diff": net_rating_diff,
-
-        "home_estimated_points": h_estimated_points,
-        "visitor_estimated_points": v_estimated_points,
-        "estimated_point_diff": estimated_point_diff,
-
-        "home_streak_extreme": home_streak_extreme,
-        "visitor_streak_extreme": visitor_streak_extreme,
-        "streak_extreme_diff": streak_extreme_diff,
-        "streak_diff": streak_diff,
-
-        "home_quality": home_quality,
-        "visitor_quality": visitor_quality,
-        "home_much_better": home_much_better,
-        "visitor_much_better": visitor_much_better,
-        "teams_evenly_matched": teams_evenly_matched,
-    }])
+    X = build_features(home_row, visitor_row)
 
-    # Predicción
+    # Predicción con el servicio (micro-lotes compartidos con otros pedidos concurrentes)
+    # (target del entrenamiento: 1 = victoria del equipo local)
     try:
-        y = model.predict(X)[0]
+        game = {"home_stats": home_row.iloc[0].to_dict(), "visitor_stats": visitor_row.iloc[0].to_dict()}
+        p_home = load_predictor(season).predict([game])[0]
+        y = int(p_home >= 0.5)
         # Mensaje usando nombres si se ingresaron (sino Local/Visitante)
         if int(y) == 1:
-            st.success(f"Predicción: **{visitor_label} gana** frente a **{home_label}**")
-        else:
             st.success(f"Predicción: **{home_label} gana** frente a **{visitor_label}**")
+        else:
+            st.success(f"Predicción: **{visitor_label} gana** frente a **{home_label}**")
         st.caption(f"Valor binario predicho: {int(y)} (1 = gana {home_label}, 0 = gana {visitor_label})")
 
-        if hasattr(model, "predict_proba"):
-            proba = model.predict_proba(X)[0]
-            st.write({
-                f"Probabilidad de ganar ({home_label} )": float(proba[0]),
-                f"Probabilidad de ganar({visitor_label} )": float(proba[1]),
-            })
+        st.write({
+            f"Probabilidad de ganar ({home_label} )": p_home,
+            f"Probabilidad de ganar({visitor_label} )": 1 - p_home,
+        })
+
+        # Todos los modelos con artefacto en models/, sobre la misma X y en paralelo
+        modelos = load_ensemble()
+        probs = modelos.score(X).iloc[0]
+        st.markdown("**Probabilidad de victoria del local según cada modelo**")
+        st.dataframe(
+            pd.DataFrame({"Modelo": probs.index, f"Prob. {home_label}": probs.to_numpy()}),
+            hide_index=True,
+            use_container_width=True,
+            column_config={f"Prob. {home_label}": st.column_config.ProgressColumn(format="%.2f", min_value=0, max_value=1)},
+        )
+        faltan = [name for name in modelos.models if name not in modelos.names]
+        if faltan:
+            st.caption(f"Sin artefacto en models/ (no entran al ensamble): {', '.join(faltan)}")
         with st.expander("Ver vector de entrada (features)"):
             st.dataframe(X.T, use_container_width=True)
     except Exception as e:
@@ -0,0 +1,114 @@
+import streamlit as st
+import altair as alt
+from datetime import date, timedelta
+
+from nba import matchups, portable, seasons, simulation
+
+st.title("🎲 Simulación de temporada y playoffs")
+
+# ====== Temporada y punto de partida ======
+season = st.sidebar.selectbox("🗓️ Temporada", seasons.available(), key="season")
+partition = seasons.partition(season)
+as_of = st.sidebar.date_input(
+    "📅 Simular desde",
+    value=None,
+    min_value=date.fromisoformat(partition["start"]) + timedelta(days=14),
+    max_value=date.fromisoformat(partition["end"]),
+    help="Vacío = récord actual del CSV de equipos (teams_advanced) y los partidos sin resultado. "
+         "Con una fecha, se parte del récord y las estadísticas previas a ese día y se simula el resto.",
+)
+n_sims = st.sidebar.select_slider("Simulaciones", options=[10_000, 50_000, 100_000, 200_000, 300_000], value=100_000)
+seed = st.sidebar.number_input("Semilla", min_value=0, value=0, step=1)
+
+
+# ====== Modelo (versión portable, sólo NumPy) ======
+@st.cache_resource
+def load_model():
+    return portable.load(matchups.MODEL_PATH)
+
+
+# ====== Simulación (se guarda en la sesión mientras no cambien los parámetros) ======
+params = (season, as_of, n_sims, seed)
+result = st.session_state.get("simulation")
+if result is None or result["params"] != params:
+    with st.spinner(f"Simulando {n_sims:,} temporadas..."):
+        setup = simulation.prepare(load_model(), season, as_of)
+        counts = simulation.simulate(setup, n_sims, seed)
+    result = {"params": params, "setup": setup, "counts": counts}
+    st.session_state["simulation"] = result
+
+setup, counts = result["setup"], result["counts"]
+table = simulation.standings(setup, counts)
+remaining = len(setup["home"])
+
+origen = f"récord previo al {as_of:%d/%m/%Y}" if as_of else "récord de teams_advanced"
+st.caption(
+    f"Temporada {season} · {origen} · {remaining:,} partidos por jugar · "
+    f"{counts['n_sims']:,} simulaciones en {counts['seconds']:.1f} s ({counts['workers']} procesos)"
+)
+if remaining == 0:
+    st.info("No quedan partidos de temporada regular: la tabla es la final y sólo se simulan play-in y playoffs. "
+            "Elegí una fecha en **Simular desde** para proyectar el resto de la temporada.")
+
+st.markdown("""
+Cada partido que falta se decide con la probabilidad de victoria local del modelo; los empates en la
+tabla se resuelven al azar. Del 7º al 10º de cada conferencia juegan el play-in y las series son al
+mejor de 7 con localía para el de mejor récord.
+""")
+
+# ====== Tabla proyectada por conferencia ======
+st.subheader("📋 Tabla proyectada y probabilidades")
+percent = st.column_config.ProgressColumn(format="percent", min_value=0, max_value=1)
+for tab, (conf, group) in zip(st.tabs(list(table["conference"].unique())), table.groupby("conference", sort=False)):
+    with tab:
+        view = group.drop(columns=["conference", "team"]).rename(columns={
+            "name": "Equipo", "remaining": "Restan", "mean_wins": "W esperadas", "mean_seed": "Puesto medio",
+        })
+        st.dataframe(
+            view,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "W esperadas": st.column_config.NumberColumn(format="%.1f"),
+                "Puesto medio": st.column_config.NumberColumn(format="%.1f"),
+                **{col: percent for col in ["Top 6", *simulation.STAGES]},
+            },
+        )
+
+# ====== Distribución de puestos ======
+st.subheader("🏅 Distribución del puesto en la conferencia")
+seeds = simulation.seed_distribution(setup, counts).merge(table[["team", "conference", "mean_seed"]], on="team")
+seeds = seeds[seeds["p"] > 0]
+for conf, group in seeds.groupby("conference", sort=False):
+    chart = (
+        alt.Chart(group)
+        .mark_rect()
+        .encode(
+            x=alt.X("seed:O", title="Puesto"),
+            y=alt.Y("team:N", title=None, sort=alt.EncodingSortField("mean_seed", order="ascending")),
+            color=alt.Color("p:Q", title="Probabilidad", scale=alt.Scale(scheme="blues")),
+            tooltip=["team:N", "seed:O", alt.Tooltip("p:Q", format=".1%")],
+        )
+        .properties(title=conf, height=360)
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+# ====== Distribución de victorias ======
+if remaining:
+    st.subheader("📈 Distribución de victorias al final de la temporada")
+    default = list(table.nlargest(3, "mean_wins")["team"])
+    elegidos = st.multiselect("Equipos", list(table["team"]), default=default)
+    wins = simulation.wins_distribution(setup, counts)
+    wins = wins[wins["team"].isin(elegidos)]
+    chart = (
+        alt.Chart(wins)
+        .mark_line(point=True)
+        .encode(
+            x=alt.X("wins:Q", title="Victorias"),
+            y=alt.Y("p:Q", title="Probabilidad", axis=alt.Axis(format="%")),
+            color=alt.Color("team:N", title="Equipo"),
+            tooltip=["team:N", "wins:Q", alt.Tooltip("p:Q", format=".1%")],
+        )
+        .properties(height=320)
+    )
+    st.altair_chart(chart, use_container_width=True)
@@ -0,0 +1,95 @@
+import json
+
+import streamlit as st
+
+from nba import data, instrument, memory
+
+st.title("🩺 Diagnóstico")
+st.caption("Página oculta (no figura en el menú): tiempos de loaders, transformaciones, predicciones y gráficos.")
+
+# ====== Prender / apagar ======
+activa = st.toggle(
+    "Instrumentación activa",
+    value=instrument.ENABLED,
+    help="Vale para todo el proceso. Apagada, cada función instrumentada sólo paga una llamada extra. "
+         "También se prende al arrancar con NBA_INSTRUMENT=1.",
+)
+if activa != instrument.ENABLED:
+    instrument.enable(activa)
+    st.rerun()
+if not activa:
+    st.info("La instrumentación está apagada: prendela y navegá por la app para juntar mediciones.")
+
+# ====== Sesión ======
+propia = instrument.session_id()
+TODAS = "Todas las sesiones"
+opciones = [TODAS, *instrument.sessions()]
+etiqueta = {TODAS: TODAS, propia: f"{propia} (esta sesión)", "proceso": "proceso (precarga, CLI)"}
+sesion = st.selectbox("Sesión", opciones, format_func=lambda s: etiqueta.get(s, s))
+filtro = None if sesion == TODAS else sesion
+
+resumen = instrument.summary(filtro)
+contadores = instrument.counters(filtro)
+
+# ====== Percentiles ======
+st.subheader("⏱️ Tiempos por función")
+if resumen.empty:
+    st.write("Todavía no hay mediciones.")
+else:
+    ms = st.column_config.NumberColumn(format="%.2f")
+    st.dataframe(
+        resumen,
+        hide_index=True,
+        use_container_width=True,
+        column_config={col: ms for col in resumen.columns if col.endswith("_ms")},
+    )
+    import altair as alt
+
+    top = resumen.nlargest(15, "total_ms")
+    chart = (
+        alt.Chart(top)
+        .mark_bar()
+        .encode(
+            x=alt.X("total_ms:Q", title="Tiempo total (ms)"),
+            y=alt.Y("nombre:N", title=None, sort="-x"),
+            tooltip=["nombre:N", "llamadas:Q", alt.Tooltip("p50_ms:Q", format=".2f"),
+                     alt.Tooltip("p99_ms:Q", format=".2f")],
+        )
+        .properties(height=28 * len(top) + 20, title="Dónde se va el tiempo")
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+# ====== Contadores y caché ======
+st.subheader("🔢 Contadores")
+if contadores.empty:
+    st.write("Sin contadores.")
+else:
+    c = contadores.set_index("nombre")["cantidad"]
+    aciertos, fallos = int(c.get("cache.acierto", 0)), int(c.get("cache.fallo", 0))
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Aciertos de caché", f"{aciertos:,}")
+    col2.metric("Fallos de caché", f"{fallos:,}")
+    col3.metric("Tasa de aciertos", f"{aciertos / max(aciertos + fallos, 1):.1%}")
+    st.dataframe(contadores, hide_index=True, use_container_width=True)
+
+with st.expander("💾 Memoria del caché compartido"):
+    st.caption(f"{data.CACHE.nbytes / memory.MB:.2f} MB de {data.CACHE.max_bytes / memory.MB:.0f} MB")
+    st.dataframe(memory.cache_report(), hide_index=True, use_container_width=True,
+                 column_config={"MB": st.column_config.NumberColumn(format="%.3f")})
+
+# ====== Exportar / reiniciar ======
+st.subheader("📤 Exportar")
+crudas = instrument.samples(filtro)
+col1, col2, col3 = st.columns(3)
+col1.download_button("Percentiles (CSV)", resumen.to_csv(index=False), "diagnostico_percentiles.csv", "text/csv")
+col2.download_button("Mediciones crudas (CSV)", crudas.to_csv(index=False), "diagnostico_mediciones.csv", "text/csv")
+col3.download_button(
+    "Todo (JSON)",
+    json.dumps({"percentiles": resumen.to_dict("records"), "contadores": contadores.to_dict("records")},
+               indent=1, ensure_ascii=False),
+    "diagnostico.json",
+    "application/json",
+)
+if st.button("Reiniciar mediciones"):
+    instrument.reset()
+    st.rerun()